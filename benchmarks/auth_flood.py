@@ -0,0 +1,134 @@
+"""Catalog latency while ``/auth/token/`` is flooded with bad passwords.
+
+A uvicorn server is started once with the auth rate limits off and once
+with them on. Attackers cycle through real accounts with wrong
+passwords, so every attempt that gets through costs an Argon2 verify,
+while readers fetch product pages.
+
+Usage::
+
+    python -m benchmarks.auth_flood --attackers 64 --seconds 10
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+import httpx
+
+from benchmarks.load import _free_port, _wait_until_ready, seed
+from benchmarks.scenarios import load_dataset
+
+READERS = 8
+
+
+async def flood(client, emails, stop: asyncio.Event, statuses: Counter):
+    rng = random.Random()
+    while not stop.is_set():
+        response = await client.post(
+            '/auth/token/',
+            data={'username': rng.choice(emails), 'password': 'wrong'},
+        )
+        statuses[response.status_code] += 1
+
+
+async def read(client, product_ids, stop: asyncio.Event, latencies: list):
+    rng = random.Random()
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get(f'/products/{rng.choice(product_ids)}/')
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+
+
+async def measure(port: int, server, dataset, args) -> tuple[list, Counter]:
+    emails = [email for email, _ in dataset.users]
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    stop = asyncio.Event()
+    limits = httpx.Limits(max_connections=args.attackers + READERS)
+    async with httpx.AsyncClient(
+        base_url=f'http://127.0.0.1:{port}', limits=limits, timeout=60
+    ) as client:
+        await _wait_until_ready(client, server)
+        tasks = [
+            *(
+                asyncio.create_task(flood(client, emails, stop, statuses))
+                for _ in range(args.attackers)
+            ),
+            *(
+                asyncio.create_task(
+                    read(client, dataset.product_ids, stop, latencies)
+                )
+                for _ in range(READERS)
+            ),
+        ]
+        await asyncio.sleep(args.seconds)
+        stop.set()
+        await asyncio.gather(*tasks)
+    return latencies, statuses
+
+
+def run(database_url: str, dataset, args, *, limited: bool) -> None:
+    port = _free_port()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            '-m',
+            'uvicorn',
+            'ecommerce.app:app',
+            '--port',
+            str(port),
+            '--log-level',
+            'warning',
+            '--no-access-log',
+        ],
+        env={
+            **os.environ,
+            'DATABASE_URL': database_url,
+            'RATE_LIMIT_ENABLED': str(limited).lower(),
+        },
+    )
+    try:
+        latencies, statuses = asyncio.run(measure(port, server, dataset, args))
+    finally:
+        server.terminate()
+        server.wait()
+
+    p50, p99 = (
+        statistics.quantiles(latencies, n=100)[index] for index in (49, 98)
+    )
+    print(
+        f'limits {"on " if limited else "off"}  '
+        f'catalog {len(latencies) / args.seconds:>7.0f} rps  '
+        f'p50 {p50 * 1000:>7.2f}ms  p99 {p99 * 1000:>8.2f}ms  '
+        f'auth {dict(sorted(statuses.items()))}'
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--products', type=int, default=10_000)
+    parser.add_argument('--users', type=int, default=1_000)
+    parser.add_argument('--attackers', type=int, default=64)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = f'sqlite:///{Path(directory) / "flood.db"}'
+        seed(url, args.products, args.users)
+        dataset = load_dataset(url)
+        for limited in (False, True):
+            run(url, dataset, args, limited=limited)
+
+
+if __name__ == '__main__':
+    main()
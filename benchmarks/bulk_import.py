@@ -0,0 +1,101 @@
+"""Bulk product import throughput through ``ProductService``.
+
+Usage::
+
+    python -m benchmarks.bulk_import --rows 100000 500000 --format csv
+"""
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ecommerce.core.database import build_engine
+from ecommerce.core.settings import Settings
+from ecommerce.models import table_registry
+from ecommerce.products.imports import get_parser
+from ecommerce.products.repositories import ProductRepository
+from ecommerce.products.services import ProductService
+
+MEDIA_TYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+READ_SIZE = 64 * 1024
+
+
+def write_file(path: Path, rows: int, fmt: str) -> None:
+    with path.open('w', encoding='utf-8') as file:
+        if fmt == 'csv':
+            file.write('name,description,price,sku\n')
+        for index in range(rows):
+            name, price, sku = f'Product {index}', index % 500 + 1, f'S{index}'
+            if fmt == 'csv':
+                file.write(f'{name},Bulk item,{price},{sku}\n')
+            else:
+                file.write(
+                    json.dumps({
+                        'name': name,
+                        'description': 'Bulk item',
+                        'price': price,
+                        'sku': sku,
+                    })
+                    + '\n'
+                )
+
+
+async def read_chunks(path: Path):
+    with path.open('rb') as file:
+        while chunk := file.read(READ_SIZE):
+            yield chunk
+
+
+async def run_import(
+    database_url: str, path: Path, fmt: str, chunk_size: int
+) -> None:
+    engine = build_engine(Settings(DATABASE_URL=database_url))
+    async with engine.begin() as connection:
+        await connection.run_sync(table_registry.metadata.create_all)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        service = ProductService(ProductRepository(session))
+        parse = get_parser(MEDIA_TYPES[fmt])
+        started = time.perf_counter()
+        result = await service.import_products(
+            parse(read_chunks(path)),
+            chunk_size=chunk_size,
+            max_errors=100,
+        )
+        elapsed = time.perf_counter() - started
+    await engine.dispose()
+
+    print(
+        f'{result.created:,} rows in {elapsed:.1f}s '
+        f'({result.created / elapsed:,.0f} rows/s), {result.failed} failed'
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000])
+    parser.add_argument('--format', choices=MEDIA_TYPES, default='ndjson')
+    parser.add_argument('--chunk-size', type=int, default=1_000)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / f'products.{args.format}'
+            write_file(path, rows, args.format)
+            asyncio.run(
+                run_import(
+                    f'sqlite:///{Path(directory) / "bench.db"}',
+                    path,
+                    args.format,
+                    args.chunk_size,
+                )
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""Hundreds of parallel checkouts racing for one hot SKU.
+
+Each buyer reserves one unit and places an order in one transaction.
+The run fails loudly if more units are sold than were in stock.
+
+Usage::
+
+    python -m benchmarks.checkout_contention --buyers 500 --stock 200 \\
+        --shards 1 8
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from ecommerce.checkout.models import Order, OrderItem
+from ecommerce.checkout.repositories import OrderRepository
+from ecommerce.core.database import build_engine
+from ecommerce.core.db.unit_of_work import UnitOfWork
+from ecommerce.core.settings import Settings
+from ecommerce.inventory.models import InventoryShard
+from ecommerce.inventory.repositories import InventoryRepository
+from ecommerce.inventory.services import (
+    InsufficientStockError,
+    InventoryService,
+)
+from ecommerce.models import table_registry
+from ecommerce.products.models import Product
+from ecommerce.users.models import User
+
+
+async def setup(factory, stock: int, shards: int) -> tuple[int, int]:
+    async with factory() as session:
+        user = User(
+            name='Buyer', email='b@x.com', password='x', phone_number=None
+        )
+        product = Product(name='Hot', description=None, price=9.9, sku='HOT')
+        session.add_all([user, product])
+        await session.commit()
+        await InventoryService(InventoryRepository(session)).set_stock(
+            product.id, stock, shards=shards
+        )
+        return user.id, product.id
+
+
+async def checkout(factory, user_id: int, product_id: int) -> bool:
+    async with factory() as session:
+        uow = UnitOfWork(session)
+        inventory = InventoryService(InventoryRepository(session), uow)
+        try:
+            async with uow:
+                await inventory.reserve({product_id: 1})
+                await OrderRepository(session).create(
+                    Order(
+                        user_id=user_id,
+                        total=9.9,
+                        items=[
+                            OrderItem(
+                                product_id=product_id,
+                                name='Hot',
+                                sku='HOT',
+                                unit_price=9.9,
+                                quantity=1,
+                            )
+                        ],
+                    )
+                )
+        except InsufficientStockError:
+            return False
+        return True
+
+
+async def run(database_url: str, buyers: int, stock: int, shards: int):
+    engine = build_engine(
+        Settings(DATABASE_URL=database_url, DATABASE_POOL_SIZE=20)
+    )
+    async with engine.begin() as connection:
+        await connection.run_sync(table_registry.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    user_id, product_id = await setup(factory, stock, shards)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(checkout(factory, user_id, product_id) for _ in range(buyers))
+    )
+    elapsed = time.perf_counter() - started
+
+    async with factory() as session:
+        left = await session.scalar(
+            select(func.sum(InventoryShard.stock)).where(
+                InventoryShard.product_id == product_id
+            )
+        )
+        orders = await session.scalar(select(func.count()).select_from(Order))
+    await engine.dispose()
+
+    sold = sum(results)
+    assert sold == orders == min(buyers, stock), (sold, orders)
+    assert left == stock - sold >= 0, left
+    print(
+        f'{shards:>6}{buyers:>8}{stock:>7}{sold:>6}{left:>6}'
+        f'{buyers / elapsed:>12,.0f}/s{elapsed:>9.2f}s'
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--buyers', type=int, default=500)
+    parser.add_argument('--stock', type=int, default=200)
+    parser.add_argument('--shards', type=int, nargs='+', default=[1, 8])
+    parser.add_argument(
+        '--database-url', help='Defaults to a temporary SQLite file.'
+    )
+    args = parser.parse_args()
+
+    print(
+        f'{"shards":>6}{"buyers":>8}{"stock":>7}{"sold":>6}{"left":>6}'
+        f'{"throughput":>14}{"elapsed":>9}'
+    )
+    for shards in args.shards:
+        with tempfile.TemporaryDirectory() as directory:
+            url = args.database_url or f'sqlite:///{Path(directory) / "b.db"}'
+            asyncio.run(run(url, args.buyers, args.stock, shards))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""Synthetic catalog and user data, written with bulk inserts.
+
+Every user shares one password hashed up front, so seeding 100k users
+costs a single argon2 run. Product and user columns are derived from
+the row index and a seeded RNG, so a given size is reproducible.
+
+Usage::
+
+    python -m benchmarks.data --database-url sqlite:///bench.db \\
+        --products 1000000 --users 100000
+"""
+
+import argparse
+import random
+import time
+from typing import Iterator
+
+from sqlalchemy import Connection, Engine, create_engine, insert
+
+from ecommerce.core.security import get_password_hash
+from ecommerce.core.utils.ids import generate_public_ids
+from ecommerce.models import table_registry
+from ecommerce.products.models import Product
+from ecommerce.products.search import deferred_fts_sync
+from ecommerce.users.models import User
+
+WORDS = (
+    'keyboard mouse monitor cable adapter charger headset speaker webcam '
+    'laptop stand hub dock router switch lamp desk chair mat case sleeve '
+    'wireless mechanical ergonomic compact portable gaming office pro mini'
+).split()
+USER_PASSWORD = 'benchmark-secret'
+CHUNK_SIZE = 10_000
+# Rows pick from pools of phrases instead of sampling words per row.
+POOL_SIZE = 4096
+
+
+def user_email(index: int) -> str:
+    return f'user{index:07d}@example.com'
+
+
+def _public_ids() -> Iterator[str]:
+    while True:
+        yield from generate_public_ids(CHUNK_SIZE)
+
+
+def product_rows(
+    count: int, rng: random.Random, *, start: int = 0
+) -> Iterator[dict]:
+    names = [
+        ' '.join(rng.sample(WORDS, 3)).title() for _ in range(POOL_SIZE)
+    ]
+    descriptions = [' '.join(rng.sample(WORDS, 8)) for _ in range(POOL_SIZE)]
+    public_ids = _public_ids()
+    for index in range(start, start + count):
+        yield {
+            'name': rng.choice(names),
+            'description': rng.choice(descriptions),
+            'price': round(rng.uniform(1, 5000), 2),
+            'sku': f'SKU-{index:08d}',
+            'public_id': next(public_ids),
+        }
+
+
+def user_rows(count: int, password_hash: str) -> Iterator[dict]:
+    public_ids = _public_ids()
+    for index in range(count):
+        yield {
+            'name': f'User {index}',
+            'email': user_email(index),
+            'password': password_hash,
+            'phone_number': None,
+            'public_id': next(public_ids),
+        }
+
+
+def _chunks(rows: Iterator[dict], size: int) -> Iterator[list[dict]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def bulk_insert(
+    connection: Connection, model, rows: Iterator[dict], *, chunk_size: int
+) -> None:
+    for chunk in _chunks(rows, chunk_size):
+        connection.execute(insert(model), chunk)
+
+
+def seed(
+    engine: Engine,
+    *,
+    products: int,
+    users: int,
+    rng: random.Random,
+    chunk_size: int = CHUNK_SIZE,
+) -> None:
+    table_registry.metadata.create_all(engine)
+    with engine.begin() as connection:
+        with deferred_fts_sync(connection):
+            bulk_insert(
+                connection,
+                Product,
+                product_rows(products, rng),
+                chunk_size=chunk_size,
+            )
+        bulk_insert(
+            connection,
+            User,
+            user_rows(users, get_password_hash(USER_PASSWORD)),
+            chunk_size=chunk_size,
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--database-url', required=True)
+    parser.add_argument('--products', type=int, default=100_000)
+    parser.add_argument('--users', type=int, default=10_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    started = time.perf_counter()
+    seed(
+        engine,
+        products=args.products,
+        users=args.users,
+        rng=random.Random(args.seed),
+        chunk_size=args.chunk_size,
+    )
+    engine.dispose()
+    print(
+        f'seeded {args.products:,} products and {args.users:,} users '
+        f'in {time.perf_counter() - started:.1f}s'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Peak memory of the streaming catalog export vs. loading a full list.
+
+Usage::
+
+    python -m benchmarks.export --rows 100000 500000
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from benchmarks.search import seed
+from ecommerce.core.utils.schemas import dump_json
+from ecommerce.products.exports import RENDERERS
+from ecommerce.products.models import Product
+from ecommerce.products.repositories import ProductRepository
+from ecommerce.products.schemas import ProductRead
+from ecommerce.products.services import ProductService
+
+
+async def full_list(session: AsyncSession) -> int:
+    products = list(await session.scalars(select(Product)))
+    return sum(len(dump_json(ProductRead, product)) for product in products)
+
+
+async def streamed(session: AsyncSession, fmt: str, batch_size: int) -> int:
+    service = ProductService(ProductRepository(session))
+    size = 0
+    async for chunk in RENDERERS[fmt](
+        service.export_products(batch_size=batch_size)
+    ):
+        size += len(chunk)
+    return size
+
+
+async def measure(database_url: str, label: str, fn) -> None:
+    engine = create_async_engine(database_url)
+    async with AsyncSession(engine) as session:
+        tracemalloc.start()
+        started = time.perf_counter()
+        size = await fn(session)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    await engine.dispose()
+    print(
+        f'{label:<16}{size / 2**20:>10.1f}MiB out'
+        f'{peak / 2**20:>10.1f}MiB peak{elapsed:>8.1f}s'
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000])
+    parser.add_argument('--batch-size', type=int, default=1_000)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'bench.db'
+            engine = create_engine(f'sqlite:///{path}')
+            seed(engine, rows, random.Random(rows))
+            engine.dispose()
+
+            url = f'sqlite+aiosqlite:///{path}'
+            print(f'\n{rows:,} products')
+            asyncio.run(measure(url, 'full list', full_list))
+            for fmt in RENDERERS:
+                asyncio.run(
+                    measure(
+                        url,
+                        f'stream {fmt}',
+                        lambda session, fmt=fmt: streamed(
+                            session, fmt, args.batch_size
+                        ),
+                    )
+                )
+
+
+if __name__ == '__main__':
+    main()
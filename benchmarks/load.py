@@ -0,0 +1,496 @@
+"""Load scenarios against the app, in-process and over local uvicorn.
+
+The database is seeded once by ``benchmarks.data`` in a subprocess. Each
+scenario then runs against a fresh process, so the reported peak RSS
+belongs to it alone. With ``in-process`` that process holds both the
+ASGI app and the client. With ``uvicorn`` it is the server and all of
+its workers.
+
+Results can be saved as a JSON baseline and compared with a later run::
+
+    python -m benchmarks.load --products 1000000 --users 100000 \\
+        --save benchmarks/baselines/main.json
+    python -m benchmarks.load --products 1000000 --users 100000 \\
+        --compare benchmarks/baselines/main.json
+
+``--compare`` exits with status 1 when a scenario lost more than
+``--tolerance`` of its throughput or p95 latency.
+
+``baselines/smoke.json`` is a run with the default parameters on a
+single CPU; its ``meta`` records the machine. Compare against it only
+from a similar machine, or save a baseline of your own first.
+
+Latency percentiles and throughput count successful responses only.
+Requests the app sheds with 503 answer in microseconds, so mixing them
+in would make an overloaded scenario look fast. They are reported
+apart, with their own p50 and p95. Other 4xx and 5xx, and connections
+dropped before a response, count as errors.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import socket
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+import httpx
+
+from benchmarks.scenarios import SCENARIOS, Dataset, Scenario, load_dataset
+
+TARGETS = ('in-process', 'uvicorn')
+BASELINES = Path(__file__).parent / 'baselines'
+PERCENTILES = (50, 95, 99)
+SERVER_START_TIMEOUT = 30.0
+SERVER_POLL_INTERVAL = 0.1
+# Status recorded for a request whose connection was reset or closed
+# before a response arrived; it counts as an error.
+DROPPED = 0
+
+
+@dataclass
+class Result:
+    target: str
+    scenario: str
+    requests: int
+    ok: int
+    shed: int
+    errors: int
+    # Successful responses per second.
+    rps: float
+    p50_ms: float | None
+    p95_ms: float | None
+    p99_ms: float | None
+    shed_p50_ms: float | None
+    shed_p95_ms: float | None
+    peak_rss_mb: float | None
+
+
+@dataclass(frozen=True)
+class LoadOptions:
+    concurrency: int
+    requests: int
+    warmup: int
+
+
+# (latency in seconds, status code) per request, and the wall time.
+Measured = tuple[list[tuple[float, int]], float]
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    dataset: Dataset,
+    options: LoadOptions,
+) -> Measured:
+    """Run the scenario; return each request's latency and status."""
+    states = [{} for _ in range(options.concurrency)]
+    if scenario.prepare is not None:
+        for worker, state in enumerate(states):
+            await scenario.prepare(client, dataset, worker, state)
+
+    rngs = [random.Random(index) for index in range(options.concurrency)]
+
+    async def phase(count: int) -> Measured:
+        samples: list[tuple[float, int]] = []
+        budget = count
+
+        async def worker(index: int) -> None:
+            nonlocal budget
+            while budget > 0:
+                budget -= 1
+                started = time.perf_counter()
+                try:
+                    response = await scenario.request(
+                        client, dataset, rngs[index], states[index]
+                    )
+                except httpx.TransportError:
+                    status = DROPPED
+                else:
+                    status = response.status_code
+                samples.append((time.perf_counter() - started, status))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(options.concurrency)))
+        return samples, time.perf_counter() - started
+
+    await phase(options.warmup)
+    return await phase(options.requests)
+
+
+def percentiles(latencies: list[float]) -> list[float | None]:
+    """``PERCENTILES`` of ``latencies`` in milliseconds."""
+    if not latencies:
+        return [None] * len(PERCENTILES)
+    if len(latencies) == 1:
+        return [round(latencies[0] * 1000, 3)] * len(PERCENTILES)
+    cuts = statistics.quantiles(latencies, n=100)
+    return [round(cuts[cut - 1] * 1000, 3) for cut in PERCENTILES]
+
+
+def summarize(
+    target: str,
+    scenario: str,
+    measured: Measured,
+    peak_rss_kib: int | None,
+) -> Result:
+    samples, wall = measured
+    ok = [
+        latency
+        for latency, status in samples
+        if status < httpx.codes.BAD_REQUEST
+    ]
+    shed = [
+        latency
+        for latency, status in samples
+        if status == httpx.codes.SERVICE_UNAVAILABLE
+    ]
+    p50, p95, p99 = percentiles(ok)
+    shed_p50, shed_p95, _ = percentiles(shed)
+    return Result(
+        target=target,
+        scenario=scenario,
+        requests=len(samples),
+        ok=len(ok),
+        shed=len(shed),
+        errors=len(samples) - len(ok) - len(shed),
+        rps=round(len(ok) / wall, 1),
+        p50_ms=p50,
+        p95_ms=p95,
+        p99_ms=p99,
+        shed_p50_ms=shed_p50,
+        shed_p95_ms=shed_p95,
+        peak_rss_mb=(
+            None if peak_rss_kib is None else round(peak_rss_kib / 1024, 1)
+        ),
+    )
+
+
+async def _run_in_process(
+    database_url: str, name: str, dataset: Dataset, options: LoadOptions
+) -> Measured:
+    from sqlalchemy.ext.asyncio import async_sessionmaker  # noqa: PLC0415
+
+    from ecommerce.app import app  # noqa: PLC0415
+    from ecommerce.core.database import (  # noqa: PLC0415
+        build_engine,
+        get_session,
+    )
+    from ecommerce.core.settings import Settings  # noqa: PLC0415
+
+    engine = build_engine(Settings(DATABASE_URL=database_url))
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def get_session_override():
+        async with factory() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_session_override
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url='http://bench'
+        ) as client:
+            return await drive(client, SCENARIOS[name], dataset, options)
+    finally:
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+
+def run_in_process(
+    database_url: str, name: str, dataset: Dataset, options: LoadOptions
+) -> Result:
+    """Entry point of the child process for one in-process scenario."""
+    measured = asyncio.run(
+        _run_in_process(database_url, name, dataset, options)
+    )
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return summarize('in-process', name, measured, peak)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _peak_rss_kib(pid: int) -> int | None:
+    """Sum ``VmHWM`` of a process and its children; Linux only."""
+    proc = Path('/proc')
+    if not proc.exists():
+        return None
+    pids = [pid]
+    children = proc / str(pid) / 'task' / str(pid) / 'children'
+    if children.exists():
+        pids += [int(child) for child in children.read_text().split()]
+    total = 0
+    for each in pids:
+        for line in (proc / str(each) / 'status').read_text().splitlines():
+            if line.startswith('VmHWM:'):
+                total += int(line.split()[1])
+    return total
+
+
+async def _wait_until_ready(client: httpx.AsyncClient, server) -> None:
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError('uvicorn exited during startup.')
+        try:
+            await client.get('/metrics/')
+        except httpx.TransportError:
+            await asyncio.sleep(SERVER_POLL_INTERVAL)
+        else:
+            return
+    raise RuntimeError('uvicorn did not start in time.')
+
+
+async def _run_uvicorn(
+    server, port: int, name: str, dataset: Dataset, options: LoadOptions
+) -> Result:
+    limits = httpx.Limits(max_connections=options.concurrency)
+    async with httpx.AsyncClient(
+        base_url=f'http://127.0.0.1:{port}', limits=limits, timeout=60
+    ) as client:
+        await _wait_until_ready(client, server)
+        measured = await drive(client, SCENARIOS[name], dataset, options)
+    return summarize('uvicorn', name, measured, _peak_rss_kib(server.pid))
+
+
+def run_uvicorn(
+    database_url: str,
+    name: str,
+    dataset: Dataset,
+    options: LoadOptions,
+    workers: int,
+) -> Result:
+    port = _free_port()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            '-m',
+            'uvicorn',
+            'ecommerce.app:app',
+            '--port',
+            str(port),
+            '--workers',
+            str(workers),
+            '--log-level',
+            'warning',
+            '--no-access-log',
+        ],
+        env={**os.environ, 'DATABASE_URL': database_url},
+    )
+    try:
+        return asyncio.run(_run_uvicorn(server, port, name, dataset, options))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def _ms(value: float | None) -> str:
+    return '-' if value is None else f'{value:.2f}ms'
+
+
+def print_results(results: list[Result]) -> None:
+    print(
+        f'{"target":<12}{"scenario":<10}{"requests":>9}{"ok":>7}'
+        f'{"shed":>7}{"errors":>8}{"ok rps":>10}{"p50":>11}{"p95":>11}'
+        f'{"p99":>11}{"shed p50":>11}{"shed p95":>11}{"peak rss":>11}'
+    )
+    for result in results:
+        rss = (
+            '-' if result.peak_rss_mb is None else f'{result.peak_rss_mb}MiB'
+        )
+        print(
+            f'{result.target:<12}{result.scenario:<10}'
+            f'{result.requests:>9}{result.ok:>7}{result.shed:>7}'
+            f'{result.errors:>8}{result.rps:>10,.0f}'
+            f'{_ms(result.p50_ms):>11}{_ms(result.p95_ms):>11}'
+            f'{_ms(result.p99_ms):>11}{_ms(result.shed_p50_ms):>11}'
+            f'{_ms(result.shed_p95_ms):>11}{rss:>11}'
+        )
+
+
+def compare(results: list[Result], baseline: dict, tolerance: float) -> bool:
+    """Print changes against a saved baseline; ``False`` on regression."""
+    previous = {
+        (entry['target'], entry['scenario']): entry
+        for entry in baseline['results']
+    }
+    print(f'\ncompared with {baseline["meta"]["commit"]}:')
+    ok = True
+    for result in results:
+        before = previous.get((result.target, result.scenario))
+        if before is None or not before['rps'] or before['p95_ms'] is None:
+            continue
+        rps = result.rps / before['rps'] - 1
+        # A run with no successful response at all lost all its latency.
+        p95 = (
+            float('inf')
+            if result.p95_ms is None
+            else result.p95_ms / before['p95_ms'] - 1
+        )
+        regressed = rps < -tolerance or p95 > tolerance
+        ok = ok and not regressed
+        print(
+            f'{result.target:<12}{result.scenario:<10}'
+            f'rps {rps:+8.1%}  p95 {p95:+8.1%}'
+            f'  shed {before["shed"] / before["requests"]:.0%}'
+            f' -> {result.shed / result.requests:.0%}'
+            + ('  REGRESSION' if regressed else '')
+        )
+    return ok
+
+
+def save(results: list[Result], path: Path, params: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps(
+            {
+                'meta': {
+                    'commit': _commit(),
+                    'created_at': datetime.now(UTC).isoformat(),
+                    'python': platform.python_version(),
+                    'sqlite': sqlite3.sqlite_version,
+                    'platform': platform.platform(),
+                    'machine': platform.machine(),
+                    'cpus': os.cpu_count(),
+                    'params': params,
+                },
+                'results': [asdict(result) for result in results],
+            },
+            indent=2,
+        )
+        + '\n',
+        encoding='utf-8',
+    )
+    print(f'\nbaseline saved to {path}')
+
+
+def seed(database_url: str, products: int, users: int) -> None:
+    subprocess.run(
+        [
+            sys.executable,
+            '-m',
+            'benchmarks.data',
+            '--database-url',
+            database_url,
+            '--products',
+            str(products),
+            '--users',
+            str(users),
+        ],
+        check=True,
+    )
+
+
+def run(args: argparse.Namespace, database_url: str) -> list[Result]:
+    if args.seed:
+        seed(database_url, args.products, args.users)
+    dataset = load_dataset(database_url)
+    options = LoadOptions(
+        concurrency=args.concurrency,
+        requests=args.requests,
+        warmup=args.warmup,
+    )
+    results = []
+    for target in args.targets:
+        for name in args.scenarios:
+            if target == 'uvicorn':
+                result = run_uvicorn(
+                    database_url, name, dataset, options, args.workers
+                )
+            else:
+                with ProcessPoolExecutor(
+                    max_workers=1,
+                    mp_context=multiprocessing.get_context('spawn'),
+                ) as pool:
+                    result = pool.submit(
+                        run_in_process, database_url, name, dataset, options
+                    ).result()
+            results.append(result)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument(
+        '--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS)
+    )
+    parser.add_argument(
+        '--targets', nargs='+', choices=TARGETS, default=list(TARGETS)
+    )
+    parser.add_argument('--products', type=int, default=100_000)
+    parser.add_argument('--users', type=int, default=10_000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=2_000)
+    parser.add_argument('--warmup', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument(
+        '--database-url',
+        help='Sync URL of an already seeded database; skips seeding. '
+        'Defaults to a freshly seeded temporary SQLite file.',
+    )
+    parser.add_argument(
+        '--save',
+        nargs='?',
+        const='',
+        help=f'Write a JSON baseline, by default to {BASELINES}/<commit>.json',
+    )
+    parser.add_argument('--compare', type=Path)
+    parser.add_argument('--tolerance', type=float, default=0.15)
+    args = parser.parse_args()
+    args.seed = args.database_url is None
+    # Every simulated client shares one address, so the auth rate limits
+    # would turn the login scenario into a 429 benchmark.
+    os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = args.database_url or f'sqlite:///{Path(directory) / "load.db"}'
+        results = run(args, url)
+
+    print_results(results)
+    if args.save is not None:
+        params = {
+            key: value
+            for key, value in vars(args).items()
+            if key not in {'save', 'compare', 'database_url'}
+        }
+        path = Path(args.save or BASELINES / f'{_commit()}.json')
+        save(results, path, params)
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding='utf-8'))
+        if not compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
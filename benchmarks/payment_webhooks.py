@@ -0,0 +1,138 @@
+"""Webhook acknowledgement latency and batched worker throughput.
+
+Events are posted one at a time through the ASGI app, so the latency
+covers signature checks, the job INSERT and its commit. The queue is
+then drained by the job worker in batches.
+
+Usage::
+
+    python -m benchmarks.payment_webhooks --events 2000 --batch-size 100
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from ecommerce.app import app
+from ecommerce.checkout.models import ORDER_PAID, Order
+from ecommerce.core.database import build_engine, get_session
+from ecommerce.core.settings import Settings, settings
+from ecommerce.jobs import job_worker
+from ecommerce.models import table_registry
+from ecommerce.payments.webhooks import sign
+from ecommerce.users.models import User
+
+PERCENTILES = (50, 95, 99)
+
+
+async def setup(factory, orders: int) -> list[str]:
+    async with factory() as session:
+        user = User(
+            name='Buyer', email='b@x.com', password='x', phone_number=None
+        )
+        session.add(user)
+        await session.flush()
+        rows = [Order(user_id=user.id, total=9.9) for _ in range(orders)]
+        session.add_all(rows)
+        await session.commit()
+        return [order.public_id for order in rows]
+
+
+def event(index: int, order_id: str) -> tuple[bytes, str]:
+    payload = json.dumps({
+        'id': f'evt_{index}',
+        'type': 'payment_intent.succeeded',
+        'created': index,
+        'data': {'object': {'metadata': {'order_id': order_id}}},
+    }).encode()
+    signature = sign(
+        payload,
+        secret=settings.PAYMENT_WEBHOOK_SECRET,
+        timestamp=int(time.time()),
+    )
+    return payload, signature
+
+
+async def run(database_url: str, events: int, batch_size: int) -> None:
+    engine = build_engine(Settings(DATABASE_URL=database_url))
+    async with engine.begin() as connection:
+        await connection.run_sync(table_registry.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    order_ids = await setup(factory, events)
+
+    async def get_session_override():
+        async with factory() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_session_override
+    job_worker.session_factory = factory
+    job_worker.batch_size = batch_size
+
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url='http://test'
+    ) as client:
+        for index, order_id in enumerate(order_ids):
+            payload, signature = event(index, order_id)
+            started = time.perf_counter()
+            response = await client.post(
+                '/payments/webhook/',
+                content=payload,
+                headers={'Stripe-Signature': signature},
+            )
+            latencies.append(time.perf_counter() - started)
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    while await job_worker.run_once():
+        pass
+    drained = time.perf_counter() - started
+
+    async with factory() as session:
+        paid = await session.scalar(
+            select(func.count())
+            .select_from(Order)
+            .where(Order.status == ORDER_PAID)
+        )
+    await engine.dispose()
+    app.dependency_overrides.clear()
+
+    assert paid == events, paid
+    cuts = statistics.quantiles(latencies, n=100)
+    print(
+        'ack latency '
+        + ' '.join(
+            f'p{cut}={cuts[cut - 1] * 1000:.2f}ms' for cut in PERCENTILES
+        )
+    )
+    print(
+        f'worker applied {events} events in {drained:.2f}s '
+        f'({events / drained:,.0f}/s, batches of {batch_size})'
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--events', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument(
+        '--database-url', help='Defaults to a temporary SQLite file.'
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = args.database_url or f'sqlite:///{Path(directory) / "b.db"}'
+        asyncio.run(run(url, args.events, args.batch_size))
+
+
+if __name__ == '__main__':
+    main()
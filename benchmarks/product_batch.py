@@ -0,0 +1,98 @@
+"""Fetching N products: one request per product vs. ``/products/batch/``.
+
+Runs in process over ASGI against a seeded SQLite file, with the
+response cache cleared before every request so each one reaches the
+database.
+
+Usage::
+
+    python -m benchmarks.product_batch --sizes 20,50,200
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from benchmarks.data import seed
+from benchmarks.scenarios import load_dataset
+from ecommerce.app import app
+from ecommerce.core.database import build_engine, get_session
+from ecommerce.core.settings import Settings
+from ecommerce.products.cache import product_response_cache
+
+ROUNDS = 20
+
+
+async def one_by_one(client, product_ids: list[str]) -> None:
+    for product_id in product_ids:
+        await product_response_cache.invalidate()
+        response = await client.get(f'/products/{product_id}/')
+        response.raise_for_status()
+
+
+async def batched(client, product_ids: list[str]) -> None:
+    response = await client.get(
+        '/products/batch/', params={'ids': ','.join(product_ids)}
+    )
+    response.raise_for_status()
+
+
+async def run(database_url: str, sizes: list[int]) -> None:
+    engine = build_engine(Settings(DATABASE_URL=database_url))
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def get_session_override():
+        async with factory() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_session_override
+    product_ids = load_dataset(database_url).product_ids
+    rng = random.Random(0)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url='http://bench'
+    ) as client:
+        print(f'{"size":>5}  {"one by one":>11}  {"batch":>9}  speedup')
+        for size in sizes:
+            timings = {one_by_one: [], batched: []}
+            for _ in range(ROUNDS):
+                sample = rng.sample(product_ids, size)
+                for fetch, samples in timings.items():
+                    started = time.perf_counter()
+                    await fetch(client, sample)
+                    samples.append(time.perf_counter() - started)
+            before = statistics.median(timings[one_by_one]) * 1000
+            after = statistics.median(timings[batched]) * 1000
+            print(
+                f'{size:>5}  {before:>9.1f}ms  {after:>7.1f}ms  '
+                f'{before / after:>6.1f}x'
+            )
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', default='20,50,200')
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = f'sqlite:///{Path(directory) / "batch.db"}'
+        sync_engine = create_engine(url)
+        seed(sync_engine, products=10_000, users=0, rng=random.Random(0))
+        sync_engine.dispose()
+        asyncio.run(run(url, sizes))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Full product pages vs. the grid projection ``fields=public_id,name,price``.
+
+Runs in process over ASGI against a seeded SQLite file with the response
+cache cleared before every request, and reports latency, response size
+and peak Python memory per page.
+
+Usage::
+
+    python -m benchmarks.product_fields --limit 200 --requests 300
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from benchmarks.data import seed
+from ecommerce.app import app
+from ecommerce.core.database import build_engine, get_session
+from ecommerce.core.settings import Settings
+from ecommerce.products.cache import product_response_cache
+
+GRID_FIELDS = 'public_id,name,price'
+
+
+async def measure(client, url: str, requests: int) -> tuple[float, int, int]:
+    latencies = []
+    for _ in range(requests):
+        await product_response_cache.invalidate()
+        started = time.perf_counter()
+        response = await client.get(url)
+        latencies.append(time.perf_counter() - started)
+        response.raise_for_status()
+
+    await product_response_cache.invalidate()
+    tracemalloc.start()
+    await client.get(url)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(latencies), len(response.content), peak
+
+
+async def run(database_url: str, limit: int, requests: int) -> None:
+    engine = build_engine(Settings(DATABASE_URL=database_url))
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def get_session_override():
+        async with factory() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_session_override
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url='http://bench'
+    ) as client:
+        urls = {
+            'all fields': f'/products/?limit={limit}',
+            'grid': f'/products/?limit={limit}&fields={GRID_FIELDS}',
+        }
+        await measure(client, urls['all fields'], requests // 10)
+        print(f'{"":>10}  {"p50":>8}  {"body":>8}  {"peak mem":>9}')
+        for name, url in urls.items():
+            latency, size, peak = await measure(client, url, requests)
+            print(
+                f'{name:>10}  {latency * 1000:>6.2f}ms  '
+                f'{size / 1024:>6.1f}KB  {peak / 1024:>7.0f}KB'
+            )
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--limit', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = f'sqlite:///{Path(directory) / "fields.db"}'
+        sync_engine = create_engine(url)
+        seed(sync_engine, products=10_000, users=0, rng=random.Random(0))
+        sync_engine.dispose()
+        asyncio.run(run(url, args.limit, args.requests))
+
+
+if __name__ == '__main__':
+    main()
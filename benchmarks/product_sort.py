@@ -0,0 +1,111 @@
+"""Sorted and price-filtered product pages on a large catalog.
+
+Runs in process over ASGI against a seeded SQLite file with the response
+cache cleared before every request. For each sort it times the first
+page and a page reached by following ``--depth`` cursors, which is where
+an unindexed sort would have to order the whole table again.
+
+Usage::
+
+    python -m benchmarks.product_sort --products 1000000 --requests 100
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from benchmarks.data import seed
+from ecommerce.app import app
+from ecommerce.core.database import build_engine, get_session
+from ecommerce.core.settings import Settings
+from ecommerce.products.cache import product_response_cache
+
+SCENARIOS = {
+    'newest': 'sort=-created_at',
+    'oldest': 'sort=created_at',
+    'cheapest': 'sort=price',
+    'priciest': 'sort=-price',
+    'name': 'sort=name',
+    '10-50, cheapest': 'min_price=10&max_price=50&sort=price',
+    '10-50, priciest': 'min_price=10&max_price=50&sort=-price',
+    '10-50, newest': 'min_price=10&max_price=50&sort=-created_at',
+}
+
+
+async def measure(client, url: str, requests: int) -> float:
+    latencies = []
+    for _ in range(requests):
+        await product_response_cache.invalidate()
+        started = time.perf_counter()
+        response = await client.get(url)
+        latencies.append(time.perf_counter() - started)
+        response.raise_for_status()
+    return statistics.median(latencies)
+
+
+async def deep_url(client, url: str, depth: int) -> str:
+    cursor = None
+    for _ in range(depth):
+        query = f'&cursor={cursor}' if cursor else ''
+        response = await client.get(url + query)
+        response.raise_for_status()
+        cursor = response.json()['next_cursor']
+    return f'{url}&cursor={cursor}'
+
+
+async def run(
+    database_url: str, limit: int, requests: int, depth: int
+) -> None:
+    engine = build_engine(Settings(DATABASE_URL=database_url))
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def get_session_override():
+        async with factory() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_session_override
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url='http://bench'
+    ) as client:
+        print(f'{"":>16}  {"page 1":>8}  {f"page {depth + 1}":>9}')
+        for name, query in SCENARIOS.items():
+            url = f'/products/?limit={limit}&{query}'
+            await measure(client, url, requests // 10)
+            first = await measure(client, url, requests)
+            deep = await measure(
+                client, await deep_url(client, url, depth), requests
+            )
+            print(f'{name:>16}  {first * 1000:>6.2f}ms  {deep * 1000:>7.2f}ms')
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--products', type=int, default=1_000_000)
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--depth', type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = f'sqlite:///{Path(directory) / "sort.db"}'
+        sync_engine = create_engine(url)
+        seed(
+            sync_engine, products=args.products, users=0, rng=random.Random(0)
+        )
+        sync_engine.dispose()
+        asyncio.run(run(url, args.limit, args.requests, args.depth))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""Public ID storage: ``String(26)`` vs. 16-byte ``ULID`` columns.
+
+Fills two SQLite tables with the same IDs, one per column type, and
+reports the size of each unique index (from ``dbstat``) and the latency
+of point lookups through SQLAlchemy. It also times minting IDs with
+ulid-py against ``generate_public_ids``.
+
+Usage::
+
+    python -m benchmarks.public_ids --rows 1000000
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import ulid
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    insert,
+    select,
+    text,
+)
+
+from ecommerce.core.db.types import ULID
+from ecommerce.core.utils.ids import generate_public_ids
+
+CHUNK_SIZE = 10_000
+LOOKUPS = 20_000
+MINT_COUNT = 100_000
+
+metadata = MetaData()
+TABLES = {
+    'string(26)': Table(
+        'ids_text',
+        metadata,
+        Column('id', Integer, primary_key=True),
+        Column('public_id', String(26), unique=True, index=True),
+    ),
+    'binary(16)': Table(
+        'ids_binary',
+        metadata,
+        Column('id', Integer, primary_key=True),
+        Column('public_id', ULID, unique=True, index=True),
+    ),
+}
+
+
+def mint() -> None:
+    started = time.perf_counter()
+    for _ in range(MINT_COUNT):
+        str(ulid.new())
+    before = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(MINT_COUNT // CHUNK_SIZE):
+        generate_public_ids(CHUNK_SIZE)
+    after = time.perf_counter() - started
+    print(
+        f'mint {MINT_COUNT:,} ids: ulid-py {before * 1000:.0f}ms, '
+        f'generate_public_ids {after * 1000:.0f}ms '
+        f'({before / after:.1f}x)'
+    )
+
+
+def index_size(connection, table: Table) -> int:
+    return connection.execute(
+        text('SELECT sum(pgsize) FROM dbstat WHERE name = :name'),
+        {'name': f'ix_{table.name}_public_id'},
+    ).scalar_one()
+
+
+def lookup_latency(connection, table: Table, sample: list[str]) -> float:
+    query = select(table.c.id).where(table.c.public_id == sample[0])
+    connection.execute(query)
+    samples = []
+    for public_id in sample:
+        started = time.perf_counter()
+        connection.execute(
+            select(table.c.id).where(table.c.public_id == public_id)
+        ).scalar_one()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def run(rows: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f'sqlite:///{Path(directory) / "ids.db"}')
+        metadata.create_all(engine)
+        public_ids = []
+        with engine.begin() as connection:
+            for start in range(0, rows, CHUNK_SIZE):
+                chunk = generate_public_ids(min(CHUNK_SIZE, rows - start))
+                public_ids += chunk
+                for table in TABLES.values():
+                    connection.execute(
+                        insert(table), [{'public_id': id_} for id_ in chunk]
+                    )
+        sample = random.Random(0).sample(public_ids, min(LOOKUPS, rows))
+
+        print(f'{rows:,} rows')
+        print(f'{"column":>12}  {"index size":>12}  {"lookup p50":>11}')
+        with engine.connect() as connection:
+            for name, table in TABLES.items():
+                size = index_size(connection, table)
+                latency = lookup_latency(connection, table, sample)
+                print(
+                    f'{name:>12}  {size / 2**20:>9.1f}MiB  '
+                    f'{latency * 1e6:>9.1f}us'
+                )
+        engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+    mint()
+    run(args.rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""Database round-trips per write, before and after the RETURNING path.
+
+"before" replays the previous flow: uniqueness SELECTs, then
+add/commit/refresh. "after" goes through the current services.
+
+Usage::
+
+    python -m benchmarks.round_trips --repeat 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ecommerce.core.database import build_engine
+from ecommerce.core.settings import Settings
+from ecommerce.models import table_registry
+from ecommerce.products.models import Product
+from ecommerce.products.repositories import ProductRepository
+from ecommerce.products.schemas import ProductUpdate
+from ecommerce.products.services import ProductService
+from ecommerce.users.models import User
+from ecommerce.users.repositories import UserRepository
+
+
+class RoundTrips:
+    def __init__(self, sync_engine):
+        self.count = 0
+        for name in ('before_cursor_execute', 'commit', 'rollback'):
+            event.listen(sync_engine, name, self._hit)
+
+    def _hit(self, *args) -> None:
+        self.count += 1
+
+
+async def before_register(session: AsyncSession, index: int) -> None:
+    repo = UserRepository(session)
+    email, phone = f'user{index}@example.com', f'+55{index:09d}'
+    assert not await repo.get_by_email(email)
+    assert not await repo.get_by_phone_number(phone)
+    user = User(name='User', email=email, password='x', phone_number=phone)
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+
+
+async def after_register(session: AsyncSession, index: int) -> None:
+    await UserRepository(session).create(
+        User(
+            name='User',
+            email=f'user{index}@example.com',
+            password='x',
+            phone_number=f'+55{index:09d}',
+        )
+    )
+
+
+async def before_create_product(session: AsyncSession, index: int) -> None:
+    repo = ProductRepository(session)
+    assert not await repo.get_by_sku(f'SKU-{index}')
+    product = Product(
+        name='Item', description=None, price=1.0, sku=f'SKU-{index}'
+    )
+    session.add(product)
+    await session.commit()
+    await session.refresh(product)
+
+
+async def after_create_product(session: AsyncSession, index: int) -> None:
+    await ProductService(ProductRepository(session)).create_product(
+        name='Item', price=1.0, sku=f'SKU-{index}'
+    )
+
+
+async def before_update_product(session: AsyncSession, index: int) -> None:
+    repo = ProductRepository(session)
+    product = await repo.get_by_sku(f'SKU-{index}')
+    assert not await repo.get_by_sku(f'NEW-{index}')
+    product.sku = f'NEW-{index}'
+    session.add(product)
+    await session.commit()
+    await session.refresh(product)
+
+
+async def after_update_product(session: AsyncSession, index: int) -> None:
+    repo = ProductRepository(session)
+    product = await repo.get_by_sku(f'SKU-{index}')
+    await ProductService(repo).update_product(
+        public_id=product.public_id,
+        payload=ProductUpdate(sku=f'NEW-{index}'),
+    )
+
+
+SCENARIOS = {
+    'register user': (before_register, after_register),
+    'create product': (before_create_product, after_create_product),
+    'update product sku': (before_update_product, after_update_product),
+}
+
+
+async def measure(directory: Path, operation, label: str, repeat: int):
+    engine = build_engine(
+        Settings(DATABASE_URL=f'sqlite:///{directory / label}.db')
+    )
+    async with engine.begin() as connection:
+        await connection.run_sync(table_registry.metadata.create_all)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        if operation.__name__.endswith('update_product'):
+            await ProductRepository(session).create_new_skus([
+                {
+                    'name': 'Item',
+                    'price': 1.0,
+                    'sku': f'SKU-{index}',
+                    'public_id': f'{index:026d}',
+                }
+                for index in range(repeat)
+            ])
+
+        round_trips = RoundTrips(engine.sync_engine)
+        timings = []
+        for index in range(repeat):
+            started = time.perf_counter()
+            await operation(session, index)
+            timings.append((time.perf_counter() - started) * 1000)
+    await engine.dispose()
+    return round_trips.count / repeat, statistics.median(timings)
+
+
+async def run(repeat: int) -> None:
+    print(
+        f'{"operation":<22}{"before":>8}{"after":>8}'
+        f'{"before p50":>13}{"after p50":>12}'
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for name, (before, after) in SCENARIOS.items():
+            trips_before, p50_before = await measure(
+                Path(directory), before, f'{name} before', repeat
+            )
+            trips_after, p50_after = await measure(
+                Path(directory), after, f'{name} after', repeat
+            )
+            print(
+                f'{name:<22}{trips_before:>8.1f}{trips_after:>8.1f}'
+                f'{p50_before:>11.2f}ms{p50_after:>10.2f}ms'
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""Request mixes driven by ``benchmarks.load``.
+
+A scenario issues one request per call and returns its response. Each
+load worker keeps its own ``state`` dict, e.g. a cursor to follow or a
+token obtained while preparing.
+"""
+
+import random
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+import httpx
+from sqlalchemy import create_engine, func, select
+
+from benchmarks.data import USER_PASSWORD, WORDS
+from ecommerce.products.models import Product
+from ecommerce.users.models import User
+
+PAGE_SIZE = 20
+SAMPLE_SIZE = 1_000
+# Share of browse requests that open a product page, and of list
+# requests that follow the previous page's cursor.
+DETAIL_SHARE = 0.5
+NEXT_PAGE_SHARE = 0.8
+
+
+@dataclass(frozen=True)
+class Dataset:
+    product_ids: list[str]
+    users: list[tuple[str, str]]  # (email, public_id)
+
+
+def load_dataset(database_url: str, *, size: int = SAMPLE_SIZE) -> Dataset:
+    engine = create_engine(database_url)
+    with engine.connect() as connection:
+        product_ids = connection.scalars(
+            select(Product.public_id).order_by(func.random()).limit(size)
+        ).all()
+        users = connection.execute(
+            select(User.email, User.public_id).order_by(User.id).limit(size)
+        ).all()
+    engine.dispose()
+    return Dataset(
+        product_ids=list(product_ids),
+        users=[tuple(user) for user in users],
+    )
+
+
+Request = Callable[
+    [httpx.AsyncClient, Dataset, random.Random, dict],
+    Awaitable[httpx.Response],
+]
+Prepare = Callable[[httpx.AsyncClient, Dataset, int, dict], Awaitable[None]]
+
+
+@dataclass(frozen=True)
+class Scenario:
+    request: Request
+    prepare: Prepare | None = None
+
+
+async def browse(client, dataset, rng, state) -> httpx.Response:
+    """Page through the catalog and open product pages."""
+    if rng.random() < DETAIL_SHARE:
+        return await client.get(
+            f'/products/{rng.choice(dataset.product_ids)}/'
+        )
+    params = {'limit': PAGE_SIZE}
+    if state.get('cursor') and rng.random() < NEXT_PAGE_SHARE:
+        params['cursor'] = state['cursor']
+    response = await client.get('/products/', params=params)
+    if response.status_code == httpx.codes.OK:
+        state['cursor'] = response.json()['next_cursor']
+    return response
+
+
+async def search(client, dataset, rng, state) -> httpx.Response:
+    words = rng.sample(WORDS, rng.randint(1, 2))
+    query = ' '.join([*words[:-1], words[-1][: rng.randint(3, 6)]])
+    return await client.get(
+        '/products/', params={'q': query, 'limit': PAGE_SIZE}
+    )
+
+
+async def login(client, dataset, rng, state) -> httpx.Response:
+    email, _ = rng.choice(dataset.users)
+    return await client.post(
+        '/auth/token/', data={'username': email, 'password': USER_PASSWORD}
+    )
+
+
+async def _token(client, email: str) -> str:
+    response = await client.post(
+        '/auth/token/', data={'username': email, 'password': USER_PASSWORD}
+    )
+    response.raise_for_status()
+    return response.json()['access_token']
+
+
+async def login_worker_user(client, dataset, worker, state) -> None:
+    email, public_id = dataset.users[worker % len(dataset.users)]
+    state['user_id'] = public_id
+    state['headers'] = {
+        'Authorization': f'Bearer {await _token(client, email)}'
+    }
+
+
+async def read_profile(client, dataset, rng, state) -> httpx.Response:
+    return await client.get(
+        f'/users/me/{state["user_id"]}/', headers=state['headers']
+    )
+
+
+async def update_profile(client, dataset, rng, state) -> httpx.Response:
+    return await client.put(
+        f'/users/me/{state["user_id"]}/',
+        json={'name': f'User {rng.randrange(1_000_000)}'},
+        headers=state['headers'],
+    )
+
+
+SCENARIOS = {
+    'browse': Scenario(browse),
+    'search': Scenario(search),
+    'login': Scenario(login),
+    'me': Scenario(read_profile, prepare=login_worker_user),
+    'profile': Scenario(update_profile, prepare=login_worker_user),
+}
@@ -0,0 +1,100 @@
+"""Product search latency: legacy ``LIKE '%q%'`` scan vs. full-text index.
+
+Usage::
+
+    python -m benchmarks.search --rows 100000 1000000
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from benchmarks.data import seed
+from ecommerce.products.models import Product
+from ecommerce.products.repositories import ProductRepository
+
+QUERIES = ('key', 'wireless mouse', 'gaming headset pro', 'dock', 'xyz')
+
+
+async def like_search(session: AsyncSession, query: str, limit: int):
+    pattern = f'%{query.lower()}%'
+    return await session.scalars(
+        select(Product)
+        .where(
+            or_(
+                func.lower(Product.name).like(pattern),
+                func.lower(Product.sku).like(pattern),
+            )
+        )
+        .order_by(Product.created_at.desc())
+        .limit(limit)
+    )
+
+
+async def measure(fn, repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def compare(database_url: str, repeat: int, limit: int) -> None:
+    engine = create_async_engine(database_url)
+    print(
+        f'{"query":<22}{"like p50":>12}{"like p95":>12}'
+        f'{"fts p50":>12}{"fts p95":>12}'
+    )
+    async with AsyncSession(engine) as session:
+        repo = ProductRepository(session)
+        for query in QUERIES:
+            like = await measure(
+                lambda: like_search(session, query, limit), repeat
+            )
+            fts = await measure(
+                lambda: repo.search(query, limit=limit), repeat
+            )
+            print(
+                f'{query:<22}'
+                f'{statistics.median(like):>10.2f}ms'
+                f'{statistics.quantiles(like, n=20)[-1]:>10.2f}ms'
+                f'{statistics.median(fts):>10.2f}ms'
+                f'{statistics.quantiles(fts, n=20)[-1]:>10.2f}ms'
+            )
+    await engine.dispose()
+
+
+def run(rows: int, repeat: int, limit: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / 'bench.db'
+        engine = create_engine(f'sqlite:///{path}')
+        started = time.perf_counter()
+        seed(engine, products=rows, users=0, rng=random.Random(rows))
+        engine.dispose()
+        elapsed = time.perf_counter() - started
+        print(f'\n{rows:,} products seeded in {elapsed:.1f}s')
+
+        asyncio.run(compare(f'sqlite+aiosqlite:///{path}', repeat, limit))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--limit', type=int, default=50)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        run(rows, args.repeat, args.limit)
+
+
+if __name__ == '__main__':
+    main()
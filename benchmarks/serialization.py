@@ -0,0 +1,93 @@
+"""List serialization: FastAPI's response_model path vs. ``dump_json``.
+
+"fastapi" validates the ORM objects against the response field, turns
+the result into plain Python and encodes it with ``JSONResponse``, as a
+route returning ORM objects does. "adapter" is ``json_response``: one
+validation through a cached ``TypeAdapter`` straight to JSON bytes.
+
+Usage::
+
+    python -m benchmarks.serialization --rows 10 1000 100000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from ecommerce.core.utils.schemas import json_response
+from ecommerce.products.models import Product
+from ecommerce.products.schemas import ProductRead
+
+SCHEMA = list[ProductRead]
+
+
+def make_products(count: int) -> list[Product]:
+    now = datetime(2024, 1, 1)
+    products = []
+    for index in range(count):
+        product = Product(
+            name=f'Product {index}',
+            description='Mechanical keyboard with hot-swappable switches',
+            price=10.0 + index,
+            sku=f'SKU-{index:07d}',
+        )
+        product.created_at = product.updated_at = now
+        products.append(product)
+    return products
+
+
+async def fastapi_path(field, products: list[Product]) -> bytes:
+    content = await serialize_response(
+        field=field, response_content=products
+    )
+    return JSONResponse(content).body
+
+
+async def adapter_path(field, products: list[Product]) -> bytes:
+    return json_response(SCHEMA, products).body
+
+
+async def measure(render, field, products, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await render(field, products)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+async def run(rows: list[int], repeat: int) -> None:
+    field = create_model_field(
+        name='Response', type_=SCHEMA, mode='serialization'
+    )
+    print(f'{"rows":>8}  {"fastapi":>12}  {"adapter":>12}  {"speedup":>8}')
+    for count in rows:
+        products = make_products(count)
+        assert await fastapi_path(field, products) == (
+            await adapter_path(field, products)
+        )
+        times = max(1, repeat * 1_000 // max(count, 1_000))
+        before = await measure(fastapi_path, field, products, times)
+        after = await measure(adapter_path, field, products, times)
+        print(
+            f'{count:>8}  {before * 1000:>10.3f}ms  {after * 1000:>10.3f}ms'
+            f'  {before / after:>7.1f}x'
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, nargs='+', default=[10, 1_000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.repeat))
+
+
+if __name__ == '__main__':
+    main()
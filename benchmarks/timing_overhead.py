@@ -0,0 +1,94 @@
+"""Cost of request timing: the same requests with timing off and on.
+
+Blocks of requests alternate between the two modes so drift in the
+machine affects both equally. "on" records every phase, emits the
+``Server-Timing`` header and formats the log line.
+
+Usage::
+
+    python -m benchmarks.timing_overhead --requests 2000 --rounds 5
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from benchmarks.data import seed
+from benchmarks.scenarios import load_dataset
+from ecommerce.app import app
+from ecommerce.core.database import build_engine, get_session
+from ecommerce.core.settings import Settings, settings
+from ecommerce.products.cache import product_response_cache
+
+
+async def block(client, product_ids: list[str], requests: int) -> float:
+    rng = random.Random(0)
+    started = time.perf_counter()
+    for _ in range(requests):
+        await product_response_cache.invalidate()
+        response = await client.get(f'/products/{rng.choice(product_ids)}/')
+        response.raise_for_status()
+    return (time.perf_counter() - started) / requests
+
+
+async def run(database_url: str, requests: int, rounds: int) -> None:
+    engine = build_engine(Settings(DATABASE_URL=database_url))
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def get_session_override():
+        async with factory() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_session_override
+    product_ids = load_dataset(database_url).product_ids
+    logging.basicConfig(
+        level=logging.INFO, handlers=[logging.NullHandler()]
+    )
+
+    timings = {False: [], True: []}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url='http://bench'
+    ) as client:
+        await block(client, product_ids, requests)
+        for _ in range(rounds):
+            for enabled in (False, True):
+                settings.REQUEST_TIMING = enabled
+                settings.REQUEST_TIMING_HEADER = enabled
+                timings[enabled].append(
+                    await block(client, product_ids, requests)
+                )
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+    off = statistics.median(timings[False]) * 1e6
+    on = statistics.median(timings[True]) * 1e6
+    print(f'timing off {off:8.1f}us/request')
+    print(f'timing on  {on:8.1f}us/request  ({on / off - 1:+.2%})')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2_000)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = f'sqlite:///{Path(directory) / "timing.db"}'
+        sync_engine = create_engine(url)
+        seed(sync_engine, products=10_000, users=0, rng=random.Random(0))
+        sync_engine.dispose()
+        asyncio.run(run(url, args.requests, args.rounds))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,22 @@
 from fastapi import APIRouter
 
-from ecommerce.api.routes import auth, products, users
+from ecommerce.api.routes import (
+    auth,
+    cart,
+    checkout,
+    inventory,
+    metrics,
+    payments,
+    products,
+    users,
+)
 
 api_router = APIRouter()
 api_router.include_router(auth.router)
+api_router.include_router(cart.router)
+api_router.include_router(checkout.router)
+api_router.include_router(inventory.router)
+api_router.include_router(metrics.router)
+api_router.include_router(payments.router)
 api_router.include_router(products.router)
 api_router.include_router(users.router)
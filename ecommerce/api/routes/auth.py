@@ -1,12 +1,19 @@
 from http import HTTPStatus
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from ecommerce.auth.rate_limits import (
+    CLIENT_IP_LIMIT,
+    USERNAME_LIMIT,
+    auth_rate_limiter,
+)
 from ecommerce.auth.schemas import Token
 from ecommerce.core.database import get_session
 from ecommerce.core.security import create_access_token
+from ecommerce.core.timing import TimedRoute
+from ecommerce.core.utils.schemas import json_response
 from ecommerce.users.repositories import UserRepository
 from ecommerce.users.schemas import UserCreate, UserRead
 from ecommerce.users.services import (
@@ -16,24 +23,37 @@ from ecommerce.users.services import (
     UserService,
 )
 
-router = APIRouter(prefix='/auth', tags=['auth'])
+router = APIRouter(prefix='/auth', tags=['auth'], route_class=TimedRoute)
 
 
-def get_user_service(session: Session = Depends(get_session)) -> UserService:
+async def get_user_service(
+    session: AsyncSession = Depends(get_session),
+) -> UserService:
     return UserService(UserRepository(session))
 
 
+async def limit_client_ip(request: Request) -> None:
+    """Rejects before any Argon2 work once an address runs out of tokens.
+
+    ``request.client`` is the peer address; run uvicorn with
+    ``--proxy-headers`` behind a trusted proxy.
+    """
+    host = request.client.host if request.client else 'unknown'
+    await auth_rate_limiter.check(f'ip:{host}', CLIENT_IP_LIMIT)
+
+
 @router.post(
     path='/register/',
     status_code=HTTPStatus.CREATED,
     response_model=UserRead,
+    dependencies=[Depends(limit_client_ip)],
 )
-def create_user(
+async def create_user(
     user: UserCreate,
     service: UserService = Depends(get_user_service),
 ):
     try:
-        return service.create_user(
+        new_user = await service.create_user(
             email=user.email,
             phone_number=user.phone_number,
             name=user.name,
@@ -50,17 +70,23 @@ def create_user(
             detail='Phone number already in use.',
         )
 
+    return json_response(UserRead, new_user, status_code=HTTPStatus.CREATED)
+
 
 @router.post(
     path='/token/',
     response_model=Token,
+    dependencies=[Depends(limit_client_ip)],
 )
-def login_for_access_token(
+async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
     service: UserService = Depends(get_user_service),
 ):
+    await auth_rate_limiter.check(
+        f'user:{form_data.username.lower()}', USERNAME_LIMIT
+    )
     try:
-        user = service.authenticate(
+        user = await service.authenticate(
             email=form_data.username,
             password=form_data.password,
         )
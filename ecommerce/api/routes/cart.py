@@ -0,0 +1,119 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ecommerce.api.routes.products import get_product_loader
+from ecommerce.api.routes.users import get_current_user
+from ecommerce.cart.repositories import CartRepository
+from ecommerce.cart.schemas import CartItemCreate, CartItemUpdate, CartRead
+from ecommerce.cart.services import CartProductNotFoundError, CartService
+from ecommerce.cart.store import cart_store
+from ecommerce.core.database import get_session
+from ecommerce.core.timing import TimedRoute
+from ecommerce.core.utils.schemas import Message, json_response
+from ecommerce.products.loaders import ProductLoader
+from ecommerce.users.cache import Principal
+
+router = APIRouter(prefix='/cart', tags=['cart'], route_class=TimedRoute)
+
+
+async def get_cart_service(
+    session: AsyncSession = Depends(get_session),
+    products: ProductLoader = Depends(get_product_loader),
+) -> CartService:
+    return CartService(cart_store, CartRepository(session), products)
+
+
+@router.get(
+    path='/',
+    response_model=CartRead,
+)
+async def get_cart(
+    current_user: Principal = Depends(get_current_user),
+    service: CartService = Depends(get_cart_service),
+):
+    return json_response(CartRead, await service.get_cart(current_user.id))
+
+
+@router.post(
+    path='/items/',
+    response_model=CartRead,
+)
+async def add_cart_item(
+    payload: CartItemCreate,
+    current_user: Principal = Depends(get_current_user),
+    service: CartService = Depends(get_cart_service),
+):
+    try:
+        cart = await service.add_item(
+            current_user.id,
+            product_id=payload.product_id,
+            quantity=payload.quantity,
+        )
+    except CartProductNotFoundError:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail='Product not found.',
+        )
+
+    return json_response(CartRead, cart)
+
+
+@router.put(
+    path='/items/{product_id}/',
+    response_model=CartRead,
+)
+async def update_cart_item(
+    product_id: str,
+    payload: CartItemUpdate,
+    current_user: Principal = Depends(get_current_user),
+    service: CartService = Depends(get_cart_service),
+):
+    try:
+        cart = await service.set_quantity(
+            current_user.id,
+            product_id=product_id,
+            quantity=payload.quantity,
+        )
+    except CartProductNotFoundError:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail='Product not in cart.',
+        )
+
+    return json_response(CartRead, cart)
+
+
+@router.delete(
+    path='/items/{product_id}/',
+    response_model=CartRead,
+)
+async def remove_cart_item(
+    product_id: str,
+    current_user: Principal = Depends(get_current_user),
+    service: CartService = Depends(get_cart_service),
+):
+    try:
+        cart = await service.remove_item(
+            current_user.id, product_id=product_id
+        )
+    except CartProductNotFoundError:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail='Product not in cart.',
+        )
+
+    return json_response(CartRead, cart)
+
+
+@router.delete(
+    path='/',
+    response_model=Message,
+)
+async def clear_cart(
+    current_user: Principal = Depends(get_current_user),
+    service: CartService = Depends(get_cart_service),
+):
+    await service.clear(current_user.id)
+    return {'message': 'Cart cleared.'}
@@ -0,0 +1,59 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ecommerce.api.routes.cart import get_cart_service
+from ecommerce.api.routes.users import get_current_user
+from ecommerce.cart.services import CartService
+from ecommerce.checkout.repositories import OrderRepository
+from ecommerce.checkout.schemas import OrderRead
+from ecommerce.checkout.services import CheckoutService, EmptyCartError
+from ecommerce.core.database import get_session
+from ecommerce.core.timing import TimedRoute
+from ecommerce.core.utils.schemas import json_response
+from ecommerce.inventory.rebalancer import inventory_rebalancer
+from ecommerce.inventory.repositories import InventoryRepository
+from ecommerce.inventory.services import InsufficientStockError
+from ecommerce.users.cache import Principal
+
+router = APIRouter(
+    prefix='/checkout', tags=['checkout'], route_class=TimedRoute
+)
+
+
+async def get_checkout_service(
+    session: AsyncSession = Depends(get_session),
+    cart: CartService = Depends(get_cart_service),
+) -> CheckoutService:
+    return CheckoutService(
+        cart,
+        OrderRepository(session),
+        InventoryRepository(session),
+        rebalancer=inventory_rebalancer,
+    )
+
+
+@router.post(
+    path='/',
+    status_code=HTTPStatus.CREATED,
+    response_model=OrderRead,
+)
+async def checkout(
+    current_user: Principal = Depends(get_current_user),
+    service: CheckoutService = Depends(get_checkout_service),
+):
+    try:
+        order = await service.checkout(current_user.id)
+    except EmptyCartError:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail='Cart is empty.',
+        )
+    except InsufficientStockError:
+        raise HTTPException(
+            status_code=HTTPStatus.CONFLICT,
+            detail='Insufficient stock.',
+        )
+
+    return json_response(OrderRead, order, status_code=HTTPStatus.CREATED)
@@ -0,0 +1,64 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ecommerce.core.database import get_session
+from ecommerce.core.timing import TimedRoute
+from ecommerce.inventory.repositories import InventoryRepository
+from ecommerce.inventory.schemas import StockRead, StockUpdate
+from ecommerce.inventory.services import InventoryService
+from ecommerce.products.models import Product
+from ecommerce.products.repositories import ProductRepository
+from ecommerce.products.services import ProductNotFoundError, ProductService
+
+router = APIRouter(
+    prefix='/inventory', tags=['inventory'], route_class=TimedRoute
+)
+
+
+async def get_inventory_service(
+    session: AsyncSession = Depends(get_session),
+) -> InventoryService:
+    return InventoryService(InventoryRepository(session))
+
+
+async def get_product(
+    product_id: str,
+    session: AsyncSession = Depends(get_session),
+) -> Product:
+    service = ProductService(ProductRepository(session))
+    try:
+        return await service.get_product_by_public_id(product_id)
+    except ProductNotFoundError:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail='Product not found.',
+        )
+
+
+@router.get(
+    path='/{product_id}/',
+    response_model=StockRead,
+)
+async def get_stock(
+    product: Product = Depends(get_product),
+    service: InventoryService = Depends(get_inventory_service),
+):
+    stock, shards = await service.get_stock(product.id)
+    return StockRead(product_id=product.public_id, stock=stock, shards=shards)
+
+
+@router.put(
+    path='/{product_id}/',
+    response_model=StockRead,
+)
+async def set_stock(
+    payload: StockUpdate,
+    product: Product = Depends(get_product),
+    service: InventoryService = Depends(get_inventory_service),
+):
+    stock, shards = await service.set_stock(
+        product.id, payload.stock, shards=payload.shards
+    )
+    return StockRead(product_id=product.public_id, stock=stock, shards=shards)
@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from ecommerce.core.metrics import registry
+from ecommerce.core.timing import TimedRoute
+
+router = APIRouter(prefix='/metrics', tags=['metrics'], route_class=TimedRoute)
+
+
+@router.get(
+    path='/',
+    response_class=PlainTextResponse,
+    include_in_schema=False,
+)
+async def read_metrics():
+    return PlainTextResponse(
+        registry.render(),
+        media_type='text/plain; version=0.0.4',
+    )
@@ -0,0 +1,69 @@
+import time
+from http import HTTPStatus
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ecommerce.core.database import get_session
+from ecommerce.core.jobs.queue import JobQueue
+from ecommerce.core.settings import settings
+from ecommerce.core.timing import TimedRoute
+from ecommerce.core.utils.schemas import Message
+from ecommerce.payments.services import PaymentWebhookService
+from ecommerce.payments.webhooks import (
+    InvalidEventError,
+    InvalidSignatureError,
+    parse_event,
+    verify_signature,
+)
+
+router = APIRouter(
+    prefix='/payments', tags=['payments'], route_class=TimedRoute
+)
+
+
+async def get_webhook_service(
+    session: AsyncSession = Depends(get_session),
+) -> PaymentWebhookService:
+    return PaymentWebhookService(JobQueue(session))
+
+
+@router.post(
+    path='/webhook/',
+    response_model=Message,
+    openapi_extra={
+        'requestBody': {
+            'required': True,
+            'content': {'application/json': {}},
+        },
+    },
+)
+async def payment_webhook(
+    request: Request,
+    stripe_signature: str | None = Header(default=None),
+    service: PaymentWebhookService = Depends(get_webhook_service),
+):
+    """Persist the event for the job workers and acknowledge at once."""
+    payload = await request.body()
+    try:
+        verify_signature(
+            payload,
+            stripe_signature,
+            secret=settings.PAYMENT_WEBHOOK_SECRET,
+            tolerance=settings.PAYMENT_WEBHOOK_TOLERANCE_SECONDS,
+            now=time.time(),
+        )
+        event = parse_event(payload)
+    except InvalidSignatureError:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail='Invalid signature.',
+        )
+    except InvalidEventError:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail='Invalid event.',
+        )
+
+    await service.receive(event)
+    return {'message': 'Event received.'}
@@ -1,13 +1,37 @@
 from http import HTTPStatus
+from typing import Annotated, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ecommerce.core.database import get_session
-from ecommerce.core.utils.schemas import Message
-from ecommerce.products.repositories import ProductRepository
+from ecommerce.core.db.pagination import InvalidCursorError
+from ecommerce.core.settings import settings
+from ecommerce.core.timing import TimedRoute
+from ecommerce.core.utils.schemas import (
+    Message,
+    PageRead,
+    UnknownFieldsError,
+    dump_json,
+    json_response,
+    parse_fields,
+    partial_schema,
+)
+from ecommerce.products.cache import product_response_cache
+from ecommerce.products.exports import EXPORT_MEDIA_TYPES, RENDERERS
+from ecommerce.products.imports import (
+    UnsupportedImportFormatError,
+    get_parser,
+)
+from ecommerce.products.loaders import ProductLoader
+from ecommerce.products.repositories import ProductFilter, ProductRepository
 from ecommerce.products.schemas import (
+    FIELDS_DESCRIPTION,
+    ProductBatchRead,
     ProductCreate,
+    ProductImportResult,
+    ProductListQuery,
     ProductRead,
     ProductUpdate,
 )
@@ -17,13 +41,32 @@ from ecommerce.products.services import (
     SKUAlreadyExistsError,
 )
 
-router = APIRouter(prefix='/products', tags=['products'])
+router = APIRouter(
+    prefix='/products', tags=['products'], route_class=TimedRoute
+)
 
 
-def get_product_service(
-    session: Session = Depends(get_session),
+async def get_product_service(
+    session: AsyncSession = Depends(get_session),
 ) -> ProductService:
-    return ProductService(ProductRepository(session))
+    return ProductService(ProductRepository(session), product_response_cache)
+
+
+def _parse_fields(fields: str | None) -> tuple[str, ...] | None:
+    try:
+        return parse_fields(ProductRead, fields)
+    except UnknownFieldsError as exc:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=f'Unknown fields: {", ".join(exc.fields)}.',
+        )
+
+
+async def get_product_loader(
+    session: AsyncSession = Depends(get_session),
+) -> ProductLoader:
+    """One loader per request, shared by every dependency that asks."""
+    return ProductLoader(ProductRepository(session))
 
 
 @router.post(
@@ -31,12 +74,12 @@ def get_product_service(
     status_code=HTTPStatus.CREATED,
     response_model=ProductRead,
 )
-def create_product(
+async def create_product(
     payload: ProductCreate,
     service: ProductService = Depends(get_product_service),
 ):
     try:
-        return service.create_product(
+        product = await service.create_product(
             name=payload.name,
             description=payload.description,
             price=payload.price,
@@ -48,46 +91,187 @@ def create_product(
             detail='SKU already in use.',
         )
 
+    return json_response(ProductRead, product, status_code=HTTPStatus.CREATED)
+
+
+@router.post(
+    path='/bulk/',
+    response_model=ProductImportResult,
+    openapi_extra={
+        'requestBody': {
+            'required': True,
+            'content': {
+                'application/x-ndjson': {},
+                'text/csv': {},
+            },
+        },
+    },
+)
+async def import_products(
+    request: Request,
+    service: ProductService = Depends(get_product_service),
+):
+    try:
+        parse = get_parser(request.headers.get('content-type'))
+    except UnsupportedImportFormatError:
+        raise HTTPException(
+            status_code=HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+            detail='Send application/x-ndjson or text/csv.',
+        )
+
+    return await service.import_products(
+        parse(request.stream()),
+        chunk_size=settings.PRODUCT_IMPORT_CHUNK_SIZE,
+        max_errors=settings.PRODUCT_IMPORT_MAX_ERRORS,
+    )
+
 
 @router.get(
     path='/',
-    response_model=list[ProductRead],
+    response_model=PageRead[ProductRead],
+)
+async def list_products(
+    request: Request,
+    params: Annotated[ProductListQuery, Query()],
+    service: ProductService = Depends(get_product_service),
+):
+    fields = _parse_fields(params.fields)
+    key = await product_response_cache.key(request)
+    cached = await product_response_cache.get(key)
+    if cached is None:
+        try:
+            page = await service.list_products(
+                filters=ProductFilter(
+                    query=params.q,
+                    min_price=params.min_price,
+                    max_price=params.max_price,
+                ),
+                sort=params.sort,
+                limit=params.limit,
+                cursor=params.cursor,
+                fields=fields,
+            )
+        except InvalidCursorError:
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST,
+                detail='Invalid cursor.',
+            )
+        schema = PageRead[partial_schema(ProductRead, fields)]
+        cached = await product_response_cache.set(
+            key, dump_json(schema, page)
+        )
+
+    return product_response_cache.respond(request, cached)
+
+
+@router.get(
+    path='/export/',
+    response_class=StreamingResponse,
+    responses={
+        HTTPStatus.OK: {
+            'content': {
+                media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()
+            },
+        },
+    },
+)
+async def export_products(
+    export_format: Literal['ndjson', 'json', 'csv'] = Query(
+        default='ndjson', alias='format'
+    ),
+    session: AsyncSession = Depends(get_session),
+    service: ProductService = Depends(get_product_service),
+):
+    batches = service.export_products(
+        batch_size=settings.PRODUCT_EXPORT_BATCH_SIZE
+    )
+
+    async def stream():
+        # The session dependency has already exited once the body starts
+        # streaming, so the connection used here is released explicitly.
+        try:
+            async for chunk in RENDERERS[export_format](batches):
+                yield chunk
+        finally:
+            await batches.aclose()
+            await session.close()
+
+    filename = f'products.{export_format}'
+    return StreamingResponse(
+        stream(),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get(
+    path='/batch/',
+    response_model=ProductBatchRead,
 )
-def list_products(
-    q: str | None = Query(default=None, min_length=1),
+async def get_products_batch(
+    ids: str = Query(min_length=1, description='Comma-separated public IDs.'),
     service: ProductService = Depends(get_product_service),
 ):
-    return service.list_products(query=q)
+    public_ids = [public_id.strip() for public_id in ids.split(',')]
+    public_ids = [public_id for public_id in public_ids if public_id]
+    if len(public_ids) > settings.PRODUCT_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=(
+                f'Ask for at most {settings.PRODUCT_BATCH_MAX_IDS} '
+                'products at a time.'
+            ),
+        )
+
+    lookup = await service.get_products_by_public_ids(public_ids)
+    return json_response(ProductBatchRead, lookup)
 
 
 @router.get(
     path='/{product_id}/',
     response_model=ProductRead,
 )
-def get_product(
+async def get_product(
+    request: Request,
     product_id: str,
+    fields: str | None = Query(
+        default=None, min_length=1, description=FIELDS_DESCRIPTION
+    ),
     service: ProductService = Depends(get_product_service),
 ):
-    try:
-        return service.get_product_by_public_id(product_id)
-    except ProductNotFoundError:
-        raise HTTPException(
-            status_code=HTTPStatus.NOT_FOUND,
-            detail='Product not found.',
+    projection = _parse_fields(fields)
+    key = await product_response_cache.key(request)
+    cached = await product_response_cache.get(key)
+    if cached is None:
+        try:
+            product = await service.get_product_by_public_id(
+                product_id, fields=projection
+            )
+        except ProductNotFoundError:
+            raise HTTPException(
+                status_code=HTTPStatus.NOT_FOUND,
+                detail='Product not found.',
+            )
+        cached = await product_response_cache.set(
+            key, dump_json(partial_schema(ProductRead, projection), product)
         )
 
+    return product_response_cache.respond(request, cached)
+
 
 @router.put(
     path='/{product_id}/',
     response_model=ProductRead,
 )
-def update_product(
+async def update_product(
     product_id: str,
     payload: ProductUpdate,
     service: ProductService = Depends(get_product_service),
 ):
     try:
-        return service.update_product(public_id=product_id, payload=payload)
+        product = await service.update_product(
+            public_id=product_id, payload=payload
+        )
     except ProductNotFoundError:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
@@ -99,17 +283,19 @@ def update_product(
             detail='SKU already in use.',
         )
 
+    return json_response(ProductRead, product)
+
 
 @router.delete(
     path='/{product_id}/',
     response_model=Message,
 )
-def delete_product(
+async def delete_product(
     product_id: str,
     service: ProductService = Depends(get_product_service),
 ):
     try:
-        service.delete_product(public_id=product_id)
+        await service.delete_product(public_id=product_id)
     except ProductNotFoundError:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
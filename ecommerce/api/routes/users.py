@@ -2,12 +2,14 @@ from http import HTTPStatus
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from ecommerce.cart.store import cart_store
 from ecommerce.core.database import get_session
-from ecommerce.core.security import get_token_subject
-from ecommerce.core.utils.schemas import Message
-from ecommerce.users.models import User
+from ecommerce.core.security import get_token_subject, verified_tokens
+from ecommerce.core.timing import TimedRoute
+from ecommerce.core.utils.schemas import Message, json_response
+from ecommerce.users.cache import Principal, principal_cache
 from ecommerce.users.repositories import UserRepository
 from ecommerce.users.schemas import UserRead, UserUpdate
 from ecommerce.users.services import (
@@ -20,21 +22,28 @@ from ecommerce.users.services import (
 )
 
 
-def get_user_service(session: Session = Depends(get_session)) -> UserService:
-    return UserService(UserRepository(session))
+async def get_user_service(
+    session: AsyncSession = Depends(get_session),
+) -> UserService:
+    return UserService(
+        UserRepository(session),
+        principal_cache,
+        verified_tokens,
+        cart_store=cart_store,
+    )
 
 
-router = APIRouter(prefix='/users', tags=['users'])
+router = APIRouter(prefix='/users', tags=['users'], route_class=TimedRoute)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/auth/token/')
 
 
-def get_current_user(
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
     service: UserService = Depends(get_user_service),
-) -> User:
+) -> Principal:
     subject = get_token_subject(token)
     try:
-        return service.get_user_by_email(subject)
+        return await service.get_principal(subject)
     except UserNotFoundError:
         raise HTTPException(
             status_code=HTTPStatus.UNAUTHORIZED,
@@ -42,7 +51,9 @@ def get_current_user(
         )
 
 
-def validate_user_access(request_user_id: str, current_user: User) -> None:
+def validate_user_access(
+    request_user_id: str, current_user: Principal
+) -> None:
     if request_user_id != current_user.public_id:
         raise HTTPException(
             status_code=HTTPStatus.FORBIDDEN,
@@ -54,34 +65,38 @@ def validate_user_access(request_user_id: str, current_user: User) -> None:
     path='/me/{user_id}/',
     response_model=UserRead,
 )
-def read_user(
+async def read_user(
     user_id: str,
     service: UserService = Depends(get_user_service),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     validate_user_access(user_id, current_user)
     try:
-        return service.get_user_by_public_id(user_id)
+        user = await service.get_user_by_public_id(user_id)
     except UserNotFoundError:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
             detail='User not found.',
         )
 
+    return json_response(UserRead, user)
+
 
 @router.put(
     path='/me/{user_id}/',
     response_model=UserRead,
 )
-def update_user(
+async def update_user(
     user_id: str,
     user_update: UserUpdate,
     service: UserService = Depends(get_user_service),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     validate_user_access(user_id, current_user)
     try:
-        return service.update_user(public_id=user_id, payload=user_update)
+        user = await service.update_user(
+            public_id=user_id, payload=user_update
+        )
     except UserNotFoundError:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
@@ -111,19 +126,21 @@ def update_user(
             detail='Current password is incorrect.',
         )
 
+    return json_response(UserRead, user)
+
 
 @router.delete(
     path='/me/{user_id}/',
     response_model=Message,
 )
-def delete_user(
+async def delete_user(
     user_id: str,
     service: UserService = Depends(get_user_service),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     validate_user_access(user_id, current_user)
     try:
-        service.delete_user(public_id=user_id)
+        await service.delete_user(public_id=user_id)
     except UserNotFoundError:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
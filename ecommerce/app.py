@@ -1,7 +1,59 @@
-from fastapi import FastAPI
+import math
+from contextlib import asynccontextmanager
+from http import HTTPStatus
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 
 from ecommerce.api import api_router
+from ecommerce.cart.persistence import cart_write_behind
+from ecommerce.core.db.routing import ReadYourWritesMiddleware
+from ecommerce.core.rate_limit import RateLimitExceededError
+from ecommerce.core.security import PasswordHasherBusyError, password_hasher
+from ecommerce.core.settings import settings
+from ecommerce.core.timing import RequestTimingMiddleware
+from ecommerce.core.utils.schemas import FastJSONResponse
+from ecommerce.inventory.rebalancer import inventory_rebalancer
+from ecommerce.jobs import job_worker
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    cart_write_behind.start()
+    inventory_rebalancer.start()
+    if settings.JOBS_RUN_IN_APP:
+        job_worker.start()
+    yield
+    await job_worker.stop()
+    await inventory_rebalancer.stop()
+    await cart_write_behind.stop()
+    password_hasher.shutdown()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+app.add_middleware(RequestTimingMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
 
 app.include_router(api_router)
+
+
+@app.exception_handler(PasswordHasherBusyError)
+async def password_hasher_busy_handler(
+    request: Request, exc: PasswordHasherBusyError
+):
+    return JSONResponse(
+        status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+        content={'detail': 'Authentication is busy, try again shortly.'},
+        headers={'Retry-After': str(math.ceil(exc.retry_after))},
+    )
+
+
+@app.exception_handler(RateLimitExceededError)
+async def rate_limit_exceeded_handler(
+    request: Request, exc: RateLimitExceededError
+):
+    return JSONResponse(
+        status_code=HTTPStatus.TOO_MANY_REQUESTS,
+        content={'detail': 'Too many attempts, try again later.'},
+        headers={'Retry-After': str(math.ceil(exc.retry_after))},
+    )
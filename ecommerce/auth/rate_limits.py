@@ -0,0 +1,14 @@
+from ecommerce.core.rate_limit import RateLimit, build_rate_limiter
+from ecommerce.core.settings import settings
+
+auth_rate_limiter = build_rate_limiter(namespace='ratelimit:auth')
+
+CLIENT_IP_LIMIT = RateLimit(
+    burst=settings.AUTH_RATE_LIMIT_IP_BURST,
+    per_minute=settings.AUTH_RATE_LIMIT_IP_PER_MINUTE,
+)
+# Caps guesses against one account however many addresses they come from.
+USERNAME_LIMIT = RateLimit(
+    burst=settings.AUTH_RATE_LIMIT_USERNAME_BURST,
+    per_minute=settings.AUTH_RATE_LIMIT_USERNAME_PER_MINUTE,
+)
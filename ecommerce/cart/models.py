@@ -0,0 +1,32 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ecommerce.core.db.base import table_registry
+
+
+@table_registry.mapped_as_dataclass
+class CartItem:
+    __tablename__ = 'cart_items'
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey('users.id', ondelete='CASCADE'),
+        primary_key=True,
+    )
+    product_id: Mapped[int] = mapped_column(
+        ForeignKey('products.id', ondelete='CASCADE'),
+        primary_key=True,
+        index=True,
+    )
+    quantity: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+        init=False,
+    )
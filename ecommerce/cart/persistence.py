@@ -0,0 +1,86 @@
+import time
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from ecommerce.cart.repositories import CartRepository
+from ecommerce.cart.store import CartStore, cart_store
+from ecommerce.core.background import PeriodicTask
+from ecommerce.core.database import session_factory
+from ecommerce.core.db.unit_of_work import UnitOfWork
+from ecommerce.core.metrics import registry
+from ecommerce.core.settings import settings
+
+carts_flushed = registry.counter(
+    'cart_write_behind_carts_total',
+    'Carts written to the database by the write-behind flusher.',
+)
+cart_flush_seconds = registry.histogram(
+    'cart_write_behind_flush_seconds',
+    'Time spent writing one batch of dirty carts.',
+)
+
+
+class CartWriteBehind(PeriodicTask):
+    """Periodically persists dirty carts from the store to SQL.
+
+    Writes to the same cart between two flushes coalesce into a single
+    row replacement, and each batch costs a fixed number of statements.
+    """
+
+    def __init__(
+        self,
+        store: CartStore,
+        session_factory: async_sessionmaker,
+        *,
+        interval: float,
+        batch_size: int,
+    ):
+        super().__init__(interval=interval)
+        self.store = store
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+
+    async def flush(self) -> int:
+        flushed = 0
+        while True:
+            user_ids = await self.store.pop_dirty(self.batch_size)
+            if not user_ids:
+                return flushed
+
+            started = time.perf_counter()
+            carts = {
+                user_id: items
+                for user_id, items in (
+                    await self.store.get_many(user_ids)
+                ).items()
+                if items is not None
+            }
+            try:
+                async with self.session_factory() as session:
+                    async with UnitOfWork(session):
+                        written = await CartRepository(
+                            session
+                        ).replace_many(carts)
+            except Exception:
+                await self.store.mark_dirty(*user_ids)
+                raise
+            cart_flush_seconds.observe(time.perf_counter() - started)
+            carts_flushed.inc(written)
+            flushed += written
+            if len(user_ids) < self.batch_size:
+                return flushed
+
+    async def tick(self) -> None:
+        await self.flush()
+
+    async def stop(self) -> None:
+        await super().stop()
+        await self.flush()
+
+
+cart_write_behind = CartWriteBehind(
+    cart_store,
+    session_factory,
+    interval=settings.CART_FLUSH_INTERVAL_SECONDS,
+    batch_size=settings.CART_FLUSH_BATCH_SIZE,
+)
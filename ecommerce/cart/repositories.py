@@ -0,0 +1,70 @@
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ecommerce.cart.models import CartItem
+from ecommerce.products.models import Product
+from ecommerce.users.models import User
+
+
+class CartRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_items(self, user_id: int) -> dict[str, int]:
+        rows = await self.session.execute(
+            select(Product.public_id, CartItem.quantity)
+            .join(Product, Product.id == CartItem.product_id)
+            .where(CartItem.user_id == user_id)
+            .order_by(CartItem.product_id)
+        )
+        return dict(rows.tuples().all())
+
+    async def replace_many(self, carts: dict[int, dict[str, int]]) -> int:
+        """Overwrite the stored lines of every cart in ``carts``.
+
+        Carts of users that no longer exist are skipped, so a user
+        deleted between a write and the flush cannot fail the batch.
+        Returns the number of carts written.
+        """
+        if not carts:
+            return 0
+
+        user_ids = set(
+            await self.session.scalars(
+                select(User.id).where(User.id.in_(list(carts)))
+            )
+        )
+        carts = {
+            user_id: items
+            for user_id, items in carts.items()
+            if user_id in user_ids
+        }
+        if not carts:
+            return 0
+
+        public_ids = set().union(*carts.values())
+        product_ids = {}
+        if public_ids:
+            rows = await self.session.execute(
+                select(Product.public_id, Product.id).where(
+                    Product.public_id.in_(public_ids)
+                )
+            )
+            product_ids = dict(rows.tuples().all())
+
+        await self.session.execute(
+            delete(CartItem).where(CartItem.user_id.in_(list(carts)))
+        )
+        rows = [
+            {
+                'user_id': user_id,
+                'product_id': product_ids[public_id],
+                'quantity': quantity,
+            }
+            for user_id, items in carts.items()
+            for public_id, quantity in items.items()
+            if public_id in product_ids
+        ]
+        if rows:
+            await self.session.execute(insert(CartItem), rows)
+        return len(carts)
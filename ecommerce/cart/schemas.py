@@ -0,0 +1,26 @@
+from pydantic import BaseModel, Field
+
+MAX_LINE_QUANTITY = 99
+
+
+class CartItemCreate(BaseModel):
+    product_id: str
+    quantity: int = Field(default=1, ge=1, le=MAX_LINE_QUANTITY)
+
+
+class CartItemUpdate(BaseModel):
+    quantity: int = Field(ge=0, le=MAX_LINE_QUANTITY)
+
+
+class CartLineRead(BaseModel):
+    product_id: str
+    name: str
+    sku: str
+    unit_price: float
+    quantity: int
+    subtotal: float
+
+
+class CartRead(BaseModel):
+    items: list[CartLineRead]
+    total: float
@@ -0,0 +1,104 @@
+from dataclasses import dataclass, field
+
+from ecommerce.cart.repositories import CartRepository
+from ecommerce.cart.store import CartStore
+from ecommerce.products.loaders import ProductLoader
+from ecommerce.products.models import Product
+
+
+class CartProductNotFoundError(Exception): ...
+
+
+@dataclass
+class CartLine:
+    product: Product
+    quantity: int
+
+    @property
+    def product_id(self) -> str:
+        return self.product.public_id
+
+    @property
+    def name(self) -> str:
+        return self.product.name
+
+    @property
+    def sku(self) -> str:
+        return self.product.sku
+
+    @property
+    def unit_price(self) -> float:
+        return self.product.price
+
+    @property
+    def subtotal(self) -> float:
+        return round(self.unit_price * self.quantity, 2)
+
+
+@dataclass
+class Cart:
+    items: list[CartLine] = field(default_factory=list)
+
+    @property
+    def total(self) -> float:
+        return round(sum(line.subtotal for line in self.items), 2)
+
+
+class CartService:
+    def __init__(
+        self,
+        store: CartStore,
+        carts: CartRepository,
+        products: ProductLoader,
+    ):
+        self.store = store
+        self.carts = carts
+        self.products = products
+
+    async def _items(self, user_id: int) -> dict[str, int]:
+        items = await self.store.get(user_id)
+        if items is None:
+            items = await self.carts.get_items(user_id)
+            await self.store.load(user_id, items)
+        return items
+
+    async def _price(self, items: dict[str, int]) -> Cart:
+        products = await self.products.load_many(items)
+        return Cart(
+            items=[
+                CartLine(product=product, quantity=quantity)
+                for product, quantity in zip(products, items.values())
+                if product is not None
+            ]
+        )
+
+    async def get_cart(self, user_id: int) -> Cart:
+        return await self._price(await self._items(user_id))
+
+    async def add_item(
+        self, user_id: int, *, product_id: str, quantity: int
+    ) -> Cart:
+        await self._items(user_id)
+        await self.store.add(user_id, product_id, quantity)
+        cart = await self.get_cart(user_id)
+        if not any(line.product_id == product_id for line in cart.items):
+            await self.store.set(user_id, product_id, 0)
+            raise CartProductNotFoundError()
+        return cart
+
+    async def set_quantity(
+        self, user_id: int, *, product_id: str, quantity: int
+    ) -> Cart:
+        items = await self._items(user_id)
+        if product_id not in items:
+            raise CartProductNotFoundError()
+        await self.store.set(user_id, product_id, quantity)
+        return await self.get_cart(user_id)
+
+    async def remove_item(self, user_id: int, *, product_id: str) -> Cart:
+        return await self.set_quantity(
+            user_id, product_id=product_id, quantity=0
+        )
+
+    async def clear(self, user_id: int) -> None:
+        await self.store.clear(user_id)
@@ -0,0 +1,287 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Callable, Protocol
+
+from ecommerce.core.cache import get_redis_client
+from ecommerce.core.settings import settings
+
+_LOADED = '_loaded'
+_RESET_BATCH_SIZE = 500
+
+
+class CartStore(Protocol):
+    """Hot cart state: product public_id -> quantity per user.
+
+    ``get`` returns ``None`` until a cart is loaded, so an empty cart is
+    told apart from one that still lives only in SQL. Every write marks
+    the cart dirty for the write-behind flusher.
+    """
+
+    async def get(self, user_id: int) -> dict[str, int] | None: ...
+
+    async def get_many(
+        self, user_ids: list[int]
+    ) -> dict[int, dict[str, int] | None]: ...
+
+    async def load(self, user_id: int, items: dict[str, int]) -> None: ...
+
+    async def add(
+        self, user_id: int, product_id: str, quantity: int
+    ) -> int: ...
+
+    async def set(
+        self, user_id: int, product_id: str, quantity: int
+    ) -> None: ...
+
+    async def clear(self, user_id: int) -> None: ...
+
+    async def forget(self, user_id: int) -> None: ...
+
+    async def mark_dirty(self, *user_ids: int) -> None: ...
+
+    async def pop_dirty(self, count: int) -> list[int]: ...
+
+    async def reset(self) -> None: ...
+
+
+class InMemoryCartStore:
+    """Process-local carts that expire after ``ttl`` seconds idle.
+
+    Beyond ``max_size`` the least recently used clean cart is evicted;
+    dirty carts stay until the write-behind flusher has persisted them,
+    so eviction never drops a write. Each worker process holds its own
+    copy, so this store is only safe with a single worker.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float,
+        max_size: int,
+        clock: Callable[[], float] = monotonic,
+    ):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._clock = clock
+        self._carts: OrderedDict[int, tuple[float, dict[str, int]]] = (
+            OrderedDict()
+        )
+        self._dirty: set[int] = set()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._carts)
+
+    def _touch(self, user_id: int) -> dict[str, int] | None:
+        now = self._clock()
+        entry = self._carts.get(user_id)
+        if entry is None:
+            return None
+        expires_at, items = entry
+        if expires_at <= now and user_id not in self._dirty:
+            del self._carts[user_id]
+            return None
+        self._carts[user_id] = (now + self.ttl, items)
+        self._carts.move_to_end(user_id)
+        return items
+
+    def _store(self, user_id: int, items: dict[str, int]) -> None:
+        now = self._clock()
+        self._carts[user_id] = (now + self.ttl, items)
+        self._carts.move_to_end(user_id)
+        self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        # Entries are kept in last-touched order, which is also expiry
+        # order, so expired and least recently used carts sit up front.
+        for user_id in list(self._carts):
+            expires_at, _ = self._carts[user_id]
+            if expires_at > now and len(self._carts) <= self.max_size:
+                return
+            if user_id not in self._dirty:
+                del self._carts[user_id]
+
+    def _items(self, user_id: int) -> dict[str, int]:
+        items = self._touch(user_id)
+        if items is None:
+            items = {}
+            self._store(user_id, items)
+        return items
+
+    async def get(self, user_id: int) -> dict[str, int] | None:
+        with self._lock:
+            items = self._touch(user_id)
+            return dict(items) if items is not None else None
+
+    async def get_many(
+        self, user_ids: list[int]
+    ) -> dict[int, dict[str, int] | None]:
+        return {user_id: await self.get(user_id) for user_id in user_ids}
+
+    async def load(self, user_id: int, items: dict[str, int]) -> None:
+        with self._lock:
+            self._store(user_id, dict(items))
+
+    async def add(self, user_id: int, product_id: str, quantity: int) -> int:
+        with self._lock:
+            self._dirty.add(user_id)
+            items = self._items(user_id)
+            items[product_id] = items.get(product_id, 0) + quantity
+            return items[product_id]
+
+    async def set(self, user_id: int, product_id: str, quantity: int) -> None:
+        with self._lock:
+            self._dirty.add(user_id)
+            items = self._items(user_id)
+            if quantity > 0:
+                items[product_id] = quantity
+            else:
+                items.pop(product_id, None)
+
+    async def clear(self, user_id: int) -> None:
+        with self._lock:
+            self._dirty.add(user_id)
+            self._store(user_id, {})
+
+    async def forget(self, user_id: int) -> None:
+        with self._lock:
+            self._carts.pop(user_id, None)
+            self._dirty.discard(user_id)
+
+    async def mark_dirty(self, *user_ids: int) -> None:
+        with self._lock:
+            self._dirty.update(user_ids)
+
+    async def pop_dirty(self, count: int) -> list[int]:
+        with self._lock:
+            count = min(count, len(self._dirty))
+            return [self._dirty.pop() for _ in range(count)]
+
+    async def reset(self) -> None:
+        with self._lock:
+            self._carts.clear()
+            self._dirty.clear()
+
+
+class RedisCartStore:
+    """Carts as Redis hashes; each write is one MULTI/EXEC round-trip."""
+
+    def __init__(self, client, *, namespace: str, ttl: float):
+        self.client = client
+        self.namespace = namespace
+        self.ttl_ms = max(int(ttl * 1000), 1)
+        self._dirty_key = f'{namespace}:dirty'
+
+    def _key(self, user_id: int) -> str:
+        return f'{self.namespace}:{user_id}'
+
+    @staticmethod
+    def _decode(raw: dict) -> dict[str, int] | None:
+        items = {
+            (key.decode() if isinstance(key, bytes) else key): int(value)
+            for key, value in raw.items()
+        }
+        if items.pop(_LOADED, None) is None:
+            return None
+        return items
+
+    async def get(self, user_id: int) -> dict[str, int] | None:
+        return self._decode(await self.client.hgetall(self._key(user_id)))
+
+    async def get_many(
+        self, user_ids: list[int]
+    ) -> dict[int, dict[str, int] | None]:
+        async with self.client.pipeline(transaction=False) as pipe:
+            for user_id in user_ids:
+                pipe.hgetall(self._key(user_id))
+            results = await pipe.execute()
+        return {
+            user_id: self._decode(raw)
+            for user_id, raw in zip(user_ids, results)
+        }
+
+    async def load(self, user_id: int, items: dict[str, int]) -> None:
+        key = self._key(user_id)
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.hset(key, mapping={_LOADED: 1, **items})
+            pipe.pexpire(key, self.ttl_ms)
+            await pipe.execute()
+
+    async def add(self, user_id: int, product_id: str, quantity: int) -> int:
+        key = self._key(user_id)
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.hincrby(key, product_id, quantity)
+            pipe.pexpire(key, self.ttl_ms)
+            pipe.sadd(self._dirty_key, user_id)
+            total, *_ = await pipe.execute()
+        return int(total)
+
+    async def set(self, user_id: int, product_id: str, quantity: int) -> None:
+        key = self._key(user_id)
+        async with self.client.pipeline(transaction=True) as pipe:
+            if quantity > 0:
+                pipe.hset(key, product_id, quantity)
+            else:
+                pipe.hdel(key, product_id)
+            pipe.pexpire(key, self.ttl_ms)
+            pipe.sadd(self._dirty_key, user_id)
+            await pipe.execute()
+
+    async def clear(self, user_id: int) -> None:
+        key = self._key(user_id)
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.hset(key, _LOADED, 1)
+            pipe.pexpire(key, self.ttl_ms)
+            pipe.sadd(self._dirty_key, user_id)
+            await pipe.execute()
+
+    async def forget(self, user_id: int) -> None:
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.delete(self._key(user_id))
+            pipe.srem(self._dirty_key, user_id)
+            await pipe.execute()
+
+    async def mark_dirty(self, *user_ids: int) -> None:
+        if user_ids:
+            await self.client.sadd(self._dirty_key, *user_ids)
+
+    async def pop_dirty(self, count: int) -> list[int]:
+        return [
+            int(user_id)
+            for user_id in await self.client.spop(self._dirty_key, count)
+        ]
+
+    async def reset(self) -> None:
+        batch = []
+        async for key in self.client.scan_iter(match=f'{self.namespace}:*'):
+            batch.append(key)
+            if len(batch) >= _RESET_BATCH_SIZE:
+                await self.client.delete(*batch)
+                batch = []
+        if batch:
+            await self.client.delete(*batch)
+
+
+def build_cart_store() -> CartStore:
+    if settings.CACHE_BACKEND == 'redis':
+        return RedisCartStore(
+            get_redis_client(),
+            namespace='cart',
+            ttl=settings.CART_TTL_SECONDS,
+        )
+    if settings.WEB_CONCURRENCY > 1:
+        raise RuntimeError(
+            'Running more than one worker requires CACHE_BACKEND=redis: '
+            'in-memory carts are per process and their write-behind would '
+            'overwrite each other.'
+        )
+    return InMemoryCartStore(
+        ttl=settings.CART_TTL_SECONDS,
+        max_size=settings.CART_MAX_CARTS,
+    )
+
+
+cart_store = build_cart_store()
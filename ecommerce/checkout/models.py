@@ -0,0 +1,106 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from ecommerce.core.db.base import table_registry
+from ecommerce.core.db.types import ULID
+from ecommerce.core.utils.ids import generate_public_id
+
+ORDER_PENDING = 'pending'
+ORDER_PAID = 'paid'
+ORDER_PAYMENT_FAILED = 'payment_failed'
+ORDER_REFUNDED = 'refunded'
+
+
+@table_registry.mapped_as_dataclass
+class OrderItem:
+    __tablename__ = 'order_items'
+
+    id: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+        autoincrement=True,
+        init=False,
+    )
+    order_id: Mapped[int] = mapped_column(
+        ForeignKey('orders.id', ondelete='CASCADE'),
+        nullable=False,
+        index=True,
+        init=False,
+    )
+    product_id: Mapped[int | None] = mapped_column(
+        ForeignKey('products.id', ondelete='SET NULL'),
+        nullable=True,
+        index=True,
+    )
+    # Name, SKU and price are copied so the order survives catalog edits.
+    name: Mapped[str] = mapped_column(
+        String(255),
+        nullable=False
+    )
+    sku: Mapped[str] = mapped_column(
+        String(50),
+        nullable=False
+    )
+    unit_price: Mapped[float] = mapped_column(
+        Float,
+        nullable=False
+    )
+    quantity: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False
+    )
+
+
+@table_registry.mapped_as_dataclass
+class Order:
+    __tablename__ = 'orders'
+    __mapper_args__ = {'eager_defaults': True}
+
+    id: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+        autoincrement=True,
+        init=False,
+    )
+    # Orders outlive their user; deleting the user detaches them.
+    user_id: Mapped[int | None] = mapped_column(
+        ForeignKey('users.id', ondelete='SET NULL'),
+        nullable=True,
+        index=True,
+    )
+    total: Mapped[float] = mapped_column(
+        Float,
+        nullable=False
+    )
+    status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default=ORDER_PENDING,
+    )
+    items: Mapped[list[OrderItem]] = relationship(
+        default_factory=list,
+        cascade='all, delete-orphan',
+        lazy='selectin',
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        init=False,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+        init=False,
+    )
+    public_id: Mapped[str] = mapped_column(
+        ULID,
+        nullable=False,
+        unique=True,
+        index=True,
+        default_factory=generate_public_id,
+    )
@@ -0,0 +1,56 @@
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ecommerce.checkout.models import Order, OrderItem
+
+
+class OrderRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_by_public_id(self, public_id: str) -> Order | None:
+        return await self.session.scalar(
+            select(Order).where(Order.public_id == public_id)
+        )
+
+    async def create(self, order: Order) -> Order:
+        self.session.add(order)
+        await self.session.flush()
+        return order
+
+    async def lock_statuses(
+        self, public_ids: list[str]
+    ) -> dict[str, tuple[int, str]]:
+        """Return ``public_id -> (id, status)``, locking the rows."""
+        rows = await self.session.execute(
+            select(Order.public_id, Order.id, Order.status)
+            .where(Order.public_id.in_(public_ids))
+            .order_by(Order.id)
+            .with_for_update()
+        )
+        return {
+            public_id: (order_id, status)
+            for public_id, order_id, status in rows.tuples()
+        }
+
+    async def set_status(self, order_ids: list[int], status: str) -> None:
+        await self.session.execute(
+            update(Order)
+            .where(Order.id.in_(order_ids))
+            .values(status=status)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def get_item_quantities(
+        self, order_ids: list[int]
+    ) -> dict[int, int]:
+        """Return ``product_id -> quantity`` summed over the orders."""
+        rows = await self.session.execute(
+            select(OrderItem.product_id, func.sum(OrderItem.quantity))
+            .where(
+                OrderItem.order_id.in_(order_ids),
+                OrderItem.product_id.is_not(None),
+            )
+            .group_by(OrderItem.product_id)
+        )
+        return dict(rows.tuples().all())
@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class OrderItemRead(BaseModel):
+    name: str
+    sku: str
+    unit_price: float
+    quantity: int
+
+
+class OrderRead(BaseModel):
+    public_id: str
+    status: str
+    total: float
+    items: list[OrderItemRead]
+    created_at: datetime
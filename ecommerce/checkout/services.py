@@ -0,0 +1,55 @@
+from ecommerce.cart.services import CartService
+from ecommerce.checkout.models import Order, OrderItem
+from ecommerce.checkout.repositories import OrderRepository
+from ecommerce.core.db.unit_of_work import UnitOfWork
+from ecommerce.inventory.rebalancer import InventoryRebalancer
+from ecommerce.inventory.repositories import InventoryRepository
+from ecommerce.inventory.services import InventoryService
+
+
+class EmptyCartError(Exception): ...
+
+
+class CheckoutService:
+    def __init__(
+        self,
+        cart: CartService,
+        orders: OrderRepository,
+        inventory: InventoryRepository,
+        uow: UnitOfWork | None = None,
+        rebalancer: InventoryRebalancer | None = None,
+    ):
+        self.cart = cart
+        self.orders = orders
+        self.uow = uow or UnitOfWork(orders.session)
+        self.inventory = InventoryService(inventory, self.uow, rebalancer)
+
+    async def checkout(self, user_id: int) -> Order:
+        """Reserve stock for the whole cart and place one pending order."""
+        cart = await self.cart.get_cart(user_id)
+        if not cart.items:
+            raise EmptyCartError()
+
+        async with self.uow:
+            await self.inventory.reserve({
+                line.product.id: line.quantity for line in cart.items
+            })
+            order = await self.orders.create(
+                Order(
+                    user_id=user_id,
+                    total=cart.total,
+                    items=[
+                        OrderItem(
+                            product_id=line.product.id,
+                            name=line.name,
+                            sku=line.sku,
+                            unit_price=line.unit_price,
+                            quantity=line.quantity,
+                        )
+                        for line in cart.items
+                    ],
+                )
+            )
+
+        await self.cart.clear(user_id)
+        return order
@@ -0,0 +1,39 @@
+import asyncio
+import logging
+from contextlib import suppress
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """Runs ``tick`` every ``interval`` seconds until stopped.
+
+    Failures are logged and the next tick runs as scheduled. Subclasses
+    are started and stopped from the application lifespan.
+    """
+
+    def __init__(self, *, interval: float):
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    async def tick(self) -> None:
+        raise NotImplementedError
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.tick()
+            except Exception:
+                logger.exception('%s failed.', type(self).__name__)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
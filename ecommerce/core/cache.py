@@ -0,0 +1,141 @@
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock
+from time import monotonic
+from typing import Callable, Protocol
+
+from ecommerce.core.settings import settings
+
+_CLEAR_BATCH_SIZE = 500
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    async def delete(self, *keys: str) -> None: ...
+
+    async def clear(self) -> None: ...
+
+    async def get_counter(self, key: str) -> int: ...
+
+    async def incr(self, key: str) -> int: ...
+
+
+class InMemoryCache:
+    """Process-local TTL cache that evicts the least recently used key."""
+
+    def __init__(
+        self,
+        *,
+        max_size: int,
+        clock: Callable[[], float] = monotonic,
+    ):
+        self.max_size = max_size
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        # Counters never expire or get evicted, unlike cached values.
+        self._counters: dict[str, int] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    async def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    async def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+
+    async def get_counter(self, key: str) -> int:
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    async def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+
+class RedisCache:
+    """Cache on any server speaking the Redis protocol.
+
+    Keys are prefixed with ``namespace`` so several caches can share one
+    database and ``clear`` only removes its own keys.
+    """
+
+    def __init__(self, client, *, namespace: str):
+        self.client = client
+        self.namespace = namespace
+
+    def _key(self, key: str) -> str:
+        return f'{self.namespace}:{key}'
+
+    async def get(self, key: str) -> bytes | None:
+        return await self.client.get(self._key(key))
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self.client.set(
+            self._key(key), value, px=max(int(ttl * 1000), 1)
+        )
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*(self._key(key) for key in keys))
+
+    async def clear(self) -> None:
+        batch = []
+        async for key in self.client.scan_iter(match=f'{self.namespace}:*'):
+            batch.append(key)
+            if len(batch) >= _CLEAR_BATCH_SIZE:
+                await self.client.delete(*batch)
+                batch = []
+        if batch:
+            await self.client.delete(*batch)
+
+    async def get_counter(self, key: str) -> int:
+        return int(await self.client.get(self._key(key)) or 0)
+
+    async def incr(self, key: str) -> int:
+        return await self.client.incr(self._key(key))
+
+
+@lru_cache
+def get_redis_client(url: str | None = None):
+    try:
+        from redis.asyncio import Redis  # noqa: PLC0415
+    except ImportError as exc:
+        raise RuntimeError(
+            'CACHE_BACKEND=redis requires the "redis" extra.'
+        ) from exc
+    return Redis.from_url(url or settings.REDIS_URL)
+
+
+def build_cache(*, namespace: str, max_size: int) -> CacheBackend:
+    if settings.CACHE_BACKEND == 'redis':
+        return RedisCache(get_redis_client(), namespace=namespace)
+    return InMemoryCache(max_size=max_size)
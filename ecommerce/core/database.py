@@ -1,13 +1,209 @@
-from typing import Generator
+from itertools import count
+from time import perf_counter, time
+from typing import AsyncGenerator, Literal, Sequence
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
-from ecommerce.core.settings import settings
+from ecommerce.core.db.routing import RoutingSession, reads_from_replica
+from ecommerce.core.metrics import registry
+from ecommerce.core.settings import Settings, settings
+from ecommerce.core.timing import instrument_engine
 
-engine = create_engine(settings.DATABASE_URL)
+ASYNC_DRIVERS = {
+    'sqlite': 'aiosqlite',
+    'postgresql': 'asyncpg',
+}
 
+pool_checkout_wait = registry.histogram(
+    'db_pool_checkout_wait_seconds',
+    'Time spent waiting for a pooled database connection.',
+)
+pool_checkout_timeouts = registry.counter(
+    'db_pool_checkout_timeouts_total',
+    'Connection checkouts that gave up after DATABASE_POOL_TIMEOUT.',
+)
+replica_sessions = registry.counter(
+    'db_replica_sessions_total',
+    'Request sessions that read from a replica.',
+)
 
-def get_session() -> Generator[Session, None, None]:
-    with Session(engine) as session:
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    def _do_get(self):
+        started = perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            pool_checkout_timeouts.inc()
+            raise
+        finally:
+            pool_checkout_wait.observe(perf_counter() - started)
+
+
+def get_async_database_url(database_url: str) -> str:
+    """Swap the sync driver of ``DATABASE_URL`` for its asyncio one.
+
+    ``DATABASE_URL`` stays a plain sync URL so Alembic can keep using it.
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        return database_url
+    return url.set(
+        drivername=f'{backend}+{ASYNC_DRIVERS[backend]}'
+    ).render_as_string(hide_password=False)
+
+
+def _is_memory_database(url) -> bool:
+    return url.get_backend_name() == 'sqlite' and url.database in {
+        None,
+        '',
+        ':memory:',
+    }
+
+
+def _sqlite_pragmas(config: Settings) -> list[str]:
+    return [
+        f'PRAGMA journal_mode={config.SQLITE_JOURNAL_MODE}',
+        f'PRAGMA synchronous={config.SQLITE_SYNCHRONOUS}',
+        f'PRAGMA busy_timeout={config.SQLITE_BUSY_TIMEOUT_MS:d}',
+        f'PRAGMA mmap_size={config.SQLITE_MMAP_SIZE:d}',
+        f'PRAGMA cache_size={config.SQLITE_CACHE_SIZE:d}',
+        # Off by default in SQLite; ON DELETE actions rely on it.
+        'PRAGMA foreign_keys=ON',
+    ]
+
+
+def build_engine(
+    config: Settings, database_url: str | None = None
+) -> AsyncEngine:
+    """Engine for ``database_url``, ``DATABASE_URL`` by default."""
+    url = make_url(get_async_database_url(database_url or config.DATABASE_URL))
+    backend = url.get_backend_name()
+    options = {}
+    connect_args = {}
+
+    if not _is_memory_database(url):
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=config.DATABASE_POOL_SIZE,
+            max_overflow=config.DATABASE_MAX_OVERFLOW,
+            pool_timeout=config.DATABASE_POOL_TIMEOUT,
+            pool_recycle=config.DATABASE_POOL_RECYCLE,
+            pool_pre_ping=config.DATABASE_POOL_PRE_PING,
+        )
+
+    if backend == 'sqlite':
+        connect_args['cached_statements'] = (
+            config.DATABASE_STATEMENT_CACHE_SIZE
+        )
+    elif url.get_driver_name() == 'asyncpg':
+        url = url.update_query_dict({
+            'prepared_statement_cache_size': str(
+                config.DATABASE_STATEMENT_CACHE_SIZE
+            ),
+        })
+
+    async_engine = create_async_engine(
+        url, connect_args=connect_args, **options
+    )
+
+    if backend == 'sqlite':
+        pragmas = _sqlite_pragmas(config)
+
+        @event.listens_for(async_engine.sync_engine, 'connect')
+        def apply_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma in pragmas:
+                cursor.execute(pragma)
+            cursor.close()
+
+    instrument_engine(async_engine)
+    return async_engine
+
+
+def pool_checked_out(async_engine: AsyncEngine) -> int:
+    pool = async_engine.pool
+    if not isinstance(pool, AsyncAdaptedQueuePool):
+        return 0
+    return pool.checkedout()
+
+
+def pool_utilization(async_engine: AsyncEngine, config: Settings) -> float:
+    capacity = config.DATABASE_POOL_SIZE + max(config.DATABASE_MAX_OVERFLOW, 0)
+    return pool_checked_out(async_engine) / capacity if capacity else 0.0
+
+
+class ReplicaSet:
+    """Read replicas, picked in turn or by fewest checked-out connections.
+
+    Ties on connection count go to the next replica in turn, so idle
+    replicas still share the load.
+    """
+
+    def __init__(
+        self,
+        engines: Sequence[AsyncEngine],
+        *,
+        strategy: Literal['round_robin', 'least_connections'],
+    ):
+        self.engines = list(engines)
+        self.strategy = strategy
+        self._turn = count()
+
+    def __len__(self) -> int:
+        return len(self.engines)
+
+    def pick(self) -> AsyncEngine:
+        start = next(self._turn) % len(self.engines)
+        engines = self.engines[start:] + self.engines[:start]
+        if self.strategy == 'least_connections':
+            return min(engines, key=pool_checked_out)
+        return engines[0]
+
+
+engine = build_engine(settings)
+replicas = ReplicaSet(
+    [build_engine(settings, url) for url in settings.DATABASE_REPLICA_URLS],
+    strategy=settings.DATABASE_REPLICA_STRATEGY,
+)
+session_factory = async_sessionmaker(
+    engine, expire_on_commit=False, sync_session_class=RoutingSession
+)
+
+registry.gauge(
+    'db_pool_checked_out',
+    'Connections currently checked out of the pool.',
+    callback=lambda: pool_checked_out(engine),
+)
+registry.gauge(
+    'db_pool_utilization_ratio',
+    'Checked-out connections over pool_size + max_overflow.',
+    callback=lambda: pool_utilization(engine, settings),
+)
+
+
+async def get_session(
+    request: Request = None,
+) -> AsyncGenerator[AsyncSession, None]:
+    """Session for a request; outside one it always uses the primary."""
+    replica = None
+    if (
+        request is not None
+        and replicas
+        and reads_from_replica(request.method, request.cookies, now=time())
+    ):
+        replica = replicas.pick().sync_engine
+        replica_sessions.inc()
+    async with session_factory(replica=replica) as session:
         yield session
@@ -0,0 +1,68 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Iterable, Mapping, TypeVar
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class DataLoader(Generic[K, V]):
+    """Coalesces loads issued in the same loop iteration into one batch.
+
+    Every key asked for before the loop gets back to the scheduler is
+    fetched by a single ``batch_load`` call, which returns the values it
+    found by key. Results are kept for the loader's lifetime, so create
+    one per request. Batches run one at a time because they share the
+    request's session.
+    """
+
+    def __init__(
+        self, batch_load: Callable[[list[K]], Awaitable[Mapping[K, V]]]
+    ):
+        self._batch_load = batch_load
+        self._futures: dict[K, asyncio.Future] = {}
+        self._pending: list[K] = []
+        self._tasks: set[asyncio.Task] = set()
+        self._lock = asyncio.Lock()
+
+    async def load(self, key: K) -> V | None:
+        # Shielded: other callers wait on the same future.
+        return await asyncio.shield(self._future(key))
+
+    async def load_many(self, keys: Iterable[K]) -> list[V | None]:
+        return list(
+            await asyncio.gather(*[
+                asyncio.shield(self._future(key)) for key in keys
+            ])
+        )
+
+    def _future(self, key: K) -> asyncio.Future:
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._futures[key] = loop.create_future()
+            if not self._pending:
+                loop.call_soon(self._dispatch)
+            self._pending.append(key)
+        return future
+
+    def _dispatch(self) -> None:
+        keys, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._run(keys))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, keys: list[K]) -> None:
+        try:
+            async with self._lock:
+                found = await self._batch_load(keys)
+        except Exception as exc:
+            for key in keys:
+                # Forget the failure so a later load can retry.
+                future = self._futures.pop(key)
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for key in keys:
+            future = self._futures[key]
+            if not future.done():
+                future.set_result(found.get(key))
@@ -0,0 +1,39 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy.exc import IntegrityError
+
+
+class UniqueViolationError(Exception):
+    def __init__(self, field: str):
+        super().__init__(field)
+        self.field = field
+
+
+def unique_violation(
+    exc: IntegrityError, constraints: dict[str, tuple[str, ...]]
+) -> UniqueViolationError | None:
+    """Map a unique constraint failure to the field it guards.
+
+    ``constraints`` lists, per field, the names either backend reports:
+    ``table.column`` or an index name on SQLite, the constraint or index
+    name on Postgres.
+    """
+    message = str(exc.orig)
+    for field, names in constraints.items():
+        if any(name in message for name in names):
+            return UniqueViolationError(field)
+    return None
+
+
+@asynccontextmanager
+async def raise_unique_violations(
+    constraints: dict[str, tuple[str, ...]],
+) -> AsyncIterator[None]:
+    try:
+        yield
+    except IntegrityError as exc:
+        error = unique_violation(exc, constraints)
+        if error is None:
+            raise
+        raise error from exc
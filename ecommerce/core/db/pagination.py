@@ -0,0 +1,104 @@
+import base64
+import binascii
+import json
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Generic, Sequence, TypeVar
+
+from sqlalchemy import DateTime, String, tuple_, type_coerce
+from sqlalchemy.engine import Dialect
+from sqlalchemy.sql.elements import ColumnElement
+
+T = TypeVar('T')
+
+
+class InvalidCursorError(Exception): ...
+
+
+# Cursor numbers are bound as SQL parameters, which hold signed 64-bit
+# integers and finite doubles.
+SQL_INT_MIN = -(2**63)
+SQL_INT_MAX = 2**63 - 1
+
+
+@dataclass
+class Page(Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps(
+        [
+            value.isoformat() if isinstance(value, datetime) else value
+            for value in values
+        ],
+        separators=(',', ':'),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).rstrip(b'=').decode()
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    padding = '=' * (-len(cursor) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorError()
+
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursorError()
+    if not all(map(_is_bindable, values)):
+        raise InvalidCursorError()
+    return values
+
+
+def _is_bindable(value: Any) -> bool:
+    if isinstance(value, bool):
+        return True
+    if isinstance(value, int):
+        return SQL_INT_MIN <= value <= SQL_INT_MAX
+    if isinstance(value, float):
+        return math.isfinite(value)
+    return True
+
+
+def sort_key(column: ColumnElement, dialect: Dialect) -> ColumnElement:
+    """Expression that orders and compares exactly like ``column``.
+
+    SQLite keeps datetimes as text and ``CURRENT_TIMESTAMP`` omits the
+    microseconds that SQLAlchemy writes, so the same instant may be stored
+    in two encodings. Comparing the raw text keeps the keyset predicate
+    consistent with ``ORDER BY`` on that database.
+    """
+    if dialect.name == 'sqlite' and isinstance(column.type, DateTime):
+        return type_coerce(column, String)
+    return column
+
+
+def parse_sort_value(key: ColumnElement, value: Any) -> Any:
+    if isinstance(key.type, DateTime) and isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            raise InvalidCursorError()
+    return value
+
+
+def keyset_after(
+    key: ColumnElement,
+    tiebreaker: ColumnElement,
+    values: Sequence[Any],
+    *,
+    descending: bool = False,
+) -> ColumnElement:
+    """Rows strictly past ``values`` in ``(key, tiebreaker)`` order.
+
+    Written as a row-value comparison so SQLite walks one range of the
+    ``(key, id)`` index; the equivalent ``OR`` form can be planned as two
+    index lookups followed by a sort.
+    """
+    row = tuple_(key, tiebreaker)
+    if descending:
+        return row < tuple_(*values)
+    return row > tuple_(*values)
@@ -0,0 +1,99 @@
+"""Read replica routing with a per-client read-your-writes window.
+
+Safe requests (GET, HEAD, OPTIONS) read from a replica; everything else
+uses the primary. After a successful write, ``ReadYourWritesMiddleware``
+stamps the client with a cookie holding the end of its window, and
+until then its reads stay on the primary. The cookie keeps the window
+consistent across workers without shared state; clients that drop it
+see their writes once the replicas catch up.
+"""
+
+import math
+from http import HTTPStatus
+from time import time
+from typing import Mapping
+
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.selectable import GenerativeSelect
+
+from ecommerce.core.settings import settings
+
+SAFE_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+PRIMARY_UNTIL_COOKIE = 'db_primary_until'
+
+
+def _reads_only(clause) -> bool:
+    return (
+        isinstance(clause, GenerativeSelect) and clause._for_update_arg is None
+    )
+
+
+class RoutingSession(Session):
+    """Sends plain ``SELECT``s to ``replica``, anything else to the bind.
+
+    Flushes, DML, raw SQL and ``SELECT ... FOR UPDATE`` go to the
+    primary. Once a session has used the primary it stays there, so a
+    write is always followed by reads that see it.
+    """
+
+    def __init__(self, *, replica: Engine | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self.replica = replica
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (
+            self.replica is not None
+            and not self._flushing
+            and _reads_only(clause)
+        ):
+            return self.replica
+        self.replica = None
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+
+def reads_from_replica(
+    method: str, cookies: Mapping[str, str], *, now: float
+) -> bool:
+    if method not in SAFE_METHODS:
+        return False
+    try:
+        primary_until = float(cookies.get(PRIMARY_UNTIL_COOKIE, 0))
+    except ValueError:
+        return True
+    # A stamp further out than one window was not set by us.
+    window = settings.DATABASE_READ_YOUR_WRITES_SECONDS
+    return not now < primary_until <= now + window
+
+
+class ReadYourWritesMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        window = settings.DATABASE_READ_YOUR_WRITES_SECONDS
+        if (
+            scope['type'] != 'http'
+            or scope['method'] in SAFE_METHODS
+            or not (settings.DATABASE_REPLICA_URLS and window > 0)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_stamp(message):
+            if (
+                message['type'] == 'http.response.start'
+                and message['status'] < HTTPStatus.BAD_REQUEST
+            ):
+                cookie = (
+                    f'{PRIMARY_UNTIL_COOKIE}={time() + window:.3f}; '
+                    f'Max-Age={math.ceil(window)}; Path=/; HttpOnly; '
+                    'SameSite=Lax'
+                )
+                message['headers'] = [
+                    *message.get('headers', []),
+                    (b'set-cookie', cookie.encode()),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_stamp)
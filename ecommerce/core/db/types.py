@@ -0,0 +1,31 @@
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+from ecommerce.core.utils.ids import decode_ulid, encode_ulid
+
+# Never equal to a stored 16-byte ID.
+_NO_MATCH = b''
+
+
+class ULID(TypeDecorator):
+    """ULID strings in Python, 16 bytes in the database.
+
+    A malformed string binds as a value no row has, so looking one up
+    finds nothing instead of raising.
+    """
+
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):  # noqa: PLR6301
+        if value is None:
+            return None
+        try:
+            return decode_ulid(value)
+        except ValueError:
+            return _NO_MATCH
+
+    def process_result_value(self, value, dialect):  # noqa: PLR6301
+        if value is None:
+            return None
+        return encode_ulid(value)
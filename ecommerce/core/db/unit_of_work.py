@@ -0,0 +1,60 @@
+from typing import Iterable
+
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncSessionTransaction
+
+
+class UnitOfWork:
+    """Groups repository calls on one session into a single transaction.
+
+    Repositories only flush; the outermost ``async with uow:`` block
+    commits on success and rolls back on error. Nested blocks join the
+    open transaction, so services can call each other freely. Use
+    ``savepoint()`` to recover from a failure without losing the rest.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self._depth = 0
+
+    async def __aenter__(self) -> 'UnitOfWork':
+        self._depth += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback) -> None:
+        self._depth -= 1
+        if self._depth:
+            return
+        if exc_type is not None:
+            await self.rollback()
+            return
+        try:
+            await self.commit()
+        except Exception:
+            await self.rollback()
+            raise
+
+    async def commit(self) -> None:
+        await self.session.commit()
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
+
+    async def flush(self) -> None:
+        await self.session.flush()
+
+    def savepoint(self) -> AsyncSessionTransaction:
+        return self.session.begin_nested()
+
+    async def add_all(
+        self, objects: Iterable[object], *, batch_size: int
+    ) -> None:
+        """Add objects, flushing every ``batch_size`` to bound memory."""
+        pending = 0
+        for obj in objects:
+            self.session.add(obj)
+            pending += 1
+            if pending >= batch_size:
+                await self.session.flush()
+                pending = 0
+        if pending:
+            await self.session.flush()
@@ -0,0 +1,119 @@
+import hashlib
+from dataclasses import dataclass
+from http import HTTPStatus
+
+from fastapi import Request, Response
+
+from ecommerce.core.cache import CacheBackend
+from ecommerce.core.metrics import registry
+
+response_cache_hits = registry.counter(
+    'response_cache_hits_total',
+    'Cacheable GET requests answered from the response cache.',
+)
+response_cache_misses = registry.counter(
+    'response_cache_misses_total',
+    'Cacheable GET requests that had to be rendered.',
+)
+not_modified_responses = registry.counter(
+    'response_not_modified_total',
+    'Requests answered with 304 Not Modified.',
+)
+
+
+def make_etag(body: bytes, generation: int = 0) -> str:
+    digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+    return f'"{generation}-{digest}"'
+
+
+def etag_matches(etag: str, if_none_match: str | None) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(','))
+    return etag in (tag.removeprefix('W/') for tag in candidates)
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    etag: str
+    body: bytes
+
+    def encode(self) -> bytes:
+        return self.etag.encode() + b'\n' + self.body
+
+    @classmethod
+    def decode(cls, raw: bytes) -> 'CachedResponse':
+        etag, _, body = raw.partition(b'\n')
+        return cls(etag=etag.decode(), body=body)
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    generation: int
+    url: str
+
+    def __str__(self) -> str:
+        return f'{self.generation}:{self.url}'
+
+
+class ResponseCache:
+    """Keeps rendered JSON bodies with a strong ETag per request URL.
+
+    Keys and ETags carry a catalog generation that ``invalidate`` bumps
+    after each write; older entries are never read again and age out.
+    Taking the key before reading the data means a body rendered from a
+    read that raced a write lands under the old generation, so once
+    ``invalidate`` returns nothing rendered before the write is served.
+    Between the commit and the bump the previous body may still be
+    served. With the in-memory backend the generation is per process.
+    """
+
+    GENERATION_KEY = 'generation'
+
+    def __init__(self, backend: CacheBackend, *, ttl: float, max_age: int):
+        self.backend = backend
+        self.ttl = ttl
+        self.max_age = max_age
+
+    async def key(self, request: Request) -> CacheKey:
+        query = '&'.join(sorted(request.url.query.split('&')))
+        return CacheKey(
+            generation=await self.backend.get_counter(self.GENERATION_KEY),
+            url=f'{request.url.path}?{query}',
+        )
+
+    async def get(self, key: CacheKey) -> CachedResponse | None:
+        raw = await self.backend.get(str(key))
+        if raw is None:
+            response_cache_misses.inc()
+            return None
+        response_cache_hits.inc()
+        return CachedResponse.decode(raw)
+
+    async def set(self, key: CacheKey, body: bytes) -> CachedResponse:
+        cached = CachedResponse(
+            etag=make_etag(body, key.generation), body=body
+        )
+        await self.backend.set(str(key), cached.encode(), self.ttl)
+        return cached
+
+    async def invalidate(self) -> None:
+        await self.backend.incr(self.GENERATION_KEY)
+
+    def respond(self, request: Request, cached: CachedResponse) -> Response:
+        headers = {
+            'ETag': cached.etag,
+            'Cache-Control': f'public, max-age={self.max_age}',
+        }
+        if etag_matches(cached.etag, request.headers.get('if-none-match')):
+            not_modified_responses.inc()
+            return Response(
+                status_code=HTTPStatus.NOT_MODIFIED, headers=headers
+            )
+        return Response(
+            content=cached.body,
+            media_type='application/json',
+            headers=headers,
+        )
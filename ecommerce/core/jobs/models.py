@@ -0,0 +1,70 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ecommerce.core.db.base import table_registry
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+
+@table_registry.mapped_as_dataclass
+class Job:
+    """A unit of background work, claimed by one worker at a time.
+
+    Timestamps are always written from Python so they compare the same
+    way on every backend.
+    """
+
+    __tablename__ = 'jobs'
+    __table_args__ = (
+        Index('ix_jobs_claim', 'queue', 'status', 'run_at'),
+    )
+
+    id: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+        autoincrement=True,
+        init=False,
+    )
+    queue: Mapped[str] = mapped_column(
+        String(50),
+        nullable=False
+    )
+    payload: Mapped[dict] = mapped_column(
+        JSON,
+        nullable=False
+    )
+    run_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False
+    )
+    idempotency_key: Mapped[str | None] = mapped_column(
+        String(255),
+        nullable=True,
+        unique=True,
+        default=None,
+    )
+    status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default=JOB_QUEUED,
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+    locked_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        default=None,
+    )
+    last_error: Mapped[str | None] = mapped_column(
+        Text,
+        nullable=True,
+        default=None,
+    )
@@ -0,0 +1,132 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ecommerce.core.jobs.models import (
+    JOB_DONE,
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    Job,
+)
+
+_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+@dataclass(frozen=True)
+class ClaimedJob:
+    id: int
+    payload: dict
+    attempts: int
+
+
+class JobQueue:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def enqueue(
+        self,
+        queue: str,
+        payload: dict,
+        *,
+        now: datetime,
+        idempotency_key: str | None = None,
+    ) -> bool:
+        """Insert a job; return ``False`` if its key was already queued."""
+        insert = _INSERTS[self.session.get_bind().dialect.name]
+        result = await self.session.execute(
+            insert(Job)
+            .values(
+                queue=queue,
+                payload=payload,
+                run_at=now,
+                idempotency_key=idempotency_key,
+                status=JOB_QUEUED,
+                attempts=0,
+            )
+            .on_conflict_do_nothing(index_elements=['idempotency_key'])
+        )
+        return result.rowcount == 1
+
+    async def claim(
+        self,
+        queue: str,
+        *,
+        limit: int,
+        now: datetime,
+        visibility_timeout: timedelta,
+    ) -> list[ClaimedJob]:
+        """Mark up to ``limit`` due jobs as running and return them.
+
+        Rows locked by another worker are skipped on Postgres; SQLite
+        serialises writers so the single UPDATE is already atomic. Jobs
+        left running past ``visibility_timeout`` are claimed again.
+        """
+        due = (
+            select(Job.id)
+            .where(
+                Job.queue == queue,
+                or_(
+                    and_(Job.status == JOB_QUEUED, Job.run_at <= now),
+                    and_(
+                        Job.status == JOB_RUNNING,
+                        Job.locked_at <= now - visibility_timeout,
+                    ),
+                ),
+            )
+            .order_by(Job.run_at, Job.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        rows = await self.session.execute(
+            update(Job)
+            .where(Job.id.in_(due))
+            .values(
+                status=JOB_RUNNING,
+                locked_at=now,
+                attempts=Job.attempts + 1,
+            )
+            .returning(Job.id, Job.payload, Job.attempts)
+            .execution_options(synchronize_session=False)
+        )
+        return sorted(
+            (ClaimedJob(*row) for row in rows.tuples()),
+            key=lambda job: job.id,
+        )
+
+    async def complete(self, job_ids: list[int]) -> None:
+        await self.session.execute(
+            update(Job)
+            .where(Job.id.in_(job_ids))
+            .values(status=JOB_DONE, locked_at=None, last_error=None)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def retry(
+        self, job_id: int, *, run_at: datetime, error: str
+    ) -> None:
+        await self.session.execute(
+            update(Job)
+            .where(Job.id == job_id)
+            .values(
+                status=JOB_QUEUED,
+                run_at=run_at,
+                locked_at=None,
+                last_error=error,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    async def fail(self, job_id: int, *, error: str) -> None:
+        await self.session.execute(
+            update(Job)
+            .where(Job.id == job_id)
+            .values(status=JOB_FAILED, locked_at=None, last_error=error)
+            .execution_options(synchronize_session=False)
+        )
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from ecommerce.core.background import PeriodicTask
+from ecommerce.core.db.unit_of_work import UnitOfWork
+from ecommerce.core.jobs.queue import ClaimedJob, JobQueue
+from ecommerce.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[UnitOfWork, list[dict]], Awaitable[None]]
+
+jobs_completed = registry.counter(
+    'jobs_completed_total',
+    'Background jobs that ran successfully.',
+)
+jobs_retried = registry.counter(
+    'jobs_retried_total',
+    'Background job attempts that failed and were rescheduled.',
+)
+jobs_failed = registry.counter(
+    'jobs_failed_total',
+    'Background jobs abandoned after their last attempt.',
+)
+job_batch_seconds = registry.histogram(
+    'job_batch_seconds',
+    'Time spent running one claimed batch of jobs.',
+)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int
+    backoff: float
+    max_backoff: float
+    # Running jobs older than this are assumed lost and claimed again.
+    visibility_timeout: float
+
+    def delay(self, attempts: int) -> timedelta:
+        """Exponential backoff with jitter, capped at ``max_backoff``."""
+        ceiling = min(self.max_backoff, self.backoff * 2 ** (attempts - 1))
+        return timedelta(seconds=ceiling * random.uniform(0.5, 1.0))
+
+
+class JobWorker(PeriodicTask):
+    """Claims jobs in batches and hands each batch to its queue's handler.
+
+    Each queue has one handler, set with ``register``. A handler gets
+    the payloads of a whole batch and one unit of work, so it can apply
+    them with a few set-based statements. If the batch fails, its jobs
+    are retried one by one to isolate the bad ones.
+    ``concurrency`` loops poll every ``interval`` seconds while idle.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        *,
+        interval: float,
+        concurrency: int,
+        batch_size: int,
+        retry: RetryPolicy,
+    ):
+        super().__init__(interval=interval)
+        self.session_factory = session_factory
+        self.handlers: dict[str, JobHandler] = {}
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.retry = retry
+
+    def register(self, queue: str, handler: JobHandler) -> None:
+        self.handlers[queue] = handler
+
+    async def run(self) -> None:
+        await asyncio.gather(*(self._work() for _ in range(self.concurrency)))
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                claimed = await self.run_once()
+            except Exception:
+                logger.exception('%s failed.', type(self).__name__)
+                claimed = 0
+            if not claimed:
+                await asyncio.sleep(self.interval)
+
+    async def tick(self) -> None:
+        await self.run_once()
+
+    async def run_once(self, now: datetime | None = None) -> int:
+        """Claim and run one batch per queue; return the jobs claimed."""
+        now = now or datetime.now(UTC)
+        claimed = 0
+        for queue, handler in self.handlers.items():
+            async with self.session_factory() as session:
+                uow = UnitOfWork(session)
+                async with uow:
+                    jobs = await JobQueue(session).claim(
+                        queue,
+                        limit=self.batch_size,
+                        now=now,
+                        visibility_timeout=timedelta(
+                            seconds=self.retry.visibility_timeout
+                        ),
+                    )
+                if jobs:
+                    started = time.perf_counter()
+                    await self._process(uow, handler, jobs, now)
+                    job_batch_seconds.observe(time.perf_counter() - started)
+            claimed += len(jobs)
+        return claimed
+
+    async def _process(
+        self,
+        uow: UnitOfWork,
+        handler: JobHandler,
+        jobs: list[ClaimedJob],
+        now: datetime,
+    ) -> None:
+        try:
+            async with uow:
+                await handler(uow, [job.payload for job in jobs])
+                await JobQueue(uow.session).complete([job.id for job in jobs])
+        except Exception as exc:
+            if len(jobs) > 1:
+                for job in jobs:
+                    await self._process(uow, handler, [job], now)
+            else:
+                await self._reschedule(uow, jobs[0], exc, now)
+            return
+        jobs_completed.inc(len(jobs))
+
+    async def _reschedule(
+        self, uow: UnitOfWork, job: ClaimedJob, exc: Exception, now: datetime
+    ) -> None:
+        error = f'{type(exc).__name__}: {exc}'
+        queue = JobQueue(uow.session)
+        exhausted = job.attempts >= self.retry.max_attempts
+        async with uow:
+            if exhausted:
+                await queue.fail(job.id, error=error)
+            else:
+                await queue.retry(
+                    job.id,
+                    run_at=now + self.retry.delay(job.attempts),
+                    error=error,
+                )
+        if exhausted:
+            jobs_failed.inc()
+            logger.error('Job %s failed for good: %s', job.id, error)
+        else:
+            jobs_retried.inc()
+            logger.warning('Job %s will be retried: %s', job.id, error)
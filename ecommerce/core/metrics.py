@@ -0,0 +1,200 @@
+"""In-process metrics rendered in the Prometheus text exposition format."""
+
+import math
+from threading import Lock
+from typing import Callable
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _format(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return '+Inf'
+    return repr(value)
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self._value = 0.0
+        self._lock = Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._value = 0.0
+
+    def samples(self) -> list[tuple[str, float]]:
+        return [(self.name, self._value)]
+
+
+class Gauge:
+    kind = 'gauge'
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        callback: Callable[[], float] | None = None,
+    ):
+        self.name = name
+        self.description = description
+        self.callback = callback
+        self._value = 0.0
+        self._lock = Lock()
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    @property
+    def value(self) -> float:
+        if self.callback is not None:
+            return float(self.callback())
+        return self._value
+
+    def reset(self) -> None:
+        self.set(0.0)
+
+    def samples(self) -> list[tuple[str, float]]:
+        return [(self.name, self.value)]
+
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.description = description
+        self.buckets = (*sorted(buckets), math.inf)
+        self._counts = [0] * len(self.buckets)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._sum += value
+            self._count += 1
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self._counts[index] += 1
+                    break
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = [0] * len(self.buckets)
+            self._sum = 0.0
+            self._count = 0
+
+    def samples(self) -> list[tuple[str, float]]:
+        samples = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self._counts):
+            cumulative += count
+            samples.append(
+                (f'{self.name}_bucket{{le="{_format(bound)}"}}', cumulative)
+            )
+        samples.append((f'{self.name}_sum', self._sum))
+        samples.append((f'{self.name}_count', self._count))
+        return samples
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, Counter | Gauge | Histogram] = {}
+
+    def _register(self, metric):
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric):
+                raise ValueError(f'Metric {metric.name} already registered.')
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, description: str) -> Counter:
+        return self._register(Counter(name, description))
+
+    def gauge(
+        self,
+        name: str,
+        description: str,
+        callback: Callable[[], float] | None = None,
+    ) -> Gauge:
+        gauge = self._register(Gauge(name, description))
+        if callback is not None:
+            gauge.callback = callback
+        return gauge
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, description, buckets))
+
+    def get(self, name: str) -> Counter | Gauge | Histogram | None:
+        return self._metrics.get(name)
+
+    def reset(self) -> None:
+        for metric in self._metrics.values():
+            metric.reset()
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f'# HELP {metric.name} {metric.description}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(
+                f'{name} {_format(value)}' for name, value in metric.samples()
+            )
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,164 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from time import time
+from typing import Callable, Protocol
+
+from ecommerce.core.cache import get_redis_client
+from ecommerce.core.metrics import registry
+from ecommerce.core.settings import settings
+
+rate_limited = registry.counter(
+    'rate_limited_total',
+    'Requests rejected by a rate limit.',
+)
+
+# GCRA: the bucket is stored as its theoretical arrival time (TAT), the
+# moment it will be full again, so an update is one read and one write.
+_GCRA_SCRIPT = """
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local burst = tonumber(ARGV[3])
+local tat = math.max(tonumber(redis.call('GET', KEYS[1]) or 0), now)
+local new_tat = tat + interval
+local allow_at = new_tat - interval * burst
+if now < allow_at then
+    return tostring(allow_at - now)
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX',
+    math.ceil((new_tat - now) * 1000))
+return '0'
+"""
+
+
+class RateLimitExceededError(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__(retry_after)
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Token bucket holding ``burst`` tokens, refilled ``per_minute``."""
+
+    burst: int
+    per_minute: float
+
+    @property
+    def interval(self) -> float:
+        return 60.0 / self.per_minute
+
+
+class RateLimiterBackend(Protocol):
+    async def hit(
+        self, key: str, *, now: float, interval: float, burst: int
+    ) -> float:
+        """Take one token; return 0, or seconds until one is available."""
+        ...
+
+    async def reset(self) -> None: ...
+
+
+def _gcra(
+    tat: float, *, now: float, interval: float, burst: int
+) -> tuple[float, float]:
+    new_tat = max(tat, now) + interval
+    allow_at = new_tat - interval * burst
+    if now < allow_at:
+        return tat, allow_at - now
+    return new_tat, 0.0
+
+
+class InMemoryRateLimiter:
+    """Per-process buckets, bounded to ``max_keys``.
+
+    Past the bound the least recently used bucket is forgotten. A
+    forgotten bucket counts as full, so eviction can only let a client
+    in earlier, never lock one out.
+    """
+
+    def __init__(self, *, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, float] = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    async def hit(
+        self, key: str, *, now: float, interval: float, burst: int
+    ) -> float:
+        with self._lock:
+            tat, retry_after = _gcra(
+                self._buckets.get(key, now),
+                now=now,
+                interval=interval,
+                burst=burst,
+            )
+            self._buckets[key] = tat
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return retry_after
+
+    async def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class RedisRateLimiter:
+    """Buckets shared by every worker; one script call per hit."""
+
+    def __init__(self, client, *, namespace: str):
+        self.client = client
+        self.namespace = namespace
+        self._script = client.register_script(_GCRA_SCRIPT)
+
+    async def hit(
+        self, key: str, *, now: float, interval: float, burst: int
+    ) -> float:
+        retry_after = await self._script(
+            keys=[f'{self.namespace}:{key}'], args=[now, interval, burst]
+        )
+        return float(retry_after)
+
+    async def reset(self) -> None:
+        batch = []
+        async for key in self.client.scan_iter(match=f'{self.namespace}:*'):
+            batch.append(key)
+        if batch:
+            await self.client.delete(*batch)
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        backend: RateLimiterBackend,
+        *,
+        enabled: bool = True,
+        clock: Callable[[], float] = time,
+    ):
+        self.backend = backend
+        self.enabled = enabled
+        self._clock = clock
+
+    async def check(self, key: str, limit: RateLimit) -> None:
+        if not self.enabled:
+            return
+        retry_after = await self.backend.hit(
+            key, now=self._clock(), interval=limit.interval, burst=limit.burst
+        )
+        if retry_after > 0:
+            rate_limited.inc()
+            raise RateLimitExceededError(retry_after)
+
+    async def reset(self) -> None:
+        await self.backend.reset()
+
+
+def build_rate_limiter(*, namespace: str) -> RateLimiter:
+    if settings.CACHE_BACKEND == 'redis':
+        backend = RedisRateLimiter(get_redis_client(), namespace=namespace)
+    else:
+        backend = InMemoryRateLimiter(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+    return RateLimiter(backend, enabled=settings.RATE_LIMIT_ENABLED)
@@ -1,4 +1,11 @@
+import asyncio
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
+from threading import Lock
+from time import perf_counter, time
+from typing import Callable, TypeVar
 from zoneinfo import ZoneInfo
 
 from fastapi import HTTPException
@@ -6,13 +13,164 @@ from jwt import decode, encode
 from jwt.exceptions import InvalidTokenError
 from pwdlib import PasswordHash
 
+from ecommerce.core.metrics import registry
 from ecommerce.core.settings import settings
+from ecommerce.core.timing import timed
 
 SECRET_KEY = settings.JWT_SECRET_KEY
 ALGORITHM = settings.JWT_ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 pwd_context = PasswordHash.recommended()
 
+T = TypeVar('T')
+
+# Smoothing of the average Argon2 job time used to predict queue waits.
+JOB_SECONDS_WEIGHT = 0.2
+
+hasher_queue_depth = registry.gauge(
+    'password_hasher_queue_depth',
+    'Password hash/verify jobs waiting for a hasher thread.',
+)
+hasher_in_flight = registry.gauge(
+    'password_hasher_in_flight',
+    'Password hash/verify jobs queued or running.',
+)
+hasher_queue_wait = registry.histogram(
+    'password_hasher_queue_wait_seconds',
+    'Time a password job waited before a hasher thread picked it up.',
+)
+hasher_rejected = registry.counter(
+    'password_hasher_rejected_total',
+    'Password jobs rejected because the hasher queue was full or slow.',
+)
+
+
+token_cache_hits = registry.counter(
+    'token_cache_hits_total',
+    'Bearer tokens accepted without verifying the signature again.',
+)
+token_cache_misses = registry.counter(
+    'token_cache_misses_total',
+    'Bearer tokens that had to be decoded and verified.',
+)
+
+
+class PasswordHasherBusyError(Exception):
+    def __init__(self, retry_after: float = 1.0):
+        super().__init__(retry_after)
+        self.retry_after = retry_after
+
+
+class PasswordHasherPool:
+    """Runs Argon2 on a dedicated thread pool with a bounded queue.
+
+    argon2-cffi releases the GIL while hashing, so threads scale across
+    cores without competing with the threadpool that serves other work.
+    Jobs are shed once ``max_pending`` are queued or running, or once a
+    new job would wait longer than ``max_queue_wait`` seconds.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int,
+        max_pending: int,
+        max_queue_wait: float | None = None,
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_queue_wait = max_queue_wait
+        self._pending = 0
+        self._lock = Lock()
+        self._job_seconds = 0.0
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def expected_wait(self) -> float:
+        """Seconds a job submitted now would queue for, on average."""
+        ahead = self._pending - self.workers + 1
+        if ahead <= 0:
+            return 0.0
+        return ahead * self._job_seconds / self.workers
+
+    def _observe_job(self, seconds: float) -> None:
+        if not self._job_seconds:
+            self._job_seconds = seconds
+        else:
+            self._job_seconds += JOB_SECONDS_WEIGHT * (
+                seconds - self._job_seconds
+            )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix='password-hasher',
+            )
+        return self._executor
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+        hasher_in_flight.dec()
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        wait = self.expected_wait()
+        if self._pending >= self.max_pending or (
+            self.max_queue_wait is not None and wait > self.max_queue_wait
+        ):
+            hasher_rejected.inc()
+            raise PasswordHasherBusyError(retry_after=max(wait, 1.0))
+
+        submitted_at = perf_counter()
+
+        def job() -> T:
+            started = perf_counter()
+            hasher_queue_depth.dec()
+            hasher_queue_wait.observe(started - submitted_at)
+            try:
+                return fn(*args)
+            finally:
+                self._observe_job(perf_counter() - started)
+
+        # Runs when the job really ends, not when its awaiter gives up:
+        # a job whose client disconnected still occupies a worker.
+        def finished(future: Future) -> None:
+            if future.cancelled():
+                hasher_queue_depth.dec()
+            self._release()
+
+        with self._lock:
+            self._pending += 1
+        hasher_in_flight.inc()
+        hasher_queue_depth.inc()
+        try:
+            future = self._get_executor().submit(job)
+        except BaseException:
+            hasher_queue_depth.dec()
+            self._release()
+            raise
+        future.add_done_callback(finished)
+        return await asyncio.wrap_future(future)
+
+    async def hash(self, password: str) -> str:
+        with timed('argon2'):
+            return await self.run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        with timed('argon2'):
+            return await self.run(
+                verify_password, plain_password, hashed_password
+            )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
 
 def create_access_token(data: dict):
     to_encode = data.copy()
@@ -40,22 +198,125 @@ def verify_password(plain_password: str, hashed_password: str):
     )
 
 
+password_hasher = PasswordHasherPool(
+    workers=settings.PASSWORD_HASHER_WORKERS,
+    max_pending=settings.PASSWORD_HASHER_MAX_PENDING,
+    max_queue_wait=settings.PASSWORD_HASHER_MAX_QUEUE_WAIT_SECONDS,
+)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_hasher.hash(password)
+
+
+async def verify_password_async(
+    plain_password: str, hashed_password: str
+) -> bool:
+    return await password_hasher.verify(plain_password, hashed_password)
+
+
+class VerifiedTokenCache:
+    """Subjects of verified tokens, kept until the token's ``exp``.
+
+    Keys are SHA-256 digests so raw tokens are not held in memory.
+    Invalid tokens are never cached, and the least recently used entry
+    is evicted past ``max_size``; ``max_size=0`` disables the cache.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int,
+        clock: Callable[[], float] = time,
+    ):
+        self.max_size = max_size
+        self._clock = clock
+        self._entries: OrderedDict[bytes, tuple[float, str]] = OrderedDict()
+        self._by_subject: dict[str, set[bytes]] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> str | None:
+        if not self.max_size:
+            return None
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, subject = entry
+            if expires_at <= self._clock():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return subject
+
+    def set(self, token: str, subject: str, expires_at: float) -> None:
+        if not self.max_size or expires_at <= self._clock():
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, subject)
+            self._entries.move_to_end(key)
+            self._by_subject.setdefault(subject, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, *subjects: str) -> None:
+        """Forget the tokens of users whose credentials changed."""
+        with self._lock:
+            for subject in subjects:
+                for key in self._by_subject.pop(subject, ()):
+                    self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_subject.clear()
+
+    def _remove(self, key: bytes) -> None:
+        _, subject = self._entries.pop(key)
+        keys = self._by_subject.get(subject)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_subject[subject]
+
+
+verified_tokens = VerifiedTokenCache(max_size=settings.TOKEN_CACHE_MAX_SIZE)
+
+
 def get_token_subject(token: str) -> str:
+    subject = verified_tokens.get(token)
+    if subject is not None:
+        token_cache_hits.inc()
+        return subject
+    token_cache_misses.inc()
+
     try:
-        payload = decode(
-            jwt=token,
-            key=SECRET_KEY,
-            algorithms=[ALGORITHM],
-        )
-        subject = payload.get('sub')
-        if not subject:
-            raise HTTPException(
-                status_code=401,
-                detail='Could not validate credentials.',
+        with timed('jwt'):
+            payload = decode(
+                jwt=token,
+                key=SECRET_KEY,
+                algorithms=[ALGORITHM],
             )
-        return subject
     except InvalidTokenError:
         raise HTTPException(
             status_code=401,
             detail='Could not validate credentials.',
         )
+    subject = payload.get('sub')
+    if not subject:
+        raise HTTPException(
+            status_code=401,
+            detail='Could not validate credentials.',
+        )
+    if isinstance(payload.get('exp'), (int, float)):
+        verified_tokens.set(token, subject, payload['exp'])
+    return subject
@@ -1,11 +1,74 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     DATABASE_URL: str = 'sqlite:///database.db'
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30.0
+    DATABASE_POOL_RECYCLE: int = 1800
+    DATABASE_POOL_PRE_PING: bool = True
+    DATABASE_STATEMENT_CACHE_SIZE: int = 256
+    DATABASE_REPLICA_URLS: list[str] = []
+    DATABASE_REPLICA_STRATEGY: Literal['round_robin', 'least_connections'] = (
+        'round_robin'
+    )
+    DATABASE_READ_YOUR_WRITES_SECONDS: float = 5.0
+    SQLITE_JOURNAL_MODE: Literal['WAL', 'DELETE', 'TRUNCATE', 'MEMORY'] = (
+        'WAL'
+    )
+    SQLITE_SYNCHRONOUS: Literal['OFF', 'NORMAL', 'FULL'] = 'NORMAL'
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    # Negative values are KiB, as in PRAGMA cache_size.
+    SQLITE_CACHE_SIZE: int = -64 * 1024
     JWT_SECRET_KEY: str = 'change-me-in-env'
     JWT_ALGORITHM: str = 'HS256'
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    TOKEN_CACHE_MAX_SIZE: int = 10_000
+    PASSWORD_HASHER_WORKERS: int = 4
+    PASSWORD_HASHER_MAX_PENDING: int = 64
+    PASSWORD_HASHER_MAX_QUEUE_WAIT_SECONDS: float = 1.0
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_MAX_KEYS: int = 100_000
+    AUTH_RATE_LIMIT_IP_BURST: int = 20
+    AUTH_RATE_LIMIT_IP_PER_MINUTE: float = 60.0
+    AUTH_RATE_LIMIT_USERNAME_BURST: int = 5
+    AUTH_RATE_LIMIT_USERNAME_PER_MINUTE: float = 5.0
+    CACHE_BACKEND: Literal['memory', 'redis'] = 'memory'
+    REDIS_URL: str = 'redis://localhost:6379/0'
+    # Worker processes, read by uvicorn and gunicorn from the same variable.
+    WEB_CONCURRENCY: int = 1
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10_000
+    PRODUCT_RESPONSE_CACHE_TTL_SECONDS: float = 300.0
+    PRODUCT_RESPONSE_CACHE_MAX_SIZE: int = 1_000
+    PRODUCT_CACHE_MAX_AGE_SECONDS: int = 60
+    PRODUCT_BATCH_MAX_IDS: int = 200
+    PRODUCT_IMPORT_CHUNK_SIZE: int = 1_000
+    PRODUCT_IMPORT_MAX_ERRORS: int = 1_000
+    PRODUCT_EXPORT_BATCH_SIZE: int = 1_000
+    CART_TTL_SECONDS: float = 7 * 24 * 60 * 60
+    CART_MAX_CARTS: int = 100_000
+    CART_FLUSH_INTERVAL_SECONDS: float = 2.0
+    CART_FLUSH_BATCH_SIZE: int = 500
+    INVENTORY_MAX_SHARDS: int = 64
+    INVENTORY_REBALANCE_INTERVAL_SECONDS: float = 5.0
+    INVENTORY_REBALANCE_BATCH_SIZE: int = 500
+    JOBS_RUN_IN_APP: bool = True
+    JOBS_CONCURRENCY: int = 2
+    JOBS_BATCH_SIZE: int = 100
+    JOBS_POLL_INTERVAL_SECONDS: float = 0.5
+    JOBS_MAX_ATTEMPTS: int = 8
+    JOBS_BACKOFF_SECONDS: float = 1.0
+    JOBS_MAX_BACKOFF_SECONDS: float = 300.0
+    JOBS_VISIBILITY_TIMEOUT_SECONDS: float = 300.0
+    PAYMENT_WEBHOOK_SECRET: str = 'change-me-in-env'
+    PAYMENT_WEBHOOK_TOLERANCE_SECONDS: int = 300
+    REQUEST_TIMING: bool = False
+    REQUEST_TIMING_HEADER: bool = False
 
     model_config = {
         'env_file': '.env',
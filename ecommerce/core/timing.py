@@ -0,0 +1,232 @@
+"""Per-request phase timings, SQL accounting and ``Server-Timing``.
+
+``RequestTimingMiddleware`` opens a ``RequestTimings`` for each request
+when ``REQUEST_TIMING`` or ``REQUEST_TIMING_HEADER`` is set. Code then
+reports into it through ``timed(phase)``, and cursor hooks on every
+engine from ``build_engine`` add SQL statistics. With timing off, each
+hook is one context variable lookup.
+"""
+
+import asyncio
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Callable
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ecommerce.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+SLOW_STATEMENT_LENGTH = 200
+
+
+@dataclass
+class RequestTimings:
+    started: float = field(default_factory=perf_counter)
+    phases: dict[str, float] = field(default_factory=dict)
+    queries: int = 0
+    rows: int = 0
+    sql_seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: str | None = None
+    handler_started: float = 0.0
+    endpoint_finished: float | None = None
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def record_query(self, statement: str, seconds: float, rows: int):
+        self.queries += 1
+        self.rows += rows
+        self.sql_seconds += seconds
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+    def server_timing(self, total: float) -> str:
+        entries = [f'total;dur={total * 1000:.2f}']
+        entries.extend(
+            f'{phase};dur={seconds * 1000:.2f}'
+            for phase, seconds in self.phases.items()
+        )
+        if self.queries:
+            entries.append(
+                f'sql;dur={self.sql_seconds * 1000:.2f};'
+                f'desc="queries={self.queries} rows={self.rows}"'
+            )
+        return ', '.join(entries)
+
+    def as_dict(self, total: float) -> dict:
+        return {
+            'total_ms': round(total * 1000, 3),
+            **{
+                f'{phase}_ms': round(seconds * 1000, 3)
+                for phase, seconds in self.phases.items()
+            },
+            'sql_ms': round(self.sql_seconds * 1000, 3),
+            'queries': self.queries,
+            'rows': self.rows,
+            'slowest_sql_ms': round(self.slowest_seconds * 1000, 3),
+            'slowest_sql': (
+                self.slowest_statement or ''
+            )[:SLOW_STATEMENT_LENGTH],
+        }
+
+
+_current: ContextVar[RequestTimings | None] = ContextVar(
+    'request_timings', default=None
+)
+
+
+def current_timings() -> RequestTimings | None:
+    return _current.get()
+
+
+@contextmanager
+def timed(phase: str):
+    """Add the time spent in the block to ``phase`` of this request."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, perf_counter() - started)
+
+
+def _before_cursor_execute(conn, *args):
+    if _current.get() is not None:
+        conn.info.setdefault('query_started', []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, *args):
+    timings = _current.get()
+    if timings is None or not conn.info.get('query_started'):
+        return
+    seconds = perf_counter() - conn.info['query_started'].pop()
+    # Async adapters buffer the whole result during execute.
+    buffered = getattr(cursor, '_rows', None)
+    rows = len(buffered) if buffered is not None else max(cursor.rowcount, 0)
+    timings.record_query(statement, seconds, rows)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    sync_engine = engine.sync_engine
+    if not event.contains(
+        sync_engine, 'before_cursor_execute', _before_cursor_execute
+    ):
+        event.listen(
+            sync_engine, 'before_cursor_execute', _before_cursor_execute
+        )
+        event.listen(
+            sync_engine, 'after_cursor_execute', _after_cursor_execute
+        )
+
+
+class TimedRoute(APIRoute):
+    """Splits handler time into dependencies, endpoint and serialization.
+
+    ``serialize`` covers response model validation and JSON rendering,
+    which FastAPI does after the endpoint returns.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        call = self.dependant.call
+
+        async def timed_call(**values):
+            timings = _current.get()
+            if timings is None:
+                return await call(**values)
+            timings.add('deps', perf_counter() - timings.handler_started)
+            started = perf_counter()
+            try:
+                return await call(**values)
+            finally:
+                timings.endpoint_finished = perf_counter()
+                timings.add('endpoint', timings.endpoint_finished - started)
+
+        # Sync endpoints run in a threadpool; they are left untimed.
+        if asyncio.iscoroutinefunction(call):
+            self.dependant.call = timed_call
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            timings = _current.get()
+            if timings is None:
+                return await handler(request)
+            timings.handler_started = perf_counter()
+            timings.endpoint_finished = None
+            response = await handler(request)
+            if timings.endpoint_finished is not None:
+                timings.add(
+                    'serialize', perf_counter() - timings.endpoint_finished
+                )
+            return response
+
+        return timed_handler
+
+
+class RequestTimingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        header = settings.REQUEST_TIMING_HEADER
+        if scope['type'] != 'http' or not (settings.REQUEST_TIMING or header):
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        status = None
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                if header:
+                    value = timings.server_timing(
+                        perf_counter() - timings.started
+                    )
+                    message['headers'] = [
+                        *message.get('headers', []),
+                        (b'server-timing', value.encode()),
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            if settings.REQUEST_TIMING:
+                _log(scope, status, timings)
+
+
+def _log(scope, status: int | None, timings: RequestTimings) -> None:
+    """One logfmt line, with the same fields as ``extra`` for JSON logs."""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    fields = {
+        'method': scope['method'],
+        'path': scope['path'],
+        'status': status,
+        **timings.as_dict(perf_counter() - timings.started),
+    }
+    logger.info(
+        ' '.join(
+            f'{key}={value!r}' if isinstance(value, str) else f'{key}={value}'
+            for key, value in fields.items()
+        ),
+        extra={'request_timing': fields},
+    )
@@ -1,5 +1,116 @@
-import ulid
+"""ULID public IDs: 48-bit millisecond timestamp + 80 random bits.
+
+The 26-character Crockford form is built from a table of every
+two-character pair, 10 bits per lookup, and parsed with ``int(_, 32)``
+after mapping Crockford's alphabet onto Python's base-32 digits.
+"""
+
+import os
+import re
+import time
+from threading import Lock
+
+_CROCKFORD = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+_PAIRS = [first + second for first in _CROCKFORD for second in _CROCKFORD]
+_SHIFTS = tuple(range(120, -1, -10))
+_PREFIX_SHIFTS = tuple(range(80, -1, -10))
+_TO_DIGITS = str.maketrans(_CROCKFORD, '0123456789abcdefghijklmnopqrstuv')
+_ULID_RE = re.compile(r'[0-7][0-9A-HJKMNP-TV-Z]{25}')
+_PAIR_MASK = 0x3FF
+# A batch re-encodes only the last 8 characters (40 bits) of each ID.
+_SUFFIX_BITS = 40
+_SUFFIX_MASK = (1 << _SUFFIX_BITS) - 1
+
+ULID_LENGTH = 26
+RANDOM_BITS = 80
+_RANDOM_LIMIT = 1 << RANDOM_BITS
+
+
+def _encode(value: int) -> str:
+    return ''.join([_PAIRS[value >> shift & _PAIR_MASK] for shift in _SHIFTS])
+
+
+def encode_ulid(value: bytes) -> str:
+    """16 bytes to the 26-character Crockford string."""
+    return _encode(int.from_bytes(value))
+
+
+def decode_ulid(value: str) -> bytes:
+    """Crockford string to 16 bytes; raises ``ValueError`` if malformed."""
+    value = value.upper()
+    if not _ULID_RE.fullmatch(value):
+        raise ValueError(f'Invalid ULID: {value!r}')
+    return int(value.translate(_TO_DIGITS), 32).to_bytes(16)
+
+
+class MonotonicULIDGenerator:
+    """Mints ULIDs that sort in creation order within this process.
+
+    IDs minted in the same millisecond keep its timestamp and count up
+    from one random start, so a batch of any size costs a single
+    ``os.urandom`` call. Starts leave the top random bit clear, which
+    keeps the counter from running out in practice; if it ever would,
+    the batch moves on to the next millisecond.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._last_ms = 0
+        self._next = 0
+
+    @staticmethod
+    def _random_start() -> int:
+        return int.from_bytes(os.urandom(RANDOM_BITS // 8)) >> 1
+
+    def reserve(self, count: int) -> int:
+        """Reserve ``count`` consecutive ULIDs; return the first as int."""
+        with self._lock:
+            now = time.time_ns() // 1_000_000
+            if now > self._last_ms:
+                start = self._random_start()
+            else:
+                # Same millisecond, or the clock stepped back.
+                now = self._last_ms
+                start = self._next
+                if start + count > _RANDOM_LIMIT:
+                    now += 1
+                    start = self._random_start()
+            self._last_ms = now
+            self._next = start + count
+            return (now << RANDOM_BITS) | start
+
+    def generate(self, count: int) -> list[str]:
+        value = self.reserve(count)
+        end = value + count
+        pairs = _PAIRS
+        ids = []
+        while value < end:
+            high = value >> _SUFFIX_BITS
+            prefix = ''.join([
+                pairs[high >> shift & _PAIR_MASK] for shift in _PREFIX_SHIFTS
+            ])
+            stop = min(end, (high + 1) << _SUFFIX_BITS)
+            ids.extend([
+                prefix
+                + pairs[low >> 30]
+                + pairs[low >> 20 & _PAIR_MASK]
+                + pairs[low >> 10 & _PAIR_MASK]
+                + pairs[low & _PAIR_MASK]
+                for low in range(
+                    value & _SUFFIX_MASK, (stop - 1 & _SUFFIX_MASK) + 1
+                )
+            ])
+            value = stop
+        return ids
+
+
+_generator = MonotonicULIDGenerator()
 
 
 def generate_public_id() -> str:
-    return str(ulid.new())
+    return _encode(_generator.reserve(1))
+
+
+def generate_public_ids(count: int) -> list[str]:
+    """``count`` ascending public IDs, minted in one call."""
+    return _generator.generate(count)
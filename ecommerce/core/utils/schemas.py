@@ -1,5 +1,100 @@
-from pydantic import BaseModel
+from functools import lru_cache
+from typing import Any, Generic, TypeVar
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter, create_model
+from pydantic_core import to_json
+
+from ecommerce.core.timing import timed
+
+T = TypeVar('T')
 
 
 class Message(BaseModel):
     message: str
+
+
+class PageRead(BaseModel, Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
+
+
+class UnknownFieldsError(Exception):
+    def __init__(self, fields: list[str]):
+        super().__init__(fields)
+        self.fields = fields
+
+
+def parse_fields(
+    schema: type[BaseModel], fields: str | None
+) -> tuple[str, ...] | None:
+    """Comma-separated ``fields`` as a tuple in ``schema`` order.
+
+    ``None`` means every field, as does a list naming none. Raises
+    ``UnknownFieldsError`` for names ``schema`` does not have.
+    """
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(',')} - {''}
+    unknown = sorted(requested - schema.model_fields.keys())
+    if unknown:
+        raise UnknownFieldsError(unknown)
+    return (
+        tuple(name for name in schema.model_fields if name in requested)
+        or None
+    )
+
+
+@lru_cache(maxsize=None)
+def partial_schema(
+    schema: type[BaseModel], fields: tuple[str, ...] | None
+) -> type[BaseModel]:
+    """``schema`` reduced to ``fields``; the whole schema for ``None``."""
+    if fields is None:
+        return schema
+    return create_model(
+        f'{schema.__name__}Fields',
+        **{
+            name: (schema.model_fields[name].annotation, ...)
+            for name in fields
+        },
+    )
+
+
+@lru_cache(maxsize=None)
+def get_adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def dump_json(schema: Any, obj: Any) -> bytes:
+    """Validate ``obj`` against ``schema`` once and render JSON bytes.
+
+    ``schema`` may be a model or any type such as ``list[ProductRead]``;
+    ORM objects are read through their attributes.
+    """
+    with timed('serialize'):
+        adapter = get_adapter(schema)
+        return adapter.dump_json(
+            adapter.validate_python(obj, from_attributes=True)
+        )
+
+
+class FastJSONResponse(JSONResponse):
+    """Renders with pydantic-core and passes pre-rendered bytes through."""
+
+    def render(self, content: Any) -> bytes:  # noqa: PLR6301
+        if isinstance(content, bytes):
+            return content
+        return to_json(content)
+
+
+def json_response(
+    schema: Any, obj: Any, *, status_code: int = 200
+) -> FastJSONResponse:
+    """Response for routes returning ORM objects.
+
+    FastAPI would validate the object against ``response_model``, turn
+    it into plain Python and encode that again; this does it in one
+    pass. Keep ``response_model`` on the route for the OpenAPI schema.
+    """
+    return FastJSONResponse(dump_json(schema, obj), status_code=status_code)
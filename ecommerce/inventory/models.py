@@ -0,0 +1,31 @@
+from sqlalchemy import CheckConstraint, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ecommerce.core.db.base import table_registry
+
+
+@table_registry.mapped_as_dataclass
+class InventoryShard:
+    """One slice of a product's stock.
+
+    Hot products keep their stock spread over several rows so concurrent
+    reservations lock different rows instead of queueing on one.
+    """
+
+    __tablename__ = 'inventory_shards'
+    __table_args__ = (
+        CheckConstraint('stock >= 0', name='ck_inventory_shards_stock'),
+    )
+
+    product_id: Mapped[int] = mapped_column(
+        ForeignKey('products.id', ondelete='CASCADE'),
+        primary_key=True,
+    )
+    shard: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True
+    )
+    stock: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False
+    )
@@ -0,0 +1,60 @@
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from ecommerce.core.background import PeriodicTask
+from ecommerce.core.database import session_factory
+from ecommerce.core.db.unit_of_work import UnitOfWork
+from ecommerce.core.metrics import registry
+from ecommerce.core.settings import settings
+from ecommerce.inventory.repositories import InventoryRepository
+
+shards_rebalanced = registry.counter(
+    'inventory_shards_rebalanced_total',
+    'Inventory shard rows rewritten by the rebalancer.',
+)
+
+
+class InventoryRebalancer(PeriodicTask):
+    """Evens out sharded stock so reservations keep hitting the fast path.
+
+    Only products reserved in this process since the last tick are
+    looked at, so each worker rebalances what it touched instead of
+    scanning the whole inventory.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        *,
+        interval: float,
+        batch_size: int,
+    ):
+        super().__init__(interval=interval)
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self._touched: set[int] = set()
+
+    def touch(self, *product_ids: int) -> None:
+        self._touched.update(product_ids)
+
+    async def tick(self) -> None:
+        product_ids = sorted(self._touched)
+        self._touched.clear()
+        for start in range(0, len(product_ids), self.batch_size):
+            batch = product_ids[start : start + self.batch_size]
+            try:
+                async with self.session_factory() as session:
+                    async with UnitOfWork(session):
+                        rows = await InventoryRepository(session).rebalance(
+                            batch
+                        )
+            except Exception:
+                self.touch(*product_ids[start:])
+                raise
+            shards_rebalanced.inc(rows)
+
+
+inventory_rebalancer = InventoryRebalancer(
+    session_factory,
+    interval=settings.INVENTORY_REBALANCE_INTERVAL_SECONDS,
+    batch_size=settings.INVENTORY_REBALANCE_BATCH_SIZE,
+)
@@ -0,0 +1,171 @@
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ecommerce.inventory.models import InventoryShard
+
+
+class InventoryRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_stock(self, product_id: int) -> tuple[int, int]:
+        """Return ``(stock, shards)`` for a product."""
+        row = (
+            await self.session.execute(
+                select(
+                    func.coalesce(func.sum(InventoryShard.stock), 0),
+                    func.count(),
+                ).where(InventoryShard.product_id == product_id)
+            )
+        ).one()
+        return row[0], row[1]
+
+    async def set_stock(
+        self, product_id: int, stock: int, *, shards: int
+    ) -> None:
+        await self.session.execute(
+            delete(InventoryShard).where(
+                InventoryShard.product_id == product_id
+            )
+        )
+        base, extra = divmod(stock, shards)
+        await self.session.execute(
+            insert(InventoryShard),
+            [
+                {
+                    'product_id': product_id,
+                    'shard': shard,
+                    'stock': base + (1 if shard < extra else 0),
+                }
+                for shard in range(shards)
+            ],
+        )
+
+    async def take(self, product_id: int, quantity: int) -> bool:
+        """Decrement one shard holding at least ``quantity``, atomically.
+
+        The shard is picked at random among those with enough stock, and
+        skipped if another transaction holds it on Postgres.
+        """
+        shard = (
+            select(InventoryShard.shard)
+            .where(
+                InventoryShard.product_id == product_id,
+                InventoryShard.stock >= quantity,
+            )
+            .order_by(func.random())
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await self.session.execute(
+            update(InventoryShard)
+            .where(
+                InventoryShard.product_id == product_id,
+                InventoryShard.shard == shard,
+                InventoryShard.stock >= quantity,
+            )
+            .values(stock=InventoryShard.stock - quantity)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    async def take_across(self, product_id: int, quantity: int) -> bool:
+        """Take ``quantity`` from as many shards as needed.
+
+        Slow path for when no single shard holds enough. Shard rows are
+        locked first, and every decrement stays conditional. A ``False``
+        result leaves partial decrements that the caller must roll back.
+        """
+        shards = await self.session.execute(
+            select(InventoryShard.shard, InventoryShard.stock)
+            .where(
+                InventoryShard.product_id == product_id,
+                InventoryShard.stock > 0,
+            )
+            .order_by(InventoryShard.shard)
+            .with_for_update()
+        )
+        remaining = quantity
+        for shard, stock in shards.tuples().all():
+            taken = min(stock, remaining)
+            result = await self.session.execute(
+                update(InventoryShard)
+                .where(
+                    InventoryShard.product_id == product_id,
+                    InventoryShard.shard == shard,
+                    InventoryShard.stock >= taken,
+                )
+                .values(stock=InventoryShard.stock - taken)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 1:
+                remaining -= taken
+            if not remaining:
+                return True
+        return False
+
+    async def give_back(self, product_id: int, quantity: int) -> None:
+        shard = (
+            select(InventoryShard.shard)
+            .where(InventoryShard.product_id == product_id)
+            .order_by(func.random())
+            .limit(1)
+            .scalar_subquery()
+        )
+        await self.session.execute(
+            update(InventoryShard)
+            .where(
+                InventoryShard.product_id == product_id,
+                InventoryShard.shard == shard,
+            )
+            .values(stock=InventoryShard.stock + quantity)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def rebalance(self, product_ids: list[int] | None = None) -> int:
+        """Spread each product's stock evenly over its shards.
+
+        Only products whose shards differ by more than one unit are
+        touched. Their rows are locked first on Postgres so the totals
+        cannot go stale before the update; SQLite serialises writers.
+        """
+        skewed = (
+            select(InventoryShard.product_id)
+            .group_by(InventoryShard.product_id)
+            .having(
+                func.max(InventoryShard.stock)
+                - func.min(InventoryShard.stock)
+                > 1
+            )
+        )
+        if product_ids is not None:
+            skewed = skewed.where(InventoryShard.product_id.in_(product_ids))
+
+        await self.session.execute(
+            select(InventoryShard.product_id)
+            .where(InventoryShard.product_id.in_(skewed))
+            .order_by(InventoryShard.product_id, InventoryShard.shard)
+            .with_for_update()
+        )
+        totals = (
+            select(
+                InventoryShard.product_id,
+                func.sum(InventoryShard.stock).label('total'),
+                func.count().label('shards'),
+            )
+            .where(InventoryShard.product_id.in_(skewed))
+            .group_by(InventoryShard.product_id)
+            .subquery()
+        )
+        remainder = totals.c.total % totals.c.shards
+        result = await self.session.execute(
+            update(InventoryShard)
+            .where(InventoryShard.product_id == totals.c.product_id)
+            .values(
+                stock=totals.c.total // totals.c.shards
+                + case((InventoryShard.shard < remainder, 1), else_=0)
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
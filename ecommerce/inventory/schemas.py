@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+
+from ecommerce.core.settings import settings
+
+
+class StockUpdate(BaseModel):
+    stock: int = Field(ge=0)
+    shards: int = Field(default=1, ge=1, le=settings.INVENTORY_MAX_SHARDS)
+
+
+class StockRead(BaseModel):
+    product_id: str
+    stock: int
+    shards: int
@@ -0,0 +1,68 @@
+from ecommerce.core.db.unit_of_work import UnitOfWork
+from ecommerce.core.metrics import registry
+from ecommerce.inventory.rebalancer import InventoryRebalancer
+from ecommerce.inventory.repositories import InventoryRepository
+
+reservations = registry.counter(
+    'inventory_reservations_total',
+    'Orders whose stock was reserved.',
+)
+reservation_failures = registry.counter(
+    'inventory_reservation_failures_total',
+    'Reservations rejected for insufficient stock.',
+)
+reservation_slow_paths = registry.counter(
+    'inventory_reservation_slow_path_total',
+    'Order lines that had to take stock from several shards.',
+)
+
+
+class InsufficientStockError(Exception):
+    def __init__(self, product_id: int):
+        super().__init__(product_id)
+        self.product_id = product_id
+
+
+class InventoryService:
+    def __init__(
+        self,
+        repo: InventoryRepository,
+        uow: UnitOfWork | None = None,
+        rebalancer: InventoryRebalancer | None = None,
+    ):
+        self.repo = repo
+        self.uow = uow or UnitOfWork(repo.session)
+        self.rebalancer = rebalancer
+
+    async def get_stock(self, product_id: int) -> tuple[int, int]:
+        return await self.repo.get_stock(product_id)
+
+    async def set_stock(
+        self, product_id: int, stock: int, *, shards: int
+    ) -> tuple[int, int]:
+        async with self.uow:
+            await self.repo.set_stock(product_id, stock, shards=shards)
+        return stock, shards
+
+    async def reserve(self, lines: dict[int, int]) -> None:
+        """Reserve every line or none: ``product_id -> quantity``.
+
+        Lines are taken in product order so concurrent multi-line
+        reservations always lock rows in the same order.
+        """
+        if self.rebalancer:
+            self.rebalancer.touch(*lines)
+        async with self.uow:
+            for product_id, quantity in sorted(lines.items()):
+                if await self.repo.take(product_id, quantity):
+                    continue
+                reservation_slow_paths.inc()
+                if not await self.repo.take_across(product_id, quantity):
+                    reservation_failures.inc()
+                    raise InsufficientStockError(product_id)
+        reservations.inc()
+
+    async def release(self, lines: dict[int, int]) -> None:
+        async with self.uow:
+            for product_id, quantity in sorted(lines.items()):
+                await self.repo.give_back(product_id, quantity)
@@ -0,0 +1,42 @@
+"""Job worker for every queue; run standalone with ``python -m``."""
+
+import argparse
+import asyncio
+import logging
+
+from ecommerce.core.database import session_factory
+from ecommerce.core.jobs.worker import JobWorker, RetryPolicy
+from ecommerce.core.settings import settings
+from ecommerce.payments.services import (
+    PAYMENT_EVENTS_QUEUE,
+    apply_payment_events,
+)
+
+job_worker = JobWorker(
+    session_factory,
+    interval=settings.JOBS_POLL_INTERVAL_SECONDS,
+    concurrency=settings.JOBS_CONCURRENCY,
+    batch_size=settings.JOBS_BATCH_SIZE,
+    retry=RetryPolicy(
+        max_attempts=settings.JOBS_MAX_ATTEMPTS,
+        backoff=settings.JOBS_BACKOFF_SECONDS,
+        max_backoff=settings.JOBS_MAX_BACKOFF_SECONDS,
+        visibility_timeout=settings.JOBS_VISIBILITY_TIMEOUT_SECONDS,
+    ),
+)
+job_worker.register(PAYMENT_EVENTS_QUEUE, apply_payment_events)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--concurrency', type=int, default=settings.JOBS_CONCURRENCY
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    job_worker.concurrency = args.concurrency
+    asyncio.run(job_worker.run())
+
+
+if __name__ == '__main__':
+    main()
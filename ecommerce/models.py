@@ -1,5 +1,10 @@
+from ecommerce.cart import models as _cart_models  # noqa: F401
+from ecommerce.checkout import models as _checkout_models  # noqa: F401
 from ecommerce.core.db.base import table_registry
+from ecommerce.core.jobs import models as _job_models  # noqa: F401
+from ecommerce.inventory import models as _inventory_models  # noqa: F401
 from ecommerce.products import models as _product_models  # noqa: F401
+from ecommerce.products import search as _product_search  # noqa: F401
 from ecommerce.users import models as _user_models  # noqa: F401
 
 __all__ = ['table_registry']
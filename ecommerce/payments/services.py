@@ -0,0 +1,102 @@
+from collections import defaultdict
+from datetime import UTC, datetime
+
+from ecommerce.checkout.models import (
+    ORDER_PAID,
+    ORDER_PAYMENT_FAILED,
+    ORDER_PENDING,
+    ORDER_REFUNDED,
+)
+from ecommerce.checkout.repositories import OrderRepository
+from ecommerce.core.db.unit_of_work import UnitOfWork
+from ecommerce.core.jobs.queue import JobQueue
+from ecommerce.inventory.repositories import InventoryRepository
+from ecommerce.inventory.services import InventoryService
+from ecommerce.payments.webhooks import PaymentEvent
+
+PAYMENT_EVENTS_QUEUE = 'payments.events'
+
+# Event type -> (new order status, statuses it may replace).
+PAYMENT_TRANSITIONS = {
+    'payment_intent.succeeded': (ORDER_PAID, {ORDER_PENDING}),
+    'payment_intent.payment_failed': (ORDER_PAYMENT_FAILED, {ORDER_PENDING}),
+    'charge.refunded': (ORDER_REFUNDED, {ORDER_PAID}),
+}
+
+
+class PaymentWebhookService:
+    def __init__(self, jobs: JobQueue, uow: UnitOfWork | None = None):
+        self.jobs = jobs
+        self.uow = uow or UnitOfWork(jobs.session)
+
+    async def receive(self, event: PaymentEvent) -> bool:
+        """Queue an event once; return ``False`` for ignored or repeats.
+
+        The event id is the idempotency key, so provider redeliveries
+        are acknowledged without being applied twice.
+        """
+        if event.type not in PAYMENT_TRANSITIONS or event.order_id is None:
+            return False
+        async with self.uow:
+            return await self.jobs.enqueue(
+                PAYMENT_EVENTS_QUEUE,
+                event.to_payload(),
+                now=datetime.now(UTC),
+                idempotency_key=f'payment:{event.id}',
+            )
+
+
+class PaymentEventService:
+    def __init__(
+        self,
+        orders: OrderRepository,
+        inventory: InventoryRepository,
+        uow: UnitOfWork | None = None,
+    ):
+        self.orders = orders
+        self.uow = uow or UnitOfWork(orders.session)
+        self.inventory = InventoryService(inventory, self.uow)
+
+    async def apply(self, events: list[dict]) -> None:
+        """Apply a batch of payment events to their orders.
+
+        Events are replayed in creation order against the locked current
+        statuses, so the batch costs one status update per final status
+        whatever its size. Stock of orders whose payment failed is
+        released.
+        """
+        async with self.uow:
+            current = await self.orders.lock_statuses(
+                sorted({event['order_id'] for event in events})
+            )
+            statuses = {
+                public_id: status
+                for public_id, (_, status) in current.items()
+            }
+            for event in sorted(
+                events, key=lambda event: (event['created'], event['id'])
+            ):
+                if event['order_id'] not in statuses:
+                    continue
+                status, sources = PAYMENT_TRANSITIONS[event['type']]
+                if statuses[event['order_id']] in sources:
+                    statuses[event['order_id']] = status
+
+            changed = defaultdict(list)
+            for public_id, status in statuses.items():
+                order_id, previous = current[public_id]
+                if status != previous:
+                    changed[status].append(order_id)
+            for status, order_ids in changed.items():
+                await self.orders.set_status(order_ids, status)
+            if failed := changed.get(ORDER_PAYMENT_FAILED):
+                await self.inventory.release(
+                    await self.orders.get_item_quantities(failed)
+                )
+
+
+async def apply_payment_events(uow: UnitOfWork, payloads: list[dict]) -> None:
+    service = PaymentEventService(
+        OrderRepository(uow.session), InventoryRepository(uow.session), uow
+    )
+    await service.apply(payloads)
@@ -0,0 +1,74 @@
+import hashlib
+import hmac
+import json
+from dataclasses import asdict, dataclass
+
+
+class InvalidSignatureError(Exception): ...
+
+
+class InvalidEventError(Exception): ...
+
+
+@dataclass(frozen=True)
+class PaymentEvent:
+    id: str
+    type: str
+    created: int
+    order_id: str | None
+
+    def to_payload(self) -> dict:
+        return asdict(self)
+
+
+def sign(payload: bytes, *, secret: str, timestamp: int) -> str:
+    """Build a ``Stripe-Signature`` header value for ``payload``."""
+    digest = hmac.new(
+        secret.encode(),
+        f'{timestamp}.'.encode() + payload,
+        hashlib.sha256,
+    ).hexdigest()
+    return f't={timestamp},v1={digest}'
+
+
+def verify_signature(
+    payload: bytes,
+    header: str | None,
+    *,
+    secret: str,
+    tolerance: int,
+    now: float,
+) -> None:
+    """Check a Stripe-style ``t=<timestamp>,v1=<hmac>`` signature."""
+    parts = [part.partition('=') for part in (header or '').split(',')]
+    signatures = [value for key, _, value in parts if key.strip() == 'v1']
+    timestamps = [value for key, _, value in parts if key.strip() == 't']
+    try:
+        timestamp = int(timestamps[0])
+    except (IndexError, ValueError):
+        raise InvalidSignatureError()
+    if abs(now - timestamp) > tolerance:
+        raise InvalidSignatureError()
+
+    expected = sign(payload, secret=secret, timestamp=timestamp)
+    expected = expected.rpartition('=')[2]
+    if not any(
+        hmac.compare_digest(expected, signature) for signature in signatures
+    ):
+        raise InvalidSignatureError()
+
+
+def parse_event(payload: bytes) -> PaymentEvent:
+    """Keep only what the workers need from a provider event."""
+    try:
+        event = json.loads(payload)
+        metadata = event['data']['object'].get('metadata') or {}
+        order_id = metadata.get('order_id')
+        return PaymentEvent(
+            id=str(event['id']),
+            type=str(event['type']),
+            created=int(event['created']),
+            order_id=str(order_id) if order_id is not None else None,
+        )
+    except (AttributeError, KeyError, TypeError, ValueError):
+        raise InvalidEventError()
@@ -0,0 +1,23 @@
+from ecommerce.core.cache import build_cache
+from ecommerce.core.http_cache import ResponseCache
+from ecommerce.core.settings import settings
+
+
+def build_product_response_cache() -> ResponseCache:
+    if settings.CACHE_BACKEND != 'redis' and settings.WEB_CONCURRENCY > 1:
+        raise RuntimeError(
+            'Running more than one worker requires CACHE_BACKEND=redis: '
+            'in-memory product responses are per process and a write in '
+            'one worker would leave the others serving stale bodies.'
+        )
+    return ResponseCache(
+        build_cache(
+            namespace='products',
+            max_size=settings.PRODUCT_RESPONSE_CACHE_MAX_SIZE,
+        ),
+        ttl=settings.PRODUCT_RESPONSE_CACHE_TTL_SECONDS,
+        max_age=settings.PRODUCT_CACHE_MAX_AGE_SECONDS,
+    )
+
+
+product_response_cache = build_product_response_cache()
@@ -0,0 +1,62 @@
+import csv
+import io
+from typing import AsyncIterable, AsyncIterator, Sequence
+
+from sqlalchemy import RowMapping
+
+from ecommerce.products.schemas import ProductRead
+
+EXPORT_MEDIA_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json',
+    'csv': 'text/csv',
+}
+EXPORT_FIELDS = tuple(ProductRead.model_fields)
+
+
+def _json_lines(batch: Sequence[RowMapping]) -> list[bytes]:
+    return [
+        ProductRead.model_validate(row).model_dump_json().encode()
+        for row in batch
+    ]
+
+
+async def render_ndjson(
+    batches: AsyncIterable[Sequence[RowMapping]],
+) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        yield b'\n'.join(_json_lines(batch)) + b'\n'
+
+
+async def render_json(
+    batches: AsyncIterable[Sequence[RowMapping]],
+) -> AsyncIterator[bytes]:
+    separator = b'['
+    async for batch in batches:
+        yield separator + b','.join(_json_lines(batch))
+        separator = b','
+    yield b'[]' if separator == b'[' else b']'
+
+
+async def render_csv(
+    batches: AsyncIterable[Sequence[RowMapping]],
+) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(EXPORT_FIELDS)
+    async for batch in batches:
+        for row in batch:
+            data = ProductRead.model_validate(row).model_dump(mode='json')
+            writer.writerow(data[field] for field in EXPORT_FIELDS)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+RENDERERS = {
+    'ndjson': render_ndjson,
+    'json': render_json,
+    'csv': render_csv,
+}
@@ -0,0 +1,136 @@
+import codecs
+import csv
+import json
+from dataclasses import dataclass, field
+from typing import AsyncIterable, AsyncIterator
+
+from pydantic import ValidationError
+
+from ecommerce.products.schemas import ProductCreate
+
+NDJSON_MEDIA_TYPES = {'application/x-ndjson', 'application/jsonl'}
+CSV_MEDIA_TYPES = {'text/csv'}
+
+
+class UnsupportedImportFormatError(Exception): ...
+
+
+@dataclass
+class ImportRowError:
+    line: int
+    detail: str
+    sku: str | None = None
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    failed: int = 0
+    errors: list[ImportRowError] = field(default_factory=list)
+
+    def record(self, error: ImportRowError, *, max_errors: int) -> None:
+        self.failed += 1
+        if len(self.errors) < max_errors:
+            self.errors.append(error)
+
+
+@dataclass
+class ImportRow:
+    line: int
+    product: ProductCreate | None = None
+    error: ImportRowError | None = None
+
+
+async def iter_lines(
+    chunks: AsyncIterable[bytes],
+) -> AsyncIterator[tuple[int, str]]:
+    """Split a byte stream into numbered text lines, one chunk at a time."""
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    buffer = ''
+    number = 0
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split('\n')
+        for line in lines:
+            number += 1
+            yield number, line.removesuffix('\r')
+
+    buffer += decoder.decode(b'', final=True)
+    if buffer:
+        yield number + 1, buffer.removesuffix('\r')
+
+
+def _validate(line: int, data: object) -> ImportRow:
+    if not isinstance(data, dict):
+        return ImportRow(
+            line=line,
+            error=ImportRowError(line=line, detail='Expected an object.'),
+        )
+    try:
+        return ImportRow(line=line, product=ProductCreate.model_validate(data))
+    except ValidationError as exc:
+        error = exc.errors()[0]
+        location = '.'.join(str(part) for part in error['loc'])
+        sku = data.get('sku')
+        return ImportRow(
+            line=line,
+            error=ImportRowError(
+                line=line,
+                detail=f'{location}: {error["msg"]}',
+                sku=sku if isinstance(sku, str) else None,
+            ),
+        )
+
+
+async def parse_ndjson(
+    chunks: AsyncIterable[bytes],
+) -> AsyncIterator[ImportRow]:
+    async for line, text in iter_lines(chunks):
+        if not text.strip():
+            continue
+        try:
+            data = json.loads(text)
+        except ValueError:
+            yield ImportRow(
+                line=line,
+                error=ImportRowError(line=line, detail='Invalid JSON.'),
+            )
+            continue
+        yield _validate(line, data)
+
+
+async def parse_csv(chunks: AsyncIterable[bytes]) -> AsyncIterator[ImportRow]:
+    """Parse CSV with a header row; quoted fields may not span lines."""
+    header = None
+    async for line, text in iter_lines(chunks):
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield ImportRow(
+                line=line,
+                error=ImportRowError(
+                    line=line,
+                    detail=f'Expected {len(header)} columns.',
+                ),
+            )
+            continue
+        yield _validate(
+            line,
+            {
+                name: value or None
+                for name, value in zip(header, values)
+            },
+        )
+
+
+def get_parser(media_type: str | None):
+    media_type = (media_type or '').split(';')[0].strip().lower()
+    if media_type in NDJSON_MEDIA_TYPES:
+        return parse_ndjson
+    if media_type in CSV_MEDIA_TYPES:
+        return parse_csv
+    raise UnsupportedImportFormatError()
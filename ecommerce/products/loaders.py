@@ -0,0 +1,17 @@
+from ecommerce.core.dataloader import DataLoader
+from ecommerce.products.models import Product
+from ecommerce.products.repositories import ProductRepository
+
+
+class ProductLoader(DataLoader[str, Product]):
+    """Batches product lookups by public ID within one request."""
+
+    def __init__(self, repo: ProductRepository):
+        super().__init__(self._load)
+        self.repo = repo
+
+    async def _load(self, public_ids: list[str]) -> dict[str, Product]:
+        return {
+            product.public_id: product
+            for product in await self.repo.get_many_by_public_ids(public_ids)
+        }
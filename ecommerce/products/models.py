@@ -1,15 +1,24 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, Integer, String, func
+from sqlalchemy import DateTime, Index, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ecommerce.core.db.base import table_registry
+from ecommerce.core.db.types import ULID
 from ecommerce.core.utils.ids import generate_public_id
 
 
 @table_registry.mapped_as_dataclass
 class Product:
     __tablename__ = 'products'
+    # Fetch created_at/updated_at with INSERT/UPDATE ... RETURNING.
+    __mapper_args__ = {'eager_defaults': True}
+    # Keyset pages order by (sort column, id) in either direction.
+    __table_args__ = (
+        Index('ix_products_price_id', 'price', 'id'),
+        Index('ix_products_created_at_id', 'created_at', 'id'),
+        Index('ix_products_name_id', 'name', 'id'),
+    )
 
     id: Mapped[int] = mapped_column(
         Integer,
@@ -47,7 +56,9 @@ class Product:
         init=False,
     )
     public_id: Mapped[str] = mapped_column(
-        String(26),
+        ULID,
         nullable=False,
+        unique=True,
+        index=True,
         default_factory=generate_public_id,
     )
@@ -1,49 +1,284 @@
-from sqlalchemy import func, or_, select
-from sqlalchemy.orm import Session
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Iterable, Sequence
 
+from sqlalchemy import (
+    DateTime,
+    Row,
+    RowMapping,
+    Select,
+    String,
+    select,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Dialect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from ecommerce.core.db.errors import raise_unique_violations
+from ecommerce.core.db.pagination import (
+    InvalidCursorError,
+    Page,
+    decode_cursor,
+    encode_cursor,
+    keyset_after,
+    parse_sort_value,
+    sort_key,
+)
+from ecommerce.products import search
 from ecommerce.products.models import Product
+from ecommerce.products.schemas import ProductSort
+
+UNIQUE_CONSTRAINTS = {'sku': ('products.sku', 'products_sku_key')}
+IN_CHUNK_SIZE = 500
+
+SORT_COLUMNS = {
+    'price': Product.price,
+    'created_at': Product.created_at,
+    'name': Product.name,
+}
+
+
+@dataclass(frozen=True)
+class ProductFilter:
+    query: str | None = None
+    min_price: float | None = None
+    max_price: float | None = None
+
+
+def _entities(fields: Sequence[str] | None) -> list:
+    """What to select: ``Product`` itself, or ``id`` and just ``fields``.
+
+    Plain column rows skip building ORM objects, which is most of the
+    cost of a page once the columns are few.
+    """
+    if fields is None:
+        return [Product]
+    return [Product.id, *[getattr(Product, field) for field in fields]]
+
+
+def _filtered(
+    stmt: Select,
+    filters: ProductFilter,
+    tokens: list[str] | None,
+    dialect: Dialect,
+) -> Select:
+    if tokens:
+        stmt = stmt.where(search.match_condition(tokens, dialect))
+        if dialect.name != 'postgresql':
+            stmt = stmt.join(
+                search.fts_table,
+                search.fts_table.c.rowid == Product.id,
+            )
+    if filters.min_price is not None:
+        stmt = stmt.where(Product.price >= filters.min_price)
+    if filters.max_price is not None:
+        stmt = stmt.where(Product.price <= filters.max_price)
+    return stmt
+
+
+def _order(
+    sort: ProductSort | None, tokens: list[str] | None, dialect: Dialect
+) -> tuple[ColumnElement | None, bool]:
+    """Sort key ahead of ``id`` (``None`` for ``id`` alone), descending."""
+    if sort:
+        column = SORT_COLUMNS[sort.removeprefix('-')]
+        return sort_key(column, dialect), sort.startswith('-')
+    if tokens:
+        return search.rank_bucket(tokens, dialect), True
+    return None, False
+
+
+def _after(
+    cursor: str, key: ColumnElement | None, *, descending: bool
+) -> ColumnElement[bool]:
+    if key is None:
+        (last_id,) = decode_cursor(cursor, size=1)
+        if not isinstance(last_id, int):
+            raise InvalidCursorError()
+        return Product.id > last_id
+
+    value, last_id = decode_cursor(cursor, size=2)
+    value = parse_sort_value(key, value)
+    if isinstance(key.type, (String, DateTime)):
+        expected = (str, datetime)
+    else:
+        expected = (int, float)
+    if (
+        isinstance(value, bool)
+        or not isinstance(value, expected)
+        or not isinstance(last_id, int)
+    ):
+        raise InvalidCursorError()
+    return keyset_after(
+        key, Product.id, [value, last_id], descending=descending
+    )
 
 
 class ProductRepository:
-    def __init__(self, session: Session):
+    def __init__(self, session: AsyncSession):
         self.session = session
 
-    def get_by_public_id(self, public_id: str) -> Product | None:
-        return self.session.scalar(
-            select(Product).where(Product.public_id == public_id)
-        )
+    async def _fetch(
+        self, stmt, fields: Sequence[str] | None
+    ) -> list[Product] | list[Row]:
+        if fields is None:
+            return list(await self.session.scalars(stmt))
+        return list(await self.session.execute(stmt))
 
-    def get_by_sku(self, sku: str) -> Product | None:
-        return self.session.scalar(select(Product).where(Product.sku == sku))
+    async def get_by_public_id(
+        self, public_id: str, *, fields: Sequence[str] | None = None
+    ) -> Product | Row | None:
+        """The product, or a row of ``fields`` when they are given."""
+        found = await self._fetch(
+            select(*_entities(fields)).where(Product.public_id == public_id),
+            fields,
+        )
+        return found[0] if found else None
 
-    def get_all(self) -> list[Product]:
-        return self.session.scalars(select(Product).order_by(Product.id)).all()
+    async def get_many_by_public_ids(
+        self, public_ids: Iterable[str], *, chunk_size: int = IN_CHUNK_SIZE
+    ) -> list[Product]:
+        """Products with any of ``public_ids``, in no particular order.
 
-    def search(self, query: str) -> list[Product]:
-        normalized_query = f'%{query.lower()}%'
-        return self.session.scalars(
-            select(Product)
-            .where(
-                or_(
-                    func.lower(Product.name).like(normalized_query),
-                    func.lower(Product.sku).like(normalized_query),
+        IDs go ``chunk_size`` at a time into ``IN`` lists, keeping each
+        statement under the driver's bound parameter limit.
+        """
+        public_ids = list(dict.fromkeys(public_ids))
+        products = []
+        for start in range(0, len(public_ids), chunk_size):
+            chunk = public_ids[start : start + chunk_size]
+            products.extend(
+                await self.session.scalars(
+                    select(Product).where(Product.public_id.in_(chunk))
                 )
             )
-            .order_by(Product.created_at.desc())
-        ).all()
+        return products
+
+    async def get_by_sku(self, sku: str) -> Product | None:
+        return await self.session.scalar(
+            select(Product).where(Product.sku == sku)
+        )
+
+    async def find(
+        self,
+        filters: ProductFilter,
+        *,
+        sort: ProductSort | None = None,
+        limit: int,
+        cursor: str | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> Page[Product] | Page[Row]:
+        """One keyset page of the products matching ``filters``.
+
+        Pages follow ``sort`` with ``id`` as tiebreaker. Without it,
+        text searches rank by relevance and listings go by ``id``.
+        """
+        dialect = self.session.get_bind().dialect
+        tokens = None
+        if filters.query is not None:
+            tokens = search.tokenize(filters.query)
+            if not tokens:
+                return Page(items=[])
+        stmt = _filtered(
+            select(*_entities(fields)).limit(limit + 1),
+            filters,
+            tokens,
+            dialect,
+        )
+
+        key, descending = _order(sort, tokens, dialect)
+        tiebreaker = Product.id.desc() if descending else Product.id.asc()
+        if key is None:
+            stmt = stmt.order_by(tiebreaker)
+        else:
+            stmt = stmt.add_columns(key.label('sort_key')).order_by(
+                key.desc() if descending else key.asc(), tiebreaker
+            )
+        if cursor:
+            stmt = stmt.where(_after(cursor, key, descending=descending))
+
+        rows = (await self.session.execute(stmt)).all()
+        products = [
+            row.Product if fields is None else row for row in rows[:limit]
+        ]
+        if len(rows) <= limit:
+            return Page(items=products)
+
+        last = rows[limit - 1]
+        values = [last.Product.id if fields is None else last.id]
+        if key is not None:
+            values.insert(0, last.sort_key)
+        return Page(items=products, next_cursor=encode_cursor(values))
+
+    async def get_all(
+        self,
+        *,
+        limit: int,
+        cursor: str | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> Page[Product] | Page[Row]:
+        return await self.find(
+            ProductFilter(), limit=limit, cursor=cursor, fields=fields
+        )
+
+    async def search(
+        self,
+        query: str,
+        *,
+        limit: int,
+        cursor: str | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> Page[Product] | Page[Row]:
+        return await self.find(
+            ProductFilter(query=query),
+            limit=limit,
+            cursor=cursor,
+            fields=fields,
+        )
+
+    async def stream_batches(
+        self, *columns, batch_size: int
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        """Yield rows in id order, fetching ``batch_size`` at a time."""
+        result = await self.session.stream(
+            select(*columns)
+            .order_by(Product.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for batch in result.mappings().partitions():
+            yield batch
+
+    async def create_new_skus(self, rows: list[dict]) -> set[str]:
+        """Insert the rows whose SKU is free and return the SKUs inserted.
+
+        Conflicts are resolved by the database in the same statement, so
+        a SKU taken by a concurrent writer is skipped instead of failing
+        the batch.
+        """
+        if not rows:
+            return set()
+        dialect = self.session.get_bind().dialect
+        module = postgresql if dialect.name == 'postgresql' else sqlite
+        stmt = (
+            module.insert(Product)
+            .on_conflict_do_nothing(index_elements=[Product.sku])
+            .returning(Product.sku)
+        )
+        return set(await self.session.scalars(stmt, rows))
 
-    def create(self, product: Product) -> Product:
+    async def create(self, product: Product) -> Product:
         self.session.add(product)
-        self.session.commit()
-        self.session.refresh(product)
+        async with raise_unique_violations(UNIQUE_CONSTRAINTS):
+            await self.session.flush()
         return product
 
-    def update(self, product: Product) -> Product:
+    async def update(self, product: Product) -> Product:
         self.session.add(product)
-        self.session.commit()
-        self.session.refresh(product)
+        async with raise_unique_violations(UNIQUE_CONSTRAINTS):
+            await self.session.flush()
         return product
 
-    def delete(self, product: Product) -> None:
-        self.session.delete(product)
-        self.session.commit()
+    async def delete(self, product: Product) -> None:
+        await self.session.delete(product)
+        await self.session.flush()
@@ -1,6 +1,7 @@
 from datetime import datetime
+from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class ProductBase(BaseModel):
@@ -25,3 +26,54 @@ class ProductRead(ProductBase):
     public_id: str
     created_at: datetime
     updated_at: datetime
+
+
+FIELDS_DESCRIPTION = 'Comma-separated ProductRead fields to return.'
+
+
+ProductSort = Literal['price', '-price', 'created_at', '-created_at', 'name']
+
+
+class ProductListQuery(BaseModel):
+    q: str | None = Field(default=None, min_length=1)
+    min_price: float | None = Field(default=None, ge=0)
+    max_price: float | None = Field(default=None, ge=0)
+    sort: ProductSort | None = Field(
+        default=None,
+        description=(
+            'Sort key, "-" for descending. Defaults to relevance for '
+            'searches and insertion order otherwise.'
+        ),
+    )
+    limit: int = Field(default=50, ge=1, le=200)
+    cursor: str | None = Field(default=None, min_length=1)
+    fields: str | None = Field(
+        default=None, min_length=1, description=FIELDS_DESCRIPTION
+    )
+
+    @model_validator(mode='after')
+    def check_price_range(self) -> 'ProductListQuery':
+        if (
+            self.min_price is not None
+            and self.max_price is not None
+            and self.min_price > self.max_price
+        ):
+            raise ValueError('min_price must not exceed max_price.')
+        return self
+
+
+class ProductBatchRead(BaseModel):
+    items: list[ProductRead]
+    missing: list[str]
+
+
+class ProductImportError(BaseModel):
+    line: int
+    sku: str | None = None
+    detail: str
+
+
+class ProductImportResult(BaseModel):
+    created: int
+    failed: int
+    errors: list[ProductImportError]
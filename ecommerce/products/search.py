@@ -0,0 +1,148 @@
+import re
+from contextlib import contextmanager
+
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    cast,
+    column,
+    event,
+    func,
+    literal_column,
+    table,
+    text,
+)
+from sqlalchemy.engine import Connection, Dialect
+from sqlalchemy.sql.elements import ColumnElement
+
+from ecommerce.products.models import Product
+
+FTS_TABLE = 'products_fts'
+# bm25 column weights for name, description and sku, in FTS column order.
+FTS_WEIGHTS = (10.0, 1.0, 5.0)
+# Scores are paged on in millionths; closer ones tie and fall back to id.
+RANK_SCALE = 1_000_000
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+fts_table = table(FTS_TABLE, column('rowid'))
+
+_SQLITE_DDL = (
+    f"""
+    CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        name, description, sku,
+        content='products', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON products BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description, sku)
+        VALUES (new.id, new.name, new.description, new.sku);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON products BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description, sku)
+        VALUES ('delete', old.id, old.name, old.description, old.sku);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_au
+    AFTER UPDATE OF name, description, sku ON products BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description, sku)
+        VALUES ('delete', old.id, old.name, old.description, old.sku);
+        INSERT INTO {FTS_TABLE}(rowid, name, description, sku)
+        VALUES (new.id, new.name, new.description, new.sku);
+    END
+    """,
+)
+
+for statement in _SQLITE_DDL:
+    event.listen(
+        Product.__table__,
+        'after_create',
+        DDL(statement).execute_if(dialect='sqlite'),
+    )
+event.listen(
+    Product.__table__,
+    'before_drop',
+    DDL(f'DROP TABLE IF EXISTS {FTS_TABLE}').execute_if(dialect='sqlite'),
+)
+
+# Postgres keeps an expression GIN index, so there is nothing to sync:
+# the planner uses it whenever a query repeats the same expression.
+_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce({p}name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce({p}sku, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce({p}description, '')), 'B')"
+)
+search_vector = literal_column(f'({_VECTOR_SQL.format(p="products.")})')
+event.listen(
+    Product.__table__,
+    'after_create',
+    DDL(
+        'CREATE INDEX ix_products_search_vector ON products '
+        f'USING gin (({_VECTOR_SQL.format(p="")}))'
+    ).execute_if(dialect='postgresql'),
+)
+
+
+@contextmanager
+def deferred_fts_sync(connection: Connection):
+    """Skip per-row FTS updates during a bulk insert, then rebuild once.
+
+    Rebuilding the whole index is several times faster than the insert
+    trigger for large loads. Postgres needs nothing, see above.
+    """
+    if connection.dialect.name != 'sqlite':
+        yield
+        return
+    connection.exec_driver_sql(f'DROP TRIGGER {FTS_TABLE}_ai')
+    yield
+    connection.exec_driver_sql(
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+    )
+    connection.exec_driver_sql(_SQLITE_DDL[1])
+
+
+def tokenize(query: str) -> list[str]:
+    return [token.lower() for token in _TOKEN_RE.findall(query)]
+
+
+def match_condition(
+    tokens: list[str], dialect: Dialect
+) -> ColumnElement[bool]:
+    """Every token must match as a prefix, for search-as-you-type."""
+    if dialect.name == 'postgresql':
+        tsquery = ' & '.join(f'{token}:*' for token in tokens)
+        return search_vector.op('@@')(
+            func.to_tsquery(literal_column("'simple'"), tsquery)
+        )
+
+    fts_query = ' '.join(f'"{token}"*' for token in tokens)
+    return text(f'{FTS_TABLE} MATCH :fts_query').bindparams(
+        fts_query=fts_query
+    )
+
+
+def relevance(tokens: list[str], dialect: Dialect) -> ColumnElement[float]:
+    """Score where higher means more relevant, on both backends."""
+    if dialect.name == 'postgresql':
+        tsquery = ' & '.join(f'{token}:*' for token in tokens)
+        return func.ts_rank(
+            search_vector,
+            func.to_tsquery(literal_column("'simple'"), tsquery),
+        )
+
+    return -func.bm25(literal_column(FTS_TABLE), *FTS_WEIGHTS)
+
+
+def rank_bucket(tokens: list[str], dialect: Dialect) -> ColumnElement[int]:
+    """``relevance`` scaled to an integer, for ordering and cursors.
+
+    Keyset pages compare the last row's key for equality, which is only
+    reliable on exact values, so pages key on ``(bucket, id)`` rather
+    than on the float score.
+    """
+    return cast(relevance(tokens, dialect) * RANK_SCALE, BigInteger)
@@ -1,6 +1,18 @@
+from dataclasses import dataclass
+from typing import AsyncIterable, AsyncIterator, Sequence
+
+from sqlalchemy import Row, RowMapping
+
+from ecommerce.core.db.errors import UniqueViolationError
+from ecommerce.core.db.pagination import Page
+from ecommerce.core.db.unit_of_work import UnitOfWork
+from ecommerce.core.http_cache import ResponseCache
+from ecommerce.core.utils.ids import generate_public_ids
+from ecommerce.products.exports import EXPORT_FIELDS
+from ecommerce.products.imports import ImportResult, ImportRow, ImportRowError
 from ecommerce.products.models import Product
-from ecommerce.products.repositories import ProductRepository
-from ecommerce.products.schemas import ProductUpdate
+from ecommerce.products.repositories import ProductFilter, ProductRepository
+from ecommerce.products.schemas import ProductSort, ProductUpdate
 
 
 class SKUAlreadyExistsError(Exception): ...
@@ -9,11 +21,28 @@ class SKUAlreadyExistsError(Exception): ...
 class ProductNotFoundError(Exception): ...
 
 
+@dataclass
+class ProductLookup:
+    items: list[Product]
+    missing: list[str]
+
+
 class ProductService:
-    def __init__(self, repo: ProductRepository):
+    def __init__(
+        self,
+        repo: ProductRepository,
+        response_cache: ResponseCache | None = None,
+        uow: UnitOfWork | None = None,
+    ):
         self.repo = repo
+        self.response_cache = response_cache
+        self.uow = uow or UnitOfWork(repo.session)
+
+    async def _invalidate_responses(self) -> None:
+        if self.response_cache:
+            await self.response_cache.invalidate()
 
-    def create_product(
+    async def create_product(
         self,
         *,
         name: str,
@@ -21,53 +50,160 @@ class ProductService:
         price: float,
         sku: str,
     ) -> Product:
-        if self.repo.get_by_sku(sku):
-            raise SKUAlreadyExistsError()
-
         product = Product(
             name=name,
             description=description,
             price=price,
             sku=sku,
         )
-        return self.repo.create(product)
+        try:
+            async with self.uow:
+                product = await self.repo.create(product)
+        except UniqueViolationError as exc:
+            raise SKUAlreadyExistsError() from exc
+        await self._invalidate_responses()
+        return product
 
-    def get_product_by_public_id(self, public_id: str) -> Product:
-        product = self.repo.get_by_public_id(public_id)
+    async def import_products(
+        self,
+        rows: AsyncIterable[ImportRow],
+        *,
+        chunk_size: int,
+        max_errors: int,
+    ) -> ImportResult:
+        result = ImportResult()
+        chunk = []
+        async for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                await self._import_chunk(chunk, result, max_errors)
+                chunk = []
+        if chunk:
+            await self._import_chunk(chunk, result, max_errors)
+
+        if result.created:
+            await self._invalidate_responses()
+        return result
+
+    async def _import_chunk(
+        self,
+        chunk: list[ImportRow],
+        result: ImportResult,
+        max_errors: int,
+    ) -> None:
+        errors = []
+        pending: dict[str, ImportRow] = {}
+        for row in chunk:
+            if row.error:
+                errors.append(row.error)
+            elif row.product.sku in pending:
+                errors.append(
+                    ImportRowError(
+                        line=row.line,
+                        detail='Duplicate SKU in import.',
+                        sku=row.product.sku,
+                    )
+                )
+            else:
+                pending[row.product.sku] = row
+
+        public_ids = generate_public_ids(len(pending))
+        async with self.uow:
+            created = await self.repo.create_new_skus([
+                {**row.product.model_dump(), 'public_id': public_id}
+                for row, public_id in zip(pending.values(), public_ids)
+            ])
+        result.created += len(created)
+        for sku in pending.keys() - created:
+            errors.append(
+                ImportRowError(
+                    line=pending[sku].line,
+                    detail='SKU already in use.',
+                    sku=sku,
+                )
+            )
+        for error in sorted(errors, key=lambda error: error.line):
+            result.record(error, max_errors=max_errors)
+
+    async def get_product_by_public_id(
+        self, public_id: str, *, fields: Sequence[str] | None = None
+    ) -> Product | Row:
+        """The product, or a row of just ``fields`` when they are given."""
+        product = await self.repo.get_by_public_id(public_id, fields=fields)
         if not product:
             raise ProductNotFoundError()
         return product
 
-    def get_product_by_sku(self, sku: str) -> Product:
-        product = self.repo.get_by_sku(sku)
+    async def get_products_by_public_ids(
+        self, public_ids: list[str]
+    ) -> ProductLookup:
+        """Products in the order asked for; unknown IDs under ``missing``.
+
+        Repeated IDs are returned once, at their first position.
+        """
+        found = {
+            product.public_id: product
+            for product in await self.repo.get_many_by_public_ids(public_ids)
+        }
+        lookup = ProductLookup(items=[], missing=[])
+        for public_id in dict.fromkeys(public_ids):
+            if public_id in found:
+                lookup.items.append(found[public_id])
+            else:
+                lookup.missing.append(public_id)
+        return lookup
+
+    async def get_product_by_sku(self, sku: str) -> Product:
+        product = await self.repo.get_by_sku(sku)
         if not product:
             raise ProductNotFoundError()
         return product
 
-    def list_products(self, query: str | None = None) -> list[Product]:
-        if query:
-            return self.repo.search(query)
-        return self.repo.get_all()
+    async def list_products(
+        self,
+        *,
+        filters: ProductFilter | None = None,
+        sort: ProductSort | None = None,
+        limit: int,
+        cursor: str | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> Page[Product] | Page[Row]:
+        return await self.repo.find(
+            filters or ProductFilter(),
+            sort=sort,
+            limit=limit,
+            cursor=cursor,
+            fields=fields,
+        )
 
-    def update_product(
+    def export_products(
+        self, *, batch_size: int
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        columns = [getattr(Product, field) for field in EXPORT_FIELDS]
+        return self.repo.stream_batches(*columns, batch_size=batch_size)
+
+    async def update_product(
         self,
         *,
         public_id: str,
         payload: ProductUpdate,
     ) -> Product:
-        product = self.get_product_by_public_id(public_id)
-
-        if payload.sku and payload.sku != product.sku and self.repo.get_by_sku(
-            payload.sku
-        ):
-            raise SKUAlreadyExistsError()
+        product = await self.get_product_by_public_id(public_id)
 
         update_data = payload.model_dump(exclude_unset=True, exclude_none=True)
         for field, value in update_data.items():
             setattr(product, field, value)
 
-        return self.repo.update(product)
+        try:
+            async with self.uow:
+                product = await self.repo.update(product)
+        except UniqueViolationError as exc:
+            raise SKUAlreadyExistsError() from exc
+        await self._invalidate_responses()
+        return product
 
-    def delete_product(self, *, public_id: str) -> None:
-        product = self.get_product_by_public_id(public_id)
-        self.repo.delete(product)
+    async def delete_product(self, *, public_id: str) -> None:
+        product = await self.get_product_by_public_id(public_id)
+        async with self.uow:
+            await self.repo.delete(product)
+        await self._invalidate_responses()
@@ -0,0 +1,71 @@
+import json
+from dataclasses import asdict, dataclass
+
+from ecommerce.core.cache import CacheBackend, build_cache
+from ecommerce.core.metrics import registry
+from ecommerce.core.settings import settings
+from ecommerce.users.models import User
+
+principal_cache_hits = registry.counter(
+    'principal_cache_hits_total',
+    'Authenticated requests served from the principal cache.',
+)
+principal_cache_misses = registry.counter(
+    'principal_cache_misses_total',
+    'Authenticated requests that had to load the user from the database.',
+)
+
+
+@dataclass(frozen=True)
+class Principal:
+    id: int
+    public_id: str
+    email: str
+
+    @classmethod
+    def from_user(cls, user: User) -> 'Principal':
+        return cls(id=user.id, public_id=user.public_id, email=user.email)
+
+
+class PrincipalCache:
+    def __init__(self, backend: CacheBackend, *, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+
+    async def get(self, subject: str) -> Principal | None:
+        raw = await self.backend.get(subject)
+        if raw is None:
+            principal_cache_misses.inc()
+            return None
+        principal_cache_hits.inc()
+        return Principal(**json.loads(raw))
+
+    async def set(self, subject: str, principal: Principal) -> None:
+        await self.backend.set(
+            subject, json.dumps(asdict(principal)).encode(), self.ttl
+        )
+
+    async def invalidate(self, *subjects: str) -> None:
+        await self.backend.delete(*subjects)
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+
+def build_principal_cache() -> PrincipalCache:
+    if settings.CACHE_BACKEND != 'redis' and settings.WEB_CONCURRENCY > 1:
+        raise RuntimeError(
+            'Running more than one worker requires CACHE_BACKEND=redis: '
+            'in-memory principals are per process and a user update in '
+            'one worker would not invalidate the others.'
+        )
+    return PrincipalCache(
+        build_cache(
+            namespace='principal',
+            max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+        ),
+        ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    )
+
+
+principal_cache = build_principal_cache()
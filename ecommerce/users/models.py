@@ -1,15 +1,17 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, Integer, String, func
+from sqlalchemy import DateTime, Index, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ecommerce.core.db.base import table_registry
+from ecommerce.core.db.types import ULID
 from ecommerce.core.utils.ids import generate_public_id
 
 
 @table_registry.mapped_as_dataclass
 class User:
     __tablename__ = 'users'
+    __mapper_args__ = {'eager_defaults': True}
 
     id: Mapped[int] = mapped_column(
         Integer,
@@ -49,7 +51,12 @@ class User:
         init=False,
     )
     public_id: Mapped[str] = mapped_column(
-        String(26),
+        ULID,
         nullable=False,
+        unique=True,
+        index=True,
         default_factory=generate_public_id,
     )
+
+
+Index('ix_users_email_lower', func.lower(User.email), unique=True)
@@ -1,38 +1,46 @@
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from ecommerce.core.db.errors import raise_unique_violations
 from ecommerce.users.models import User
 
+UNIQUE_CONSTRAINTS = {
+    'email': ('users.email', 'users_email_key', 'ix_users_email_lower'),
+    'phone_number': ('users.phone_number', 'users_phone_number_key'),
+}
+
 
 class UserRepository:
-    def __init__(self, session: Session):
+    def __init__(self, session: AsyncSession):
         self.session = session
 
-    def get_by_public_id(self, public_id: str) -> User | None:
-        return self.session.scalar(
+    async def get_by_public_id(self, public_id: str) -> User | None:
+        return await self.session.scalar(
             select(User).where(User.public_id == public_id)
         )
 
-    def get_by_email(self, email: str) -> User | None:
-        return self.session.scalar(select(User).where(User.email == email))
+    async def get_by_email(self, email: str) -> User | None:
+        return await self.session.scalar(
+            select(User).where(func.lower(User.email) == email.lower())
+        )
 
-    def get_by_phone_number(self, phone_number: str) -> User | None:
-        return self.session.scalar(
+    async def get_by_phone_number(self, phone_number: str) -> User | None:
+        return await self.session.scalar(
             select(User).where(User.phone_number == phone_number)
         )
 
-    def create(self, user: User) -> User:
+    async def create(self, user: User) -> User:
         self.session.add(user)
-        self.session.commit()
-        self.session.refresh(user)
+        async with raise_unique_violations(UNIQUE_CONSTRAINTS):
+            await self.session.flush()
         return user
 
-    def update(self, user: User) -> User:
+    async def update(self, user: User) -> User:
         self.session.add(user)
-        self.session.commit()
-        self.session.refresh(user)
+        async with raise_unique_violations(UNIQUE_CONSTRAINTS):
+            await self.session.flush()
         return user
 
-    def delete(self, user: User) -> None:
-        self.session.delete(user)
-        self.session.commit()
+    async def delete(self, user: User) -> None:
+        await self.session.delete(user)
+        await self.session.flush()
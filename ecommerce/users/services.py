@@ -1,6 +1,14 @@
 from pydantic import EmailStr
 
-from ecommerce.core.security import get_password_hash, verify_password
+from ecommerce.cart.store import CartStore
+from ecommerce.core.db.errors import UniqueViolationError
+from ecommerce.core.db.unit_of_work import UnitOfWork
+from ecommerce.core.security import (
+    VerifiedTokenCache,
+    get_password_hash_async,
+    verify_password_async,
+)
+from ecommerce.users.cache import Principal, PrincipalCache
 from ecommerce.users.models import User
 from ecommerce.users.repositories import UserRepository
 from ecommerce.users.schemas import UserUpdate
@@ -24,11 +32,28 @@ class PasswordChangeValidationError(Exception): ...
 class InvalidCurrentPasswordError(Exception): ...
 
 
+UNIQUE_FIELD_ERRORS = {
+    'email': EmailAlreadyExistsError,
+    'phone_number': PhoneNumberAlreadyExistsError,
+}
+
+
 class UserService:
-    def __init__(self, repo: UserRepository):
+    def __init__(
+        self,
+        repo: UserRepository,
+        principal_cache: PrincipalCache | None = None,
+        token_cache: VerifiedTokenCache | None = None,
+        uow: UnitOfWork | None = None,
+        cart_store: CartStore | None = None,
+    ):
         self.repo = repo
+        self.principal_cache = principal_cache
+        self.token_cache = token_cache
+        self.cart_store = cart_store
+        self.uow = uow or UnitOfWork(repo.session)
 
-    def create_user(
+    async def create_user(
         self,
         *,
         email: EmailStr,
@@ -36,46 +61,57 @@ class UserService:
         name: str,
         phone_number: str | None = None,
     ) -> User:
-        if self.repo.get_by_email(str(email)):
-            raise EmailAlreadyExistsError()
-
-        if phone_number and self.repo.get_by_phone_number(phone_number):
-            raise PhoneNumberAlreadyExistsError()
-
         user = User(
             email=str(email),
             name=name,
             phone_number=phone_number,
-            password=get_password_hash(password),
+            password=await get_password_hash_async(password),
         )
-        return self.repo.create(user)
-
-    def get_user_by_public_id(self, public_id: str) -> User:
-        user = self.repo.get_by_public_id(public_id)
+        try:
+            async with self.uow:
+                return await self.repo.create(user)
+        except UniqueViolationError as exc:
+            raise UNIQUE_FIELD_ERRORS[exc.field]() from exc
+
+    async def get_user_by_public_id(self, public_id: str) -> User:
+        user = await self.repo.get_by_public_id(public_id)
         if not user:
             raise UserNotFoundError()
         return user
 
-    def get_user_by_email(self, email: str) -> User:
-        user = self.repo.get_by_email(email)
+    async def get_user_by_email(self, email: str) -> User:
+        user = await self.repo.get_by_email(email)
         if not user:
             raise UserNotFoundError()
         return user
 
-    def update_user(self, *, public_id: str, payload: UserUpdate) -> User:
-        user = self.get_user_by_public_id(public_id)
+    async def get_principal(self, subject: str) -> Principal:
+        if self.principal_cache:
+            principal = await self.principal_cache.get(subject)
+            if principal:
+                return principal
+
+        principal = Principal.from_user(await self.get_user_by_email(subject))
+        if self.principal_cache:
+            await self.principal_cache.set(subject, principal)
+        return principal
 
-        if payload.email and payload.email != user.email:
-            existing_user_by_email = self.repo.get_by_email(str(payload.email))
-            if existing_user_by_email:
-                raise EmailAlreadyExistsError()
+    async def _invalidate_principal(self, email: str) -> None:
+        if self.principal_cache:
+            await self.principal_cache.invalidate(email)
 
-        if payload.phone_number and payload.phone_number != user.phone_number:
-            existing_user_by_phone = self.repo.get_by_phone_number(
-                payload.phone_number
-            )
-            if existing_user_by_phone:
-                raise PhoneNumberAlreadyExistsError()
+    def _invalidate_tokens(self, email: str) -> None:
+        if self.token_cache:
+            self.token_cache.invalidate(email)
+
+    async def update_user(
+        self,
+        *,
+        public_id: str,
+        payload: UserUpdate,
+    ) -> User:
+        user = await self.get_user_by_public_id(public_id)
+        previous_email = user.email
 
         has_password_fields = (
             payload.password is not None
@@ -86,10 +122,12 @@ class UserService:
             if not payload.current_password or not payload.password:
                 raise PasswordChangeValidationError()
 
-            if not verify_password(payload.current_password, user.password):
+            if not await verify_password_async(
+                payload.current_password, user.password
+            ):
                 raise InvalidCurrentPasswordError()
 
-            payload.password = get_password_hash(payload.password)
+            payload.password = await get_password_hash_async(payload.password)
         else:
             payload.current_password = None
             payload.password = None
@@ -98,14 +136,29 @@ class UserService:
         for field, value in update_data.items():
             setattr(user, field, value)
 
-        return self.repo.update(user)
-
-    def delete_user(self, *, public_id: str) -> None:
-        user = self.get_user_by_public_id(public_id)
-        self.repo.delete(user)
+        try:
+            async with self.uow:
+                user = await self.repo.update(user)
+        except UniqueViolationError as exc:
+            raise UNIQUE_FIELD_ERRORS[exc.field]() from exc
+        await self._invalidate_principal(previous_email)
+        if has_password_fields or user.email != previous_email:
+            self._invalidate_tokens(previous_email)
+        return user
 
-    def authenticate(self, *, email: str, password: str) -> User:
-        user = self.repo.get_by_email(email)
-        if not user or not verify_password(password, user.password):
+    async def delete_user(self, *, public_id: str) -> None:
+        user = await self.get_user_by_public_id(public_id)
+        async with self.uow:
+            await self.repo.delete(user)
+        if self.cart_store:
+            await self.cart_store.forget(user.id)
+        await self._invalidate_principal(user.email)
+        self._invalidate_tokens(user.email)
+
+    async def authenticate(self, *, email: str, password: str) -> User:
+        user = await self.repo.get_by_email(email)
+        if not user or not await verify_password_async(
+            password, user.password
+        ):
             raise InvalidCredentialsError()
         return user
@@ -24,6 +24,15 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = table_registry.metadata
 
+# Full-text search objects are created through DDL events, not the
+# metadata, so autogenerate must not propose dropping them.
+UNMANAGED_PREFIXES = ('products_fts', 'ix_products_search_vector')
+
+
+def include_name(name, type_, parent_names):
+    return not (name or '').startswith(UNMANAGED_PREFIXES)
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -48,6 +57,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -69,7 +79,9 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name,
         )
 
         with context.begin_transaction():
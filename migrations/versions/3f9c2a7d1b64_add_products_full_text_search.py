@@ -0,0 +1,85 @@
+"""add products full text search
+
+Revision ID: 3f9c2a7d1b64
+Revises: 878adcf9b65d
+Create Date: 2026-10-18 10:12:41.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2a7d1b64'
+down_revision: Union[str, Sequence[str], None] = '878adcf9b65d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SQLITE_UPGRADE = (
+    """
+    CREATE VIRTUAL TABLE products_fts USING fts5(
+        name, description, sku,
+        content='products', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER products_fts_ai AFTER INSERT ON products BEGIN
+        INSERT INTO products_fts(rowid, name, description, sku)
+        VALUES (new.id, new.name, new.description, new.sku);
+    END
+    """,
+    """
+    CREATE TRIGGER products_fts_ad AFTER DELETE ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description, sku)
+        VALUES ('delete', old.id, old.name, old.description, old.sku);
+    END
+    """,
+    """
+    CREATE TRIGGER products_fts_au
+    AFTER UPDATE OF name, description, sku ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description, sku)
+        VALUES ('delete', old.id, old.name, old.description, old.sku);
+        INSERT INTO products_fts(rowid, name, description, sku)
+        VALUES (new.id, new.name, new.description, new.sku);
+    END
+    """,
+    "INSERT INTO products_fts(products_fts) VALUES ('rebuild')",
+)
+
+POSTGRESQL_UPGRADE = (
+    """
+    CREATE INDEX ix_products_search_vector ON products USING gin ((
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(sku, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ))
+    """,
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        statements = SQLITE_UPGRADE
+    elif dialect == 'postgresql':
+        statements = POSTGRESQL_UPGRADE
+    else:
+        statements = ()
+
+    for statement in statements:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute('DROP TABLE IF EXISTS products_fts')
+        for suffix in ('ai', 'ad', 'au'):
+            op.execute(f'DROP TRIGGER IF EXISTS products_fts_{suffix}')
+    elif dialect == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_products_search_vector')
@@ -0,0 +1,42 @@
+"""add hot path indexes
+
+Revision ID: a81d4e0c5f27
+Revises: 3f9c2a7d1b64
+Create Date: 2026-10-18 11:02:17.284906
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a81d4e0c5f27'
+down_revision: Union[str, Sequence[str], None] = '3f9c2a7d1b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        op.f('ix_users_public_id'), 'users', ['public_id'], unique=True
+    )
+    op.create_index(
+        'ix_users_email_lower', 'users', [sa.text('lower(email)')], unique=True
+    )
+    op.create_index(
+        op.f('ix_products_public_id'), 'products', ['public_id'], unique=True
+    )
+    op.create_index(
+        op.f('ix_products_created_at'), 'products', ['created_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_products_created_at'), table_name='products')
+    op.drop_index(op.f('ix_products_public_id'), table_name='products')
+    op.drop_index('ix_users_email_lower', table_name='users')
+    op.drop_index(op.f('ix_users_public_id'), table_name='users')
@@ -0,0 +1,43 @@
+"""create cart items table
+
+Revision ID: c52d8e1f9a03
+Revises: a81d4e0c5f27
+Create Date: 2026-10-18 14:21:40.118230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c52d8e1f9a03'
+down_revision: Union[str, Sequence[str], None] = 'a81d4e0c5f27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('cart_items',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'product_id')
+    )
+    op.create_index(
+        op.f('ix_cart_items_product_id'),
+        'cart_items',
+        ['product_id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_cart_items_product_id'), table_name='cart_items')
+    op.drop_table('cart_items')
@@ -0,0 +1,150 @@
+"""store public ids as binary
+
+Revision ID: d4f1a9c3e6b8
+Revises: b7d20d7db22c
+Create Date: 2026-10-18 21:04:52.118734
+
+"""
+from typing import Callable, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from ecommerce.core.utils.ids import decode_ulid, encode_ulid
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f1a9c3e6b8'
+down_revision: Union[str, Sequence[str], None] = 'b7d20d7db22c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ('users', 'products', 'orders')
+CHUNK_SIZE = 10_000
+STAGING_COLUMN = 'public_id_new'
+
+# Recreating a table on SQLite drops its triggers, and reflection skips
+# expression indexes, so both are set aside and restored by hand.
+SQLITE_PRODUCT_TRIGGER_NAMES = (
+    'products_fts_ai',
+    'products_fts_ad',
+    'products_fts_au',
+)
+SQLITE_PRODUCT_TRIGGERS = (
+    """
+    CREATE TRIGGER products_fts_ai AFTER INSERT ON products BEGIN
+        INSERT INTO products_fts(rowid, name, description, sku)
+        VALUES (new.id, new.name, new.description, new.sku);
+    END
+    """,
+    """
+    CREATE TRIGGER products_fts_ad AFTER DELETE ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description, sku)
+        VALUES ('delete', old.id, old.name, old.description, old.sku);
+    END
+    """,
+    """
+    CREATE TRIGGER products_fts_au
+    AFTER UPDATE OF name, description, sku ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description, sku)
+        VALUES ('delete', old.id, old.name, old.description, old.sku);
+        INSERT INTO products_fts(rowid, name, description, sku)
+        VALUES (new.id, new.name, new.description, new.sku);
+    END
+    """,
+)
+
+
+def _copy_in_chunks(
+    table_name: str,
+    source_type: sa.types.TypeEngine,
+    target_type: sa.types.TypeEngine,
+    convert: Callable,
+) -> None:
+    """Fill the staging column from ``public_id``, ``CHUNK_SIZE`` rows
+    per statement, walking the primary key."""
+    connection = op.get_bind()
+    table = sa.table(
+        table_name,
+        sa.column('id', sa.Integer),
+        sa.column('public_id', source_type),
+        sa.column(STAGING_COLUMN, target_type),
+    )
+    update = (
+        table.update()
+        .where(table.c.id == sa.bindparam('row_id'))
+        .values({STAGING_COLUMN: sa.bindparam('value')})
+    )
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(table.c.id, table.c.public_id)
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(CHUNK_SIZE)
+        ).all()
+        if not rows:
+            return
+        connection.execute(
+            update,
+            [
+                {'row_id': row_id, 'value': convert(public_id)}
+                for row_id, public_id in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+
+def _convert(
+    source_type: sa.types.TypeEngine,
+    target_type: sa.types.TypeEngine,
+    convert: Callable,
+) -> None:
+    sqlite = op.get_bind().dialect.name == 'sqlite'
+    if sqlite:
+        op.drop_index('ix_users_email_lower', table_name='users')
+        for trigger in SQLITE_PRODUCT_TRIGGER_NAMES:
+            op.execute(f'DROP TRIGGER {trigger}')
+
+    for table_name in TABLES:
+        op.add_column(
+            table_name,
+            sa.Column(STAGING_COLUMN, target_type, nullable=True),
+        )
+        _copy_in_chunks(table_name, source_type, target_type, convert)
+        op.drop_index(op.f(f'ix_{table_name}_public_id'), table_name=table_name)
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_column('public_id')
+            batch_op.alter_column(
+                STAGING_COLUMN,
+                new_column_name='public_id',
+                existing_type=target_type,
+                nullable=False,
+            )
+        op.create_index(
+            op.f(f'ix_{table_name}_public_id'),
+            table_name,
+            ['public_id'],
+            unique=True,
+        )
+
+    if sqlite:
+        op.create_index(
+            'ix_users_email_lower',
+            'users',
+            [sa.text('lower(email)')],
+            unique=True,
+        )
+        for statement in SQLITE_PRODUCT_TRIGGERS:
+            op.execute(statement)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _convert(sa.String(length=26), sa.LargeBinary(length=16), decode_ulid)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _convert(sa.LargeBinary(length=16), sa.String(length=26), encode_ulid)
@@ -0,0 +1,44 @@
+"""add product sort indexes
+
+Revision ID: e7b3c5a1d902
+Revises: d4f1a9c3e6b8
+Create Date: 2026-10-18 22:41:09.517203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b3c5a1d902'
+down_revision: Union[str, Sequence[str], None] = 'd4f1a9c3e6b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index(op.f('ix_products_created_at'), table_name='products')
+    op.create_index(
+        'ix_products_created_at_id', 'products', ['created_at', 'id'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_products_price_id', 'products', ['price', 'id'], unique=False
+    )
+    op.create_index(
+        'ix_products_name_id', 'products', ['name', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_products_name_id', table_name='products')
+    op.drop_index('ix_products_price_id', table_name='products')
+    op.drop_index('ix_products_created_at_id', table_name='products')
+    op.create_index(
+        op.f('ix_products_created_at'), 'products', ['created_at'],
+        unique=False,
+    )
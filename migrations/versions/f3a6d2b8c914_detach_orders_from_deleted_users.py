@@ -0,0 +1,53 @@
+"""detach orders from deleted users
+
+Revision ID: f3a6d2b8c914
+Revises: e7b3c5a1d902
+Create Date: 2026-10-19 10:12:37.804215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a6d2b8c914'
+down_revision: Union[str, Sequence[str], None] = 'e7b3c5a1d902'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# The foreign key was created unnamed; this convention names it the way
+# Postgres does so the same name works on both backends.
+NAMING_CONVENTION = {'fk': '%(table_name)s_%(column_0_name)s_fkey'}
+ORDERS_USER_FK = 'orders_user_id_fkey'
+
+
+def _replace_user_fk(*, ondelete: str | None, nullable: bool) -> None:
+    with op.batch_alter_table(
+        'orders', naming_convention=NAMING_CONVENTION
+    ) as batch_op:
+        batch_op.drop_constraint(ORDERS_USER_FK, type_='foreignkey')
+        batch_op.alter_column(
+            'user_id', existing_type=sa.Integer(), nullable=nullable
+        )
+        batch_op.create_foreign_key(
+            ORDERS_USER_FK, 'users', ['user_id'], ['id'], ondelete=ondelete
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _replace_user_fk(ondelete='SET NULL', nullable=True)
+    op.create_index(
+        op.f('ix_order_items_product_id'), 'order_items', ['product_id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_order_items_product_id'), table_name='order_items')
+    # Fails while detached orders exist; they have no user to go back to.
+    _replace_user_fk(ondelete=None, nullable=False)
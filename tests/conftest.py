@@ -1,24 +1,57 @@
+import asyncio
 from contextlib import contextmanager
 from datetime import datetime
 from http import HTTPStatus
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import Engine, create_engine, event
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.pool import StaticPool
 
 from ecommerce.app import app
+from ecommerce.auth.rate_limits import auth_rate_limiter
+from ecommerce.cart.persistence import cart_write_behind
+from ecommerce.cart.store import cart_store
 from ecommerce.core.database import get_session
+from ecommerce.core.security import verified_tokens
+from ecommerce.inventory.rebalancer import inventory_rebalancer
+from ecommerce.jobs import job_worker
+from ecommerce.products.cache import product_response_cache
+from ecommerce.users.cache import principal_cache
 from ecommerce.users.models import table_registry
 
 
 @pytest.fixture
-def client(session: Session) -> TestClient:
+def anyio_backend():
+    return 'asyncio'
+
+
+@pytest.fixture
+def client(session: AsyncSession, monkeypatch) -> TestClient:
     def get_session_override():
         return session
 
     app.dependency_overrides[get_session] = get_session_override
+    asyncio.run(principal_cache.clear())
+    verified_tokens.clear()
+    asyncio.run(product_response_cache.invalidate())
+    asyncio.run(cart_store.reset())
+    asyncio.run(auth_rate_limiter.reset())
+    # Background tasks only run when a test calls them explicitly.
+    test_session_factory = async_sessionmaker(
+        session.bind, expire_on_commit=False
+    )
+    for task in (cart_write_behind, inventory_rebalancer):
+        monkeypatch.setattr(task, 'interval', 3600)
+        monkeypatch.setattr(task, 'session_factory', test_session_factory)
+    monkeypatch.setattr(job_worker, 'concurrency', 0)
+    monkeypatch.setattr(job_worker, 'session_factory', test_session_factory)
     with TestClient(app) as client:
         yield client
 
@@ -26,23 +59,35 @@ def client(session: Session) -> TestClient:
 
 
 @pytest.fixture(scope='session')
-def engine() -> Engine:
-    return create_engine(
-        'sqlite:///:memory:',
-        connect_args={'check_same_thread': False},
+def engine() -> AsyncEngine:
+    engine = create_async_engine(
+        'sqlite+aiosqlite:///:memory:',
         poolclass=StaticPool,
     )
 
+    @event.listens_for(engine.sync_engine, 'connect')
+    def enable_foreign_keys(dbapi_connection, connection_record):
+        dbapi_connection.execute('PRAGMA foreign_keys=ON')
+
+    return engine
+
+
+async def _reset_schema(engine: AsyncEngine, *, create: bool) -> None:
+    async with engine.begin() as connection:
+        await connection.run_sync(table_registry.metadata.drop_all)
+        if create:
+            await connection.run_sync(table_registry.metadata.create_all)
+
 
 @pytest.fixture
-def session(engine: Engine) -> Session:
-    table_registry.metadata.drop_all(engine)
-    table_registry.metadata.create_all(engine)
+def session(engine: AsyncEngine) -> AsyncSession:
+    asyncio.run(_reset_schema(engine, create=True))
 
-    with Session(engine) as session:
-        yield session
+    session = AsyncSession(engine, expire_on_commit=False)
+    yield session
+    asyncio.run(session.close())
 
-    table_registry.metadata.drop_all(engine)
+    asyncio.run(_reset_schema(engine, create=False))
 
 
 @contextmanager
@@ -0,0 +1,114 @@
+import pytest
+from fastapi import Request
+
+from ecommerce.core.cache import InMemoryCache, RedisCache
+from ecommerce.core.http_cache import ResponseCache, make_etag
+from ecommerce.products import cache as product_cache_module
+
+TTL = 10
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.anyio
+async def test_in_memory_cache_expires_entries():
+    clock = FakeClock()
+    cache = InMemoryCache(max_size=10, clock=clock)
+    await cache.set('key', b'value', ttl=TTL)
+
+    assert await cache.get('key') == b'value'
+    clock.now = TTL
+    assert await cache.get('key') is None
+    assert len(cache) == 0
+
+
+@pytest.mark.anyio
+async def test_in_memory_cache_evicts_least_recently_used():
+    cache = InMemoryCache(max_size=2)
+    await cache.set('a', b'1', ttl=TTL)
+    await cache.set('b', b'2', ttl=TTL)
+    await cache.get('a')
+    await cache.set('c', b'3', ttl=TTL)
+
+    assert await cache.get('a') == b'1'
+    assert await cache.get('b') is None
+    assert await cache.get('c') == b'3'
+
+
+@pytest.mark.anyio
+async def test_in_memory_cache_delete_and_clear():
+    cache = InMemoryCache(max_size=10)
+    await cache.set('a', b'1', ttl=TTL)
+    await cache.set('b', b'2', ttl=TTL)
+
+    await cache.delete('a', 'missing')
+    assert await cache.get('a') is None
+    await cache.clear()
+    assert await cache.get('b') is None
+
+
+@pytest.mark.anyio
+async def test_redis_cache_round_trip_is_namespaced():
+    fakeredis = pytest.importorskip('fakeredis')
+    client = fakeredis.FakeAsyncRedis()
+    await client.set('other:key', b'kept')
+    cache = RedisCache(client, namespace='principal')
+
+    await cache.set('key', b'value', ttl=TTL)
+    assert await cache.get('key') == b'value'
+    assert await client.pttl('principal:key') > 0
+
+    await cache.clear()
+    assert await cache.get('key') is None
+    assert await client.get('other:key') == b'kept'
+
+
+@pytest.mark.anyio
+async def test_counters_survive_eviction():
+    fakeredis = pytest.importorskip('fakeredis')
+    for cache in (
+        InMemoryCache(max_size=1),
+        RedisCache(fakeredis.FakeAsyncRedis(), namespace='products'),
+    ):
+        assert await cache.get_counter('generation') == 0
+        assert await cache.incr('generation') == 1
+        await cache.set('a', b'1', ttl=TTL)
+        await cache.set('b', b'2', ttl=TTL)
+
+        assert await cache.get_counter('generation') == 1
+
+
+@pytest.mark.anyio
+async def test_response_rendered_before_invalidate_is_never_served():
+    cache = ResponseCache(InMemoryCache(max_size=10), ttl=TTL, max_age=0)
+    request = Request({
+        'type': 'http',
+        'method': 'GET',
+        'path': '/products/',
+        'query_string': b'limit=5',
+        'headers': [],
+    })
+    stale_key = await cache.key(request)
+
+    await cache.invalidate()
+    await cache.set(stale_key, b'stale')
+    fresh_key = await cache.key(request)
+
+    assert await cache.get(fresh_key) is None
+    fresh = await cache.set(fresh_key, b'stale')
+    assert fresh.etag != make_etag(b'stale', stale_key.generation)
+
+
+def test_in_memory_product_cache_refuses_several_workers(monkeypatch):
+    settings = product_cache_module.settings
+    monkeypatch.setattr(settings, 'CACHE_BACKEND', 'memory')
+    monkeypatch.setattr(settings, 'WEB_CONCURRENCY', 2)
+
+    with pytest.raises(RuntimeError, match='CACHE_BACKEND=redis'):
+        product_cache_module.build_product_response_cache()
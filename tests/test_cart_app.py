@@ -1,13 +1,171 @@
+import asyncio
+from http import HTTPStatus
+
 import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ecommerce.cart.models import CartItem
+from ecommerce.cart.persistence import cart_write_behind
+from ecommerce.cart.store import cart_store
+from ecommerce.users.models import User
+
+KEYBOARD_PRICE = 100.0
+MOUSE_PRICE = 25.5
+KEYBOARD_QUANTITY = 3
+
+
+@pytest.fixture
+def products(client: TestClient) -> dict[str, str]:
+    ids = {}
+    for name, price, sku in [
+        ('Keyboard', KEYBOARD_PRICE, 'KEY-001'),
+        ('Mouse', MOUSE_PRICE, 'MOU-001'),
+    ]:
+        response = client.post(
+            '/products/', json={'name': name, 'price': price, 'sku': sku}
+        )
+        ids[sku] = response.json()['public_id']
+    return ids
+
+
+def _add(client: TestClient, headers, public_id: str, quantity: int = 1):
+    return client.post(
+        '/cart/items/',
+        json={'product_id': public_id, 'quantity': quantity},
+        headers=headers,
+    )
+
+
+@pytest.fixture
+def headers(create_user, auth_headers) -> dict[str, str]:
+    create_user()
+    return auth_headers('john.doe@example.com')
+
+
+def test_add_product_to_cart_requires_authentication(client: TestClient):
+    response = client.post('/cart/items/', json={'product_id': 'x'})
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_remove_product_from_cart_requires_authentication(
+    client: TestClient,
+):
+    response = client.delete('/cart/items/x/')
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_add_items_prices_cart(client: TestClient, products, headers):
+    _add(client, headers, products['KEY-001'], quantity=2)
+    _add(client, headers, products['MOU-001'])
+    response = _add(client, headers, products['KEY-001'])
+
+    assert response.status_code == HTTPStatus.OK
+    cart = response.json()
+    assert [
+        (line['sku'], line['quantity'], line['subtotal'])
+        for line in cart['items']
+    ] == [
+        ('KEY-001', KEYBOARD_QUANTITY, KEYBOARD_PRICE * KEYBOARD_QUANTITY),
+        ('MOU-001', 1, MOUSE_PRICE),
+    ]
+    assert cart['total'] == KEYBOARD_PRICE * KEYBOARD_QUANTITY + MOUSE_PRICE
+
+
+def test_add_unknown_product_returns_not_found(client: TestClient, headers):
+    response = _add(client, headers, 'missing')
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert client.get('/cart/', headers=headers).json()['items'] == []
+
+
+def test_update_and_remove_items(client: TestClient, products, headers):
+    for public_id in products.values():
+        _add(client, headers, public_id)
+
+    response = client.put(
+        f'/cart/items/{products["KEY-001"]}/',
+        json={'quantity': KEYBOARD_QUANTITY},
+        headers=headers,
+    )
+    assert response.json()['items'][0]['quantity'] == KEYBOARD_QUANTITY
+
+    response = client.delete(
+        f'/cart/items/{products["MOU-001"]}/', headers=headers
+    )
+    assert [line['sku'] for line in response.json()['items']] == ['KEY-001']
+
+    response = client.delete(
+        f'/cart/items/{products["MOU-001"]}/', headers=headers
+    )
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+    client.delete('/cart/', headers=headers)
+    assert client.get('/cart/', headers=headers).json()['items'] == []
+
+
+def test_cart_read_prices_lines_in_one_query(
+    client: TestClient, products, headers, session: AsyncSession
+):
+    for public_id in products.values():
+        _add(client, headers, public_id)
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    sync_engine = session.bind.sync_engine
+    event.listen(sync_engine, 'before_cursor_execute', capture)
+    try:
+        client.get('/cart/', headers=headers)
+    finally:
+        event.remove(sync_engine, 'before_cursor_execute', capture)
+
+    assert sum('FROM products' in statement for statement in statements) == 1
+
+
+def test_write_behind_coalesces_and_reloads(
+    client: TestClient, products, headers, session: AsyncSession
+):
+    for _ in range(KEYBOARD_QUANTITY):
+        _add(client, headers, products['KEY-001'])
+
+    assert asyncio.run(cart_write_behind.flush()) == 1
+    assert asyncio.run(cart_write_behind.flush()) == 0
+    rows = asyncio.run(session.scalars(select(CartItem))).all()
+    assert [row.quantity for row in rows] == [KEYBOARD_QUANTITY]
 
-pytestmark = pytest.mark.skip(
-    reason='Domínio cart ainda não implementado no projeto.'
-)
+    asyncio.run(cart_store.reset())
+    cart = client.get('/cart/', headers=headers).json()
+    assert cart['items'][0]['quantity'] == KEYBOARD_QUANTITY
 
 
-def test_add_product_to_cart_requires_authentication():
-    raise NotImplementedError
+def test_deleted_user_cart_does_not_block_write_behind(
+    client: TestClient,
+    products,
+    create_user,
+    auth_headers,
+    session: AsyncSession,
+):
+    user = create_user()
+    headers = auth_headers(user['email'])
+    create_user(name='Jane Doe', email='jane.doe@example.com')
+    other_headers = auth_headers('jane.doe@example.com')
+    _add(client, headers, products['KEY-001'])
+    _add(client, other_headers, products['MOU-001'])
+    user_id = asyncio.run(
+        session.scalar(select(User.id).where(User.email == user['email']))
+    )
 
+    client.delete(f'/users/me/{user["public_id"]}/', headers=headers)
+    assert asyncio.run(cart_store.get(user_id)) is None
+    # A flush that raced the delete may still hold the user's cart.
+    asyncio.run(cart_store.add(user_id, products['KEY-001'], 1))
 
-def test_remove_product_from_cart_requires_authentication():
-    raise NotImplementedError
+    assert asyncio.run(cart_write_behind.flush()) == 1
+    rows = asyncio.run(session.scalars(select(CartItem))).all()
+    assert [row.quantity for row in rows] == [1]
+    assert asyncio.run(cart_store.pop_dirty(10)) == []
@@ -0,0 +1,125 @@
+import pytest
+
+from ecommerce.cart import store as cart_store_module
+from ecommerce.cart.store import (
+    InMemoryCartStore,
+    RedisCartStore,
+    build_cart_store,
+)
+
+USER_ID = 1
+OTHER_USER_ID = 2
+TTL = 60
+QUANTITY = 3
+MAX_CARTS = 2
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(params=['memory', 'redis'])
+def store(request):
+    if request.param == 'memory':
+        return InMemoryCartStore(ttl=TTL, max_size=MAX_CARTS)
+    fakeredis = pytest.importorskip('fakeredis')
+    return RedisCartStore(
+        fakeredis.FakeAsyncRedis(), namespace='cart', ttl=TTL
+    )
+
+
+@pytest.mark.anyio
+async def test_unloaded_cart_is_none_and_empty_cart_is_not(store):
+    assert await store.get(USER_ID) is None
+
+    await store.load(USER_ID, {})
+
+    assert await store.get(USER_ID) == {}
+
+
+@pytest.mark.anyio
+async def test_writes_update_items_and_mark_dirty(store):
+    await store.load(USER_ID, {'a': 1})
+    await store.load(OTHER_USER_ID, {})
+
+    assert await store.add(USER_ID, 'a', QUANTITY - 1) == QUANTITY
+    await store.set(USER_ID, 'b', QUANTITY)
+    await store.set(USER_ID, 'b', 0)
+    await store.add(USER_ID, 'c', 1)
+    await store.clear(OTHER_USER_ID)
+
+    assert await store.get_many([USER_ID, OTHER_USER_ID]) == {
+        USER_ID: {'a': QUANTITY, 'c': 1},
+        OTHER_USER_ID: {},
+    }
+    assert sorted(await store.pop_dirty(10)) == [USER_ID, OTHER_USER_ID]
+    assert await store.pop_dirty(10) == []
+
+
+@pytest.mark.anyio
+async def test_mark_dirty_and_reset(store):
+    await store.load(USER_ID, {'a': 1})
+    await store.mark_dirty(USER_ID)
+
+    assert await store.pop_dirty(1) == [USER_ID]
+
+    await store.mark_dirty(USER_ID)
+    await store.reset()
+    assert await store.get(USER_ID) is None
+    assert await store.pop_dirty(1) == []
+
+
+@pytest.mark.anyio
+async def test_forget_drops_cart_and_dirty_flag(store):
+    await store.load(USER_ID, {'a': 1})
+    await store.add(USER_ID, 'a', 1)
+
+    await store.forget(USER_ID)
+
+    assert await store.get(USER_ID) is None
+    assert await store.pop_dirty(10) == []
+
+
+@pytest.mark.anyio
+async def test_in_memory_carts_expire_after_ttl_unless_dirty():
+    clock = FakeClock()
+    store = InMemoryCartStore(ttl=TTL, max_size=MAX_CARTS, clock=clock)
+    await store.load(USER_ID, {'a': 1})
+    await store.load(OTHER_USER_ID, {})
+    await store.add(OTHER_USER_ID, 'b', 1)
+
+    clock.now = TTL
+    assert await store.get(USER_ID) is None
+    assert await store.get(OTHER_USER_ID) == {'b': 1}
+
+    await store.pop_dirty(10)
+    clock.now = TTL * 3
+    assert await store.get(OTHER_USER_ID) is None
+    assert len(store) == 0
+
+
+@pytest.mark.anyio
+async def test_in_memory_store_evicts_least_recently_used_clean_cart():
+    store = InMemoryCartStore(ttl=TTL, max_size=MAX_CARTS)
+    third_user_id = OTHER_USER_ID + 1
+    await store.load(USER_ID, {})
+    await store.add(USER_ID, 'a', 1)
+    await store.load(OTHER_USER_ID, {'b': 1})
+    await store.load(third_user_id, {'c': 1})
+
+    assert await store.get(USER_ID) == {'a': 1}
+    assert await store.get(OTHER_USER_ID) is None
+    assert await store.get(third_user_id) == {'c': 1}
+    assert len(store) == MAX_CARTS
+
+
+def test_in_memory_store_refuses_several_workers(monkeypatch):
+    monkeypatch.setattr(cart_store_module.settings, 'CACHE_BACKEND', 'memory')
+    monkeypatch.setattr(cart_store_module.settings, 'WEB_CONCURRENCY', 2)
+
+    with pytest.raises(RuntimeError, match='CACHE_BACKEND=redis'):
+        build_cart_store()
@@ -1,13 +1,124 @@
+import asyncio
+from http import HTTPStatus
+
 import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from ecommerce.checkout.models import Order
+
+KEYBOARD_PRICE = 100.0
+MOUSE_PRICE = 25.0
+STOCK = 5
+QUANTITY = 2
+
+
+@pytest.fixture
+def products(client: TestClient) -> dict[str, str]:
+    ids = {}
+    for name, price, sku in [
+        ('Keyboard', KEYBOARD_PRICE, 'KEY-001'),
+        ('Mouse', MOUSE_PRICE, 'MOU-001'),
+    ]:
+        public_id = client.post(
+            '/products/', json={'name': name, 'price': price, 'sku': sku}
+        ).json()['public_id']
+        client.put(
+            f'/inventory/{public_id}/', json={'stock': STOCK, 'shards': 2}
+        )
+        ids[sku] = public_id
+    return ids
+
+
+@pytest.fixture
+def headers(create_user, auth_headers) -> dict[str, str]:
+    create_user()
+    return auth_headers('john.doe@example.com')
+
+
+def _add(client: TestClient, headers, public_id: str, quantity: int):
+    client.post(
+        '/cart/items/',
+        json={'product_id': public_id, 'quantity': quantity},
+        headers=headers,
+    )
+
+
+def test_checkout_requires_authenticated_user(client: TestClient):
+    response = client.post('/checkout/')
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_checkout_without_items_returns_error(client: TestClient, headers):
+    response = client.post('/checkout/', headers=headers)
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Cart is empty.'}
+
+
+def test_checkout_reserves_stock_and_clears_cart(
+    client: TestClient, products, headers
+):
+    _add(client, headers, products['KEY-001'], QUANTITY)
+    _add(client, headers, products['MOU-001'], 1)
+
+    response = client.post('/checkout/', headers=headers)
+
+    assert response.status_code == HTTPStatus.CREATED
+    order = response.json()
+    assert order['status'] == 'pending'
+    assert order['total'] == KEYBOARD_PRICE * QUANTITY + MOUSE_PRICE
+    assert [(item['sku'], item['quantity']) for item in order['items']] == [
+        ('KEY-001', QUANTITY),
+        ('MOU-001', 1),
+    ]
+    stock = client.get(f'/inventory/{products["KEY-001"]}/').json()
+    assert stock == {
+        'product_id': products['KEY-001'],
+        'stock': STOCK - QUANTITY,
+        'shards': 2,
+    }
+    assert client.get('/cart/', headers=headers).json()['items'] == []
+
+
+def test_checkout_is_all_or_nothing(client: TestClient, products, headers):
+    _add(client, headers, products['KEY-001'], QUANTITY)
+    _add(client, headers, products['MOU-001'], STOCK)
+    client.put(f'/inventory/{products["MOU-001"]}/', json={'stock': 1})
+
+    response = client.post('/checkout/', headers=headers)
+
+    assert response.status_code == HTTPStatus.CONFLICT
+    stock = client.get(f'/inventory/{products["KEY-001"]}/').json()
+    assert stock['stock'] == STOCK
+    cart = client.get('/cart/', headers=headers).json()
+    assert len(cart['items']) == len(products)
+
+
+def test_set_stock_for_unknown_product(client: TestClient):
+    response = client.put('/inventory/missing/', json={'stock': 1})
 
-pytestmark = pytest.mark.skip(
-    reason='Domínio checkout ainda não implementado no projeto.'
-)
+    assert response.status_code == HTTPStatus.NOT_FOUND
 
 
-def test_checkout_requires_authenticated_user():
-    raise NotImplementedError
+def test_deleting_user_keeps_their_orders(
+    client: TestClient, products, create_user, auth_headers, session
+):
+    user = create_user(name='Jane Doe', email='jane.doe@example.com')
+    headers = auth_headers(user['email'])
+    _add(client, headers, products['KEY-001'], 1)
+    order = client.post('/checkout/', headers=headers).json()
 
+    response = client.delete(
+        f'/users/me/{user["public_id"]}/', headers=headers
+    )
 
-def test_checkout_without_items_returns_error():
-    raise NotImplementedError
+    assert response.status_code == HTTPStatus.OK
+    stored = asyncio.run(
+        session.scalar(
+            select(Order).where(Order.public_id == order['public_id'])
+        )
+    )
+    assert stored.user_id is None
+    assert [item.sku for item in stored.items] == ['KEY-001']
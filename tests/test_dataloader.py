@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from ecommerce.core.dataloader import DataLoader
+
+
+class Source:
+    def __init__(self, values: dict[str, int]):
+        self.values = values
+        self.batches = []
+
+    async def load(self, keys: list[str]) -> dict[str, int]:
+        self.batches.append(keys)
+        return {key: self.values[key] for key in keys if key in self.values}
+
+
+@pytest.mark.anyio
+async def test_concurrent_loads_share_one_batch():
+    source = Source({'a': 1, 'b': 2})
+    loader = DataLoader(source.load)
+
+    results = await asyncio.gather(
+        loader.load('a'),
+        loader.load_many(['b', 'missing']),
+        loader.load('a'),
+    )
+
+    assert results == [1, [2, None], 1]
+    assert source.batches == [['a', 'b', 'missing']]
+
+
+@pytest.mark.anyio
+async def test_loaded_keys_are_remembered():
+    source = Source({'a': 1, 'b': 2})
+    loader = DataLoader(source.load)
+
+    await loader.load('a')
+    assert await loader.load_many(['a', 'b']) == [1, 2]
+
+    assert source.batches == [['a'], ['b']]
+
+
+@pytest.mark.anyio
+async def test_failed_batch_can_be_retried():
+    source = Source({'a': 1})
+    calls = []
+
+    async def flaky(keys):
+        calls.append(keys)
+        if len(calls) == 1:
+            raise ConnectionError()
+        return await source.load(keys)
+
+    loader = DataLoader(flaky)
+
+    with pytest.raises(ConnectionError):
+        await loader.load('a')
+
+    assert await loader.load('a') == 1
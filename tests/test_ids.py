@@ -0,0 +1,54 @@
+import pytest
+import ulid
+
+from ecommerce.core.utils import ids
+from ecommerce.core.utils.ids import (
+    MonotonicULIDGenerator,
+    decode_ulid,
+    encode_ulid,
+    generate_public_id,
+    generate_public_ids,
+)
+
+BATCH_SIZE = 5_000
+# The last ID of a batch that crosses a 40-bit boundary of the counter.
+SUFFIX_LIMIT = 1 << 40
+
+
+def test_codec_matches_reference_implementation():
+    for _ in range(100):
+        reference = ulid.new()
+
+        assert encode_ulid(reference.bytes) == reference.str
+        assert decode_ulid(reference.str) == reference.bytes
+        assert decode_ulid(reference.str.lower()) == reference.bytes
+
+
+@pytest.mark.parametrize(
+    'value', ['', 'not-a-ulid', '8' + '0' * 25, 'I' * 26, '0' * 27]
+)
+def test_decode_rejects_malformed_values(value):
+    with pytest.raises(ValueError, match='Invalid ULID'):
+        decode_ulid(value)
+
+
+def test_batches_are_unique_sorted_and_valid():
+    public_ids = generate_public_ids(BATCH_SIZE)
+
+    assert public_ids == sorted(public_ids)
+    assert len(set(public_ids)) == BATCH_SIZE
+    assert ulid.from_str(public_ids[0]).str == public_ids[0]
+    assert generate_public_id() > public_ids[-1]
+
+
+def test_batch_carries_across_the_encoded_suffix(monkeypatch):
+    generator = MonotonicULIDGenerator()
+    monkeypatch.setattr(ids.time, 'time_ns', lambda: 1_000_000)
+    monkeypatch.setattr(generator, '_random_start', lambda: SUFFIX_LIMIT - 2)
+    generator.reserve(1)
+
+    public_ids = generator.generate(3)
+
+    values = [int.from_bytes(decode_ulid(value)) for value in public_ids]
+    assert values == list(range(values[0], values[0] + 3))
+    assert values[1] & (SUFFIX_LIMIT - 1) == 0
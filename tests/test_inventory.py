@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ecommerce.core.database import build_engine
+from ecommerce.core.settings import Settings
+from ecommerce.inventory.models import InventoryShard
+from ecommerce.inventory.rebalancer import InventoryRebalancer
+from ecommerce.inventory.repositories import InventoryRepository
+from ecommerce.inventory.services import (
+    InsufficientStockError,
+    InventoryService,
+)
+from ecommerce.models import table_registry
+from ecommerce.products.models import Product
+
+STOCK = 20
+SHARDS = 4
+BUYERS = 60
+LARGE_ORDER = 8
+
+
+async def _product(session: AsyncSession, sku: str = 'HOT-001') -> int:
+    product = Product(name='Hot', description=None, price=1.0, sku=sku)
+    session.add(product)
+    await session.commit()
+    return product.id
+
+
+async def _shards(session: AsyncSession, product_id: int) -> list[int]:
+    return list(
+        await session.scalars(
+            select(InventoryShard.stock)
+            .where(InventoryShard.product_id == product_id)
+            .order_by(InventoryShard.shard)
+        )
+    )
+
+
+@pytest.mark.anyio
+async def test_parallel_checkouts_never_oversell(tmp_path):
+    engine = build_engine(
+        Settings(DATABASE_URL=f'sqlite:///{tmp_path / "shop.db"}')
+    )
+    async with engine.begin() as connection:
+        await connection.run_sync(table_registry.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with factory() as session:
+        product_id = await _product(session)
+        await InventoryService(InventoryRepository(session)).set_stock(
+            product_id, STOCK, shards=SHARDS
+        )
+
+    async def buy() -> bool:
+        async with factory() as session:
+            service = InventoryService(InventoryRepository(session))
+            try:
+                await service.reserve({product_id: 1})
+            except InsufficientStockError:
+                return False
+            return True
+
+    results = await asyncio.gather(*(buy() for _ in range(BUYERS)))
+
+    async with factory() as session:
+        assert sum(results) == STOCK
+        assert await _shards(session, product_id) == [0] * SHARDS
+    await engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_reserve_spans_shards_when_none_holds_enough(
+    session: AsyncSession,
+):
+    product_id = await _product(session)
+    service = InventoryService(InventoryRepository(session))
+    await service.set_stock(product_id, STOCK, shards=SHARDS)
+
+    await service.reserve({product_id: LARGE_ORDER})
+
+    assert sum(await _shards(session, product_id)) == STOCK - LARGE_ORDER
+
+
+@pytest.mark.anyio
+async def test_failed_line_rolls_back_the_whole_reservation(
+    session: AsyncSession,
+):
+    first = await _product(session, 'A-001')
+    second = await _product(session, 'B-001')
+    service = InventoryService(InventoryRepository(session))
+    await service.set_stock(first, STOCK, shards=SHARDS)
+    await service.set_stock(second, 1, shards=1)
+
+    with pytest.raises(InsufficientStockError) as exc:
+        await service.reserve({first: LARGE_ORDER, second: 2})
+
+    assert exc.value.product_id == second
+    assert sum(await _shards(session, first)) == STOCK
+
+
+@pytest.mark.anyio
+async def test_rebalance_evens_out_skewed_shards(session: AsyncSession):
+    product_id = await _product(session)
+    repo = InventoryRepository(session)
+    service = InventoryService(repo)
+    await service.set_stock(product_id, STOCK, shards=SHARDS)
+    await service.reserve({product_id: LARGE_ORDER})
+    await service.release({product_id: 1})
+
+    await repo.rebalance()
+
+    shards = await _shards(session, product_id)
+    assert sum(shards) == STOCK - LARGE_ORDER + 1
+    assert max(shards) - min(shards) <= 1
+
+
+@pytest.mark.anyio
+async def test_rebalancer_only_evens_out_reserved_products(
+    session: AsyncSession,
+):
+    rebalancer = InventoryRebalancer(
+        async_sessionmaker(session.bind, expire_on_commit=False),
+        interval=3600,
+        batch_size=1,
+    )
+    reserved = await _product(session)
+    untouched = await _product(session, sku='COLD-001')
+    service = InventoryService(InventoryRepository(session))
+    for product_id in (reserved, untouched):
+        await service.set_stock(product_id, STOCK, shards=SHARDS)
+        await service.reserve({product_id: LARGE_ORDER})
+    await InventoryService(
+        InventoryRepository(session), rebalancer=rebalancer
+    ).reserve({reserved: 1})
+
+    await rebalancer.tick()
+
+    shards = await _shards(session, reserved)
+    assert max(shards) - min(shards) <= 1
+    shards = await _shards(session, untouched)
+    assert max(shards) - min(shards) > 1
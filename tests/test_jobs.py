@@ -0,0 +1,156 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ecommerce.core.db.unit_of_work import UnitOfWork
+from ecommerce.core.jobs.models import Job
+from ecommerce.core.jobs.queue import JobQueue
+from ecommerce.core.jobs.worker import JobWorker, RetryPolicy
+
+QUEUE = 'test'
+NOW = datetime(2024, 1, 1, tzinfo=UTC)
+TIMEOUT = timedelta(minutes=5)
+BATCH_SIZE = 10
+MAX_ATTEMPTS = 2
+BACKOFF = 10.0
+MAX_BACKOFF = 60.0
+
+
+def _worker(session: AsyncSession, handler) -> JobWorker:
+    worker = JobWorker(
+        async_sessionmaker(session.bind, expire_on_commit=False),
+        interval=3600,
+        concurrency=1,
+        batch_size=BATCH_SIZE,
+        retry=RetryPolicy(
+            max_attempts=MAX_ATTEMPTS,
+            backoff=BACKOFF,
+            max_backoff=MAX_BACKOFF,
+            visibility_timeout=TIMEOUT.total_seconds(),
+        ),
+    )
+    worker.register(QUEUE, handler)
+    return worker
+
+
+async def _enqueue(session: AsyncSession, *payloads: dict) -> None:
+    async with UnitOfWork(session):
+        for payload in payloads:
+            await JobQueue(session).enqueue(QUEUE, payload, now=NOW)
+
+
+async def _jobs(session: AsyncSession) -> dict[str, Job]:
+    session.expire_all()
+    jobs = await session.scalars(select(Job))
+    return {job.payload['name']: job for job in jobs}
+
+
+@pytest.mark.anyio
+async def test_enqueue_ignores_repeated_idempotency_keys(session):
+    queue = JobQueue(session)
+
+    first = await queue.enqueue(QUEUE, {}, now=NOW, idempotency_key='a')
+    second = await queue.enqueue(QUEUE, {}, now=NOW, idempotency_key='a')
+
+    assert (first, second) == (True, False)
+
+
+@pytest.mark.anyio
+async def test_claim_takes_due_jobs_once_until_visibility_timeout(session):
+    await _enqueue(session, {'name': 'a'}, {'name': 'b'})
+    async with UnitOfWork(session):
+        await JobQueue(session).enqueue(
+            QUEUE, {'name': 'later'}, now=NOW + TIMEOUT
+        )
+    queue = JobQueue(session)
+
+    claimed = await queue.claim(
+        QUEUE, limit=1, now=NOW, visibility_timeout=TIMEOUT
+    )
+    rest = await queue.claim(
+        QUEUE, limit=BATCH_SIZE, now=NOW, visibility_timeout=TIMEOUT
+    )
+    reclaimed = await queue.claim(
+        QUEUE,
+        limit=1,
+        now=NOW + TIMEOUT / 2 + TIMEOUT,
+        visibility_timeout=TIMEOUT,
+    )
+
+    assert [job.payload['name'] for job in claimed] == ['a']
+    assert [job.payload['name'] for job in rest] == ['b']
+    assert [(job.payload['name'], job.attempts) for job in reclaimed] == [
+        ('a', 2)
+    ]
+
+
+@pytest.mark.anyio
+async def test_worker_completes_a_batch_with_one_handler_call(session):
+    calls = []
+
+    async def handler(uow, payloads):
+        calls.append([payload['name'] for payload in payloads])
+
+    await _enqueue(session, {'name': 'a'}, {'name': 'b'})
+
+    assert await _worker(session, handler).run_once(NOW) == len(calls[0])
+    assert calls == [['a', 'b']]
+    assert {job.status for job in (await _jobs(session)).values()} == {
+        'done'
+    }
+
+
+@pytest.mark.anyio
+async def test_worker_isolates_failing_jobs_and_backs_off(session):
+    async def handler(uow, payloads):
+        if any(payload['name'] == 'bad' for payload in payloads):
+            raise ValueError('boom')
+
+    await _enqueue(session, {'name': 'good'}, {'name': 'bad'})
+    worker = _worker(session, handler)
+
+    await worker.run_once(NOW)
+
+    jobs = await _jobs(session)
+    assert jobs['good'].status == 'done'
+    assert jobs['bad'].status == 'queued'
+    assert jobs['bad'].last_error == 'ValueError: boom'
+    delay = jobs['bad'].run_at.replace(tzinfo=UTC) - NOW
+    assert timedelta(seconds=BACKOFF / 2) <= delay <= timedelta(
+        seconds=BACKOFF
+    )
+    assert await worker.run_once(NOW) == 0
+
+
+@pytest.mark.anyio
+async def test_worker_fails_jobs_after_max_attempts(session):
+    async def handler(uow, payloads):
+        raise ValueError('boom')
+
+    await _enqueue(session, {'name': 'bad'})
+    worker = _worker(session, handler)
+
+    for attempt in range(MAX_ATTEMPTS):
+        await worker.run_once(NOW + attempt * timedelta(seconds=MAX_BACKOFF))
+
+    job = (await _jobs(session))['bad']
+    assert (job.status, job.attempts) == ('failed', MAX_ATTEMPTS)
+
+
+@pytest.mark.parametrize(
+    ('attempts', 'ceiling'),
+    [(1, BACKOFF), (2, BACKOFF * 2), (10, MAX_BACKOFF)],
+)
+def test_retry_delay_grows_exponentially_up_to_the_cap(attempts, ceiling):
+    policy = RetryPolicy(
+        max_attempts=MAX_ATTEMPTS,
+        backoff=BACKOFF,
+        max_backoff=MAX_BACKOFF,
+        visibility_timeout=TIMEOUT.total_seconds(),
+    )
+
+    delay = policy.delay(attempts).total_seconds()
+
+    assert ceiling / 2 <= delay <= ceiling
@@ -0,0 +1,51 @@
+from http import HTTPStatus
+
+from fastapi.testclient import TestClient
+
+from ecommerce.core.metrics import MetricsRegistry
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    requests = registry.counter('requests_total', 'Requests served.')
+    registry.gauge('queue_depth', 'Jobs waiting.', callback=lambda: 3)
+    latency = registry.histogram('latency_seconds', 'Latency.', (0.1, 1.0))
+
+    requests.inc()
+    requests.inc(2)
+    latency.observe(0.05)
+    latency.observe(0.5)
+
+    assert registry.render().splitlines() == [
+        '# HELP requests_total Requests served.',
+        '# TYPE requests_total counter',
+        'requests_total 3.0',
+        '# HELP queue_depth Jobs waiting.',
+        '# TYPE queue_depth gauge',
+        'queue_depth 3.0',
+        '# HELP latency_seconds Latency.',
+        '# TYPE latency_seconds histogram',
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1.0"} 2',
+        'latency_seconds_bucket{le="+Inf"} 2',
+        'latency_seconds_sum 0.55',
+        'latency_seconds_count 2',
+    ]
+
+
+def test_registry_returns_existing_metric():
+    registry = MetricsRegistry()
+
+    first = registry.counter('hits_total', 'Hits.')
+    second = registry.counter('hits_total', 'Hits.')
+
+    assert first is second
+
+
+def test_metrics_endpoint_exposes_pool_metrics(client: TestClient):
+    response = client.get('/metrics/')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'].startswith('text/plain')
+    assert 'db_pool_checkout_wait_seconds_count' in response.text
+    assert 'db_pool_utilization_ratio' in response.text
@@ -1,13 +1,196 @@
+import asyncio
+import json
+import time
+from http import HTTPStatus
+
 import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-pytestmark = pytest.mark.skip(
-    reason='Domínio payment/Stripe ainda não implementado no projeto.'
-)
+from ecommerce.checkout.models import Order
+from ecommerce.core.jobs.models import Job
+from ecommerce.core.settings import settings
+from ecommerce.jobs import job_worker
+from ecommerce.payments.webhooks import parse_event, sign
+
+STOCK = 5
+QUANTITY = 2
+STALE_SECONDS = settings.PAYMENT_WEBHOOK_TOLERANCE_SECONDS + 1
+
+
+@pytest.fixture
+def order(client: TestClient, create_user, auth_headers) -> dict:
+    create_user()
+    headers = auth_headers('john.doe@example.com')
+    product_id = client.post(
+        '/products/', json={'name': 'Keyboard', 'price': 100.0, 'sku': 'K-1'}
+    ).json()['public_id']
+    client.put(f'/inventory/{product_id}/', json={'stock': STOCK})
+    client.post(
+        '/cart/items/',
+        json={'product_id': product_id, 'quantity': QUANTITY},
+        headers=headers,
+    )
+    order = client.post('/checkout/', headers=headers).json()
+    order['product_id'] = product_id
+    return order
+
+
+def _event(order_id: str, event_type: str, *, event_id='evt_1', created=1):
+    return json.dumps({
+        'id': event_id,
+        'type': event_type,
+        'created': created,
+        'data': {'object': {'metadata': {'order_id': order_id}}},
+    }).encode()
+
+
+def _send(client: TestClient, payload: bytes, *, timestamp=None):
+    signature = sign(
+        payload,
+        secret=settings.PAYMENT_WEBHOOK_SECRET,
+        timestamp=int(timestamp or time.time()),
+    )
+    return client.post(
+        '/payments/webhook/',
+        content=payload,
+        headers={
+            'Content-Type': 'application/json',
+            'Stripe-Signature': signature,
+        },
+    )
+
+
+def _order_status(session: AsyncSession, public_id: str) -> str:
+    return asyncio.run(
+        session.scalar(
+            select(Order.status).where(Order.public_id == public_id)
+        )
+    )
 
 
+def _count_jobs(session: AsyncSession) -> int:
+    return asyncio.run(session.scalar(select(func.count()).select_from(Job)))
+
+
+@pytest.mark.skip(reason='No payment provider integration yet.')
 def test_create_payment_intent_for_order():
     raise NotImplementedError
 
 
-def test_payment_webhook_updates_order_status():
-    raise NotImplementedError
+def test_payment_webhook_updates_order_status(
+    client: TestClient, session: AsyncSession, order
+):
+    response = _send(
+        client, _event(order['public_id'], 'payment_intent.succeeded')
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'message': 'Event received.'}
+    assert _order_status(session, order['public_id']) == 'pending'
+
+    assert asyncio.run(job_worker.run_once()) == 1
+    assert _order_status(session, order['public_id']) == 'paid'
+
+
+def test_payment_webhook_is_idempotent(
+    client: TestClient, session: AsyncSession, order
+):
+    payload = _event(order['public_id'], 'payment_intent.succeeded')
+
+    for _ in range(3):
+        assert _send(client, payload).status_code == HTTPStatus.OK
+
+    assert _count_jobs(session) == 1
+
+
+def test_payment_webhook_ignores_unhandled_event_types(
+    client: TestClient, session: AsyncSession, order
+):
+    response = _send(client, _event(order['public_id'], 'customer.created'))
+
+    assert response.status_code == HTTPStatus.OK
+    assert _count_jobs(session) == 0
+
+
+@pytest.mark.parametrize(
+    ('headers', 'timestamp'),
+    [
+        ({'Stripe-Signature': 't=1,v1=bad'}, None),
+        ({}, None),
+        (None, time.time() - STALE_SECONDS),
+    ],
+    ids=['bad-signature', 'missing-signature', 'stale-timestamp'],
+)
+def test_payment_webhook_rejects_invalid_signature(
+    client: TestClient, session: AsyncSession, order, headers, timestamp
+):
+    payload = _event(order['public_id'], 'payment_intent.succeeded')
+    if headers is None:
+        response = _send(client, payload, timestamp=timestamp)
+    else:
+        response = client.post(
+            '/payments/webhook/', content=payload, headers=headers
+        )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Invalid signature.'}
+    assert _count_jobs(session) == 0
+
+
+def test_payment_webhook_rejects_malformed_event(client: TestClient):
+    response = _send(client, b'{"id": "evt_1"}')
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Invalid event.'}
+
+
+def test_parse_event_coerces_order_id_to_string():
+    numeric_order_id = 42
+
+    event = parse_event(_event(numeric_order_id, 'payment_intent.succeeded'))
+
+    assert event.order_id == str(numeric_order_id)
+    missing = json.dumps({
+        'id': 'evt_1',
+        'type': 'payment_intent.succeeded',
+        'created': 1,
+        'data': {'object': {}},
+    }).encode()
+    assert parse_event(missing).order_id is None
+
+
+def test_failed_payment_releases_reserved_stock(
+    client: TestClient, session: AsyncSession, order
+):
+    _send(client, _event(order['public_id'], 'payment_intent.payment_failed'))
+
+    asyncio.run(job_worker.run_once())
+
+    assert _order_status(session, order['public_id']) == 'payment_failed'
+    stock = client.get(f'/inventory/{order["product_id"]}/').json()
+    assert stock['stock'] == STOCK
+
+
+def test_payment_events_in_one_batch_apply_in_creation_order(
+    client: TestClient, session: AsyncSession, order
+):
+    # Delivered out of order: the refund arrives before the payment.
+    events = [
+        ('evt_2', 'charge.refunded', 2),
+        ('evt_1', 'payment_intent.succeeded', 1),
+    ]
+    for event_id, event_type, created in events:
+        _send(
+            client,
+            _event(
+                order['public_id'],
+                event_type,
+                event_id=event_id,
+                created=created,
+            ),
+        )
+
+    assert asyncio.run(job_worker.run_once()) == len(events)
+    assert _order_status(session, order['public_id']) == 'refunded'
@@ -1,12 +1,19 @@
+import csv
+import io
+import json
 import uuid
 from http import HTTPStatus
 
 from fastapi.testclient import TestClient
 
+from ecommerce.core.db.pagination import decode_cursor, encode_cursor
+from ecommerce.products.repositories import ProductRepository
+
 KEYBOARD_PRICE = 499.9
 KEYBOARD_PRO_PRICE = 599.9
 MOUSE_PRICE = 199.9
 EXPECTED_PRODUCT_COUNT = 2
+EXPORT_COUNT = 5
 
 
 def test_create_product_success(client: TestClient):
@@ -67,7 +74,9 @@ def test_list_products(client: TestClient):
     response = client.get('/products/')
 
     assert response.status_code == HTTPStatus.OK
-    assert len(response.json()) == EXPECTED_PRODUCT_COUNT
+    body = response.json()
+    assert len(body['items']) == EXPECTED_PRODUCT_COUNT
+    assert body['next_cursor'] is None
 
 
 def test_search_products(client: TestClient):
@@ -94,8 +103,196 @@ def test_search_products(client: TestClient):
 
     assert response.status_code == HTTPStatus.OK
     body = response.json()
-    assert len(body) == 1
-    assert body[0]['sku'] == 'KEY-001'
+    assert len(body['items']) == 1
+    assert body['items'][0]['sku'] == 'KEY-001'
+
+
+def _collect_pages(client: TestClient, url: str) -> list[list[str]]:
+    pages = []
+    response = client.get(url)
+    while True:
+        assert response.status_code == HTTPStatus.OK
+        body = response.json()
+        pages.append([item['sku'] for item in body['items']])
+        if not body['next_cursor']:
+            return pages
+        response = client.get(f'{url}&cursor={body["next_cursor"]}')
+
+
+def test_list_products_paginates_with_cursor(client: TestClient):
+    for index in range(5):
+        client.post(
+            '/products/',
+            json={
+                'name': f'Keyboard {index}',
+                'price': KEYBOARD_PRICE,
+                'sku': f'KEY-00{index}',
+            },
+        )
+
+    pages = _collect_pages(client, '/products/?limit=2')
+
+    assert pages == [
+        ['KEY-000', 'KEY-001'],
+        ['KEY-002', 'KEY-003'],
+        ['KEY-004'],
+    ]
+
+
+def test_search_products_ranks_and_paginates(client: TestClient):
+    client.post(
+        '/products/',
+        json={
+            'name': 'Mouse pad',
+            'description': 'Pad for keyboard and mouse',
+            'price': MOUSE_PRICE,
+            'sku': 'PAD-001',
+        },
+    )
+    for index in range(3):
+        client.post(
+            '/products/',
+            json={
+                'name': f'Keyboard {index}',
+                'price': KEYBOARD_PRICE,
+                'sku': f'KEY-00{index}',
+            },
+        )
+
+    pages = _collect_pages(client, '/products/?q=keyb&limit=2')
+
+    assert pages == [['KEY-002', 'KEY-001'], ['KEY-000', 'PAD-001']]
+    cursor = client.get('/products/?q=keyb&limit=2').json()['next_cursor']
+    assert all(isinstance(value, int) for value in decode_cursor(cursor, 2))
+
+
+def test_list_products_filters_by_price_and_sorts(client: TestClient):
+    for name, price in [
+        ('Mouse', 20.0),
+        ('Cable', 5.0),
+        ('Keyboard', 50.0),
+        ('Monitor', 900.0),
+        ('Headset', 50.0),
+    ]:
+        client.post(
+            '/products/',
+            json={'name': name, 'price': price, 'sku': name.upper()},
+        )
+    in_range = '/products/?min_price=5&max_price=50&limit=2'
+
+    by_price = _collect_pages(client, f'{in_range}&sort=price')
+    by_price_desc = _collect_pages(client, f'{in_range}&sort=-price')
+    by_name = _collect_pages(client, '/products/?limit=2&sort=name')
+    newest = _collect_pages(client, '/products/?limit=3&sort=-created_at')
+    searched = _collect_pages(client, '/products/?q=m&limit=1&sort=-price')
+
+    assert by_price == [['CABLE', 'MOUSE'], ['KEYBOARD', 'HEADSET']]
+    assert by_price_desc == [['HEADSET', 'KEYBOARD'], ['MOUSE', 'CABLE']]
+    assert by_name == [
+        ['CABLE', 'HEADSET'],
+        ['KEYBOARD', 'MONITOR'],
+        ['MOUSE'],
+    ]
+    # Ties on created_at fall back to id, newest first.
+    assert newest == [['HEADSET', 'MONITOR', 'KEYBOARD'], ['CABLE', 'MOUSE']]
+    assert searched == [['MONITOR'], ['MOUSE']]
+
+
+def test_list_products_rejects_bad_filters(client: TestClient):
+    inverted = client.get('/products/?min_price=10&max_price=5')
+    unknown_sort = client.get('/products/?sort=stock')
+    foreign_cursor = client.get(
+        f'/products/?sort=price&cursor={encode_cursor(["cheap", 1])}'
+    )
+
+    assert inverted.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert unknown_sort.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert foreign_cursor.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_list_products_returns_only_requested_fields(client: TestClient):
+    for index in range(3):
+        client.post(
+            '/products/',
+            json={
+                'name': f'Keyboard {index}',
+                'description': 'Mechanical keyboard',
+                'price': KEYBOARD_PRICE,
+                'sku': f'KEY-00{index}',
+            },
+        )
+
+    listed = client.get('/products/?limit=2&fields=sku,name').json()
+    searched = client.get('/products/?q=keyboard&fields=price').json()
+    pages = _collect_pages(client, '/products/?limit=2&fields=sku')
+
+    assert listed['items'][0] == {'name': 'Keyboard 0', 'sku': 'KEY-000'}
+    assert searched['items'][0] == {'price': KEYBOARD_PRICE}
+    assert pages == [['KEY-000', 'KEY-001'], ['KEY-002']]
+
+
+def test_get_product_returns_only_requested_fields(client: TestClient):
+    product_id = client.post(
+        '/products/',
+        json={'name': 'Keyboard', 'price': KEYBOARD_PRICE, 'sku': 'KEY-001'},
+    ).json()['public_id']
+
+    response = client.get(f'/products/{product_id}/?fields=price,public_id')
+
+    assert response.json() == {
+        'price': KEYBOARD_PRICE,
+        'public_id': product_id,
+    }
+
+
+def test_unknown_fields_are_rejected(client: TestClient):
+    response = client.get('/products/?fields=name,cost,stock')
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json()['detail'] == 'Unknown fields: cost, stock.'
+
+
+def test_search_products_follows_updates_and_deletes(client: TestClient):
+    product_id = client.post(
+        '/products/',
+        json={'name': 'Keyboard', 'price': KEYBOARD_PRICE, 'sku': 'KEY-001'},
+    ).json()['public_id']
+
+    client.put(f'/products/{product_id}/', json={'name': 'Trackball'})
+    renamed = client.get('/products/?q=track').json()['items']
+    stale = client.get('/products/?q=keyboard').json()['items']
+    client.delete(f'/products/{product_id}/')
+    deleted = client.get('/products/?q=track').json()['items']
+
+    assert [item['public_id'] for item in renamed] == [product_id]
+    assert stale == []
+    assert deleted == []
+
+
+def test_list_products_invalid_cursor(client: TestClient):
+    response = client.get('/products/?cursor=not-a-cursor')
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json()['detail'] == 'Invalid cursor.'
+
+
+def test_list_products_rejects_out_of_range_cursor(client: TestClient):
+    cursors = [
+        ('', [2**70]),
+        ('', [-(2**63) - 1]),
+        ('sort=price&', [float('inf'), 1]),
+        ('sort=price&', [1.5, 2**63]),
+        ('sort=-price&', [-(2**64), 1]),
+        ('q=keyboard&', [2**63, 1]),
+    ]
+
+    for params, values in cursors:
+        response = client.get(
+            f'/products/?{params}cursor={encode_cursor(values)}'
+        )
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json()['detail'] == 'Invalid cursor.'
 
 
 def test_get_product_by_public_id(client: TestClient):
@@ -127,6 +324,39 @@ def test_get_product_not_found(client: TestClient):
     assert response.json()['detail'] == 'Product not found.'
 
 
+def test_get_products_batch_keeps_order_and_reports_missing(
+    client: TestClient,
+):
+    product_ids = [
+        client.post(
+            '/products/',
+            json={'name': name, 'price': MOUSE_PRICE, 'sku': name},
+        ).json()['public_id']
+        for name in ('Mouse', 'Keyboard')
+    ]
+    missing_id = '01ARZ3NDEKTSV4RRFFQ69G5FAV'
+
+    response = client.get(
+        '/products/batch/',
+        params={'ids': ','.join([product_ids[1], missing_id, product_ids[0]])},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    body = response.json()
+    assert [item['name'] for item in body['items']] == ['Keyboard', 'Mouse']
+    assert body['missing'] == [missing_id]
+
+
+def test_get_products_batch_limits_ids(client: TestClient, monkeypatch):
+    monkeypatch.setattr(
+        'ecommerce.api.routes.products.settings.PRODUCT_BATCH_MAX_IDS', 1
+    )
+
+    response = client.get('/products/batch/', params={'ids': 'a,b'})
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
 def test_update_product_success(client: TestClient):
     create_response = client.post(
         '/products/',
@@ -226,3 +456,206 @@ def test_delete_product_not_found(client: TestClient):
 
     assert response.status_code == HTTPStatus.NOT_FOUND
     assert response.json()['detail'] == 'Product not found.'
+
+
+def test_get_product_sets_etag_and_answers_not_modified(client: TestClient):
+    product_id = client.post(
+        '/products/',
+        json={'name': 'Keyboard', 'price': KEYBOARD_PRICE, 'sku': 'KEY-001'},
+    ).json()['public_id']
+
+    first = client.get(f'/products/{product_id}/')
+    second = client.get(
+        f'/products/{product_id}/',
+        headers={'If-None-Match': first.headers['ETag']},
+    )
+
+    assert first.status_code == HTTPStatus.OK
+    assert first.headers['Cache-Control'].startswith('public, max-age=')
+    assert second.status_code == HTTPStatus.NOT_MODIFIED
+    assert second.headers['ETag'] == first.headers['ETag']
+    assert not second.content
+
+
+def test_cached_product_read_skips_database(
+    client: TestClient,
+    monkeypatch,
+):
+    product_id = client.post(
+        '/products/',
+        json={'name': 'Keyboard', 'price': KEYBOARD_PRICE, 'sku': 'KEY-001'},
+    ).json()['public_id']
+    client.get(f'/products/{product_id}/')
+
+    async def fail(*args, **kwargs):
+        raise AssertionError('cache miss')
+
+    monkeypatch.setattr(ProductRepository, 'get_by_public_id', fail)
+    response = client.get(f'/products/{product_id}/')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['name'] == 'Keyboard'
+
+
+def test_product_writes_invalidate_cached_responses(client: TestClient):
+    product_id = client.post(
+        '/products/',
+        json={'name': 'Keyboard', 'price': KEYBOARD_PRICE, 'sku': 'KEY-001'},
+    ).json()['public_id']
+    listing = client.get('/products/')
+    detail = client.get(f'/products/{product_id}/')
+
+    client.put(f'/products/{product_id}/', json={'name': 'Keyboard Pro'})
+    relisted = client.get(
+        '/products/', headers={'If-None-Match': listing.headers['ETag']}
+    )
+    refetched = client.get(
+        f'/products/{product_id}/',
+        headers={'If-None-Match': detail.headers['ETag']},
+    )
+
+    assert relisted.status_code == HTTPStatus.OK
+    assert relisted.json()['items'][0]['name'] == 'Keyboard Pro'
+    assert refetched.status_code == HTTPStatus.OK
+    assert refetched.headers['ETag'] != detail.headers['ETag']
+
+
+def test_bulk_import_ndjson_reports_row_errors(client: TestClient):
+    client.post(
+        '/products/',
+        json={'name': 'Keyboard', 'price': KEYBOARD_PRICE, 'sku': 'KEY-001'},
+    )
+    body = '\n'.join([
+        '{"name": "Mouse", "price": 199.9, "sku": "MOU-001"}',
+        '{"name": "Keyboard", "price": 499.9, "sku": "KEY-001"}',
+        '{"name": "Mouse 2", "price": 199.9, "sku": "MOU-001"}',
+        'not json',
+        '{"name": "Free", "price": 0, "sku": "FRE-001"}',
+        '',
+        '{"name": "Webcam", "price": 99.9, "sku": "CAM-001"}',
+    ])
+
+    response = client.post(
+        '/products/bulk/',
+        content=body.encode(),
+        headers={'Content-Type': 'application/x-ndjson'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    result = response.json()
+    assert result['created'] == EXPECTED_PRODUCT_COUNT
+    assert [(error['line'], error['sku']) for error in result['errors']] == [
+        (2, 'KEY-001'),
+        (3, 'MOU-001'),
+        (4, None),
+        (5, 'FRE-001'),
+    ]
+    assert result['failed'] == len(result['errors'])
+
+    skus = {item['sku'] for item in client.get('/products/').json()['items']}
+    assert skus == {'KEY-001', 'MOU-001', 'CAM-001'}
+
+
+def test_bulk_import_csv_in_chunks(client: TestClient, monkeypatch):
+    monkeypatch.setattr(
+        'ecommerce.api.routes.products.settings.PRODUCT_IMPORT_CHUNK_SIZE', 2
+    )
+    rows = [f'Item {index},,9.9,ITM-{index:03d}' for index in range(5)]
+    body = '\r\n'.join(['name,description,price,sku', *rows, 'Bad,row'])
+
+    def chunks():
+        data = body.encode()
+        for start in range(0, len(data), 7):
+            yield data[start : start + 7]
+
+    response = client.post(
+        '/products/bulk/',
+        content=chunks(),
+        headers={'Content-Type': 'text/csv; charset=utf-8'},
+    )
+
+    result = response.json()
+    assert result['created'] == len(rows)
+    assert result['errors'] == [
+        {'line': 7, 'sku': None, 'detail': 'Expected 4 columns.'}
+    ]
+    product = client.get('/products/', params={'q': 'ITM-004'}).json()
+    assert product['items'][0]['description'] is None
+
+
+def test_bulk_import_rejects_unknown_format(client: TestClient):
+    response = client.post(
+        '/products/bulk/',
+        content=b'[]',
+        headers={'Content-Type': 'application/json'},
+    )
+
+    assert response.status_code == HTTPStatus.UNSUPPORTED_MEDIA_TYPE
+
+
+def test_bulk_import_invalidates_cached_responses(client: TestClient):
+    assert client.get('/products/').json()['items'] == []
+
+    client.post(
+        '/products/bulk/',
+        content=b'{"name": "Mouse", "price": 199.9, "sku": "MOU-001"}\n',
+        headers={'Content-Type': 'application/x-ndjson'},
+    )
+
+    assert len(client.get('/products/').json()['items']) == 1
+
+
+def _import_products(client: TestClient, count: int) -> None:
+    body = '\n'.join(
+        f'{{"name": "Item {index}", "price": 9.9, "sku": "ITM-{index:03d}"}}'
+        for index in range(count)
+    )
+    client.post(
+        '/products/bulk/',
+        content=body.encode(),
+        headers={'Content-Type': 'application/x-ndjson'},
+    )
+
+
+def test_export_products_ndjson_streams_in_batches(
+    client: TestClient, monkeypatch
+):
+    monkeypatch.setattr(
+        'ecommerce.api.routes.products.settings.PRODUCT_EXPORT_BATCH_SIZE', 2
+    )
+    _import_products(client, EXPORT_COUNT)
+
+    response = client.get('/products/export/')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line['sku'] for line in lines] == [
+        f'ITM-{index:03d}' for index in range(EXPORT_COUNT)
+    ]
+    assert lines == client.get('/products/').json()['items']
+
+
+def test_export_products_json_and_csv(client: TestClient):
+    _import_products(client, EXPORT_COUNT)
+    items = client.get('/products/').json()['items']
+
+    exported = client.get('/products/export/', params={'format': 'json'})
+    assert exported.json() == items
+
+    exported = client.get('/products/export/', params={'format': 'csv'})
+    assert exported.headers['content-disposition'] == (
+        'attachment; filename="products.csv"'
+    )
+    rows = list(csv.DictReader(io.StringIO(exported.text)))
+    assert [row['public_id'] for row in rows] == [
+        item['public_id'] for item in items
+    ]
+    assert not rows[0]['description']
+
+
+def test_export_products_empty_catalog(client: TestClient):
+    exported = client.get('/products/export/', params={'format': 'json'})
+    assert exported.json() == []
+    exported = client.get('/products/export/', params={'format': 'csv'})
+    assert exported.text.startswith('name,description,price,sku')
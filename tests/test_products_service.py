@@ -1,28 +1,62 @@
-from unittest.mock import Mock
+from unittest.mock import AsyncMock
 
 import pytest
 
+from ecommerce.products.imports import ImportRow
+from ecommerce.products.schemas import ProductCreate
 from ecommerce.products.services import ProductNotFoundError, ProductService
 
+CHUNK_SIZE = 3
+EXPECTED_CHUNKS = 2
 
-def test_get_product_by_sku_success():
+
+@pytest.mark.anyio
+async def test_get_product_by_sku_success():
     product = object()
-    repo = Mock()
+    repo = AsyncMock()
     repo.get_by_sku.return_value = product
     service = ProductService(repo=repo)
 
-    result = service.get_product_by_sku('sku-123')
+    result = await service.get_product_by_sku('sku-123')
 
     assert result is product
-    repo.get_by_sku.assert_called_once_with('sku-123')
+    repo.get_by_sku.assert_awaited_once_with('sku-123')
 
 
-def test_get_product_by_sku_not_found():
-    repo = Mock()
+@pytest.mark.anyio
+async def test_get_product_by_sku_not_found():
+    repo = AsyncMock()
     repo.get_by_sku.return_value = None
     service = ProductService(repo=repo)
 
     with pytest.raises(ProductNotFoundError):
-        service.get_product_by_sku('missing-sku')
+        await service.get_product_by_sku('missing-sku')
+
+    repo.get_by_sku.assert_awaited_once_with('missing-sku')
+
+
+@pytest.mark.anyio
+async def test_import_products_inserts_once_per_chunk():
+    repo = AsyncMock()
+    repo.create_new_skus.side_effect = lambda rows: {
+        row['sku'] for row in rows if row['sku'] != 'SKU-1'
+    }
+    service = ProductService(repo=repo)
 
-    repo.get_by_sku.assert_called_once_with('missing-sku')
+    async def rows():
+        for index in range(CHUNK_SIZE * 2):
+            yield ImportRow(
+                line=index + 1,
+                product=ProductCreate(
+                    name='Item', price=1, sku=f'SKU-{index}'
+                ),
+            )
+
+    result = await service.import_products(
+        rows(), chunk_size=CHUNK_SIZE, max_errors=0
+    )
+
+    assert repo.create_new_skus.await_count == EXPECTED_CHUNKS
+    assert result.created == CHUNK_SIZE * 2 - 1
+    assert result.failed == 1
+    assert result.errors == []
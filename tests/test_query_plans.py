@@ -0,0 +1,198 @@
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ecommerce.products.models import Product
+from ecommerce.products.repositories import ProductFilter, ProductRepository
+from ecommerce.users.models import User
+from ecommerce.users.repositories import UserRepository
+
+PLAN_DETAIL = 3
+PLANNED_STATEMENTS = ('SELECT', 'UPDATE', 'DELETE')
+PAGE_SIZE = 2
+INDEXED_ACCESS = (
+    'USING INDEX',
+    'USING COVERING INDEX',
+    'USING INTEGER PRIMARY KEY',
+    'USING PRIMARY KEY',
+    'VIRTUAL TABLE INDEX',
+)
+
+
+@asynccontextmanager
+async def _captured_statements(session: AsyncSession):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, *args):
+        if statement.lstrip().upper().startswith(PLANNED_STATEMENTS):
+            statements.append((statement, parameters))
+
+    sync_engine = session.bind.sync_engine
+    event.listen(sync_engine, 'before_cursor_execute', capture)
+    try:
+        yield statements
+    finally:
+        event.remove(sync_engine, 'before_cursor_execute', capture)
+
+
+async def _assert_indexed(session: AsyncSession, statements) -> None:
+    assert statements
+    connection = await session.connection()
+    for statement, parameters in statements:
+        result = await connection.exec_driver_sql(
+            f'EXPLAIN QUERY PLAN {statement}', parameters
+        )
+        details = [row[PLAN_DETAIL] for row in result]
+        # Relevance-ranked full-text search has to sort its matches.
+        ranked = any('VIRTUAL TABLE INDEX' in detail for detail in details)
+        for detail in details:
+            if not ranked:
+                assert 'TEMP B-TREE' not in detail, (statement, details)
+            if detail.startswith(('SCAN', 'SEARCH')):
+                assert any(marker in detail for marker in INDEXED_ACCESS), (
+                    statement,
+                    details,
+                )
+
+
+async def _seed(session: AsyncSession) -> tuple[User, Product]:
+    user = User(
+        name='John Doe',
+        email='John.Doe@example.com',
+        password='hash',
+        phone_number='11999999999',
+    )
+    products = [
+        Product(
+            name=f'Keyboard {index}',
+            description=None,
+            price=10.0,
+            sku=f'KEY-{index}',
+        )
+        for index in range(3)
+    ]
+    session.add_all([user, *products])
+    await session.commit()
+    return user, products[0]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    'call',
+    [
+        lambda repo, user: repo.get_by_public_id(user.public_id),
+        lambda repo, user: repo.get_by_email('john.doe@EXAMPLE.com'),
+        lambda repo, user: repo.get_by_phone_number(user.phone_number),
+        lambda repo, user: repo.update(user),
+        lambda repo, user: repo.delete(user),
+    ],
+    ids=[
+        'get_by_public_id',
+        'get_by_email',
+        'get_by_phone_number',
+        'update',
+        'delete',
+    ],
+)
+async def test_user_repository_uses_indexes(session: AsyncSession, call):
+    user, _ = await _seed(session)
+    user.name = 'Jane Doe'
+    repo = UserRepository(session)
+
+    async with _captured_statements(session) as statements:
+        await call(repo, user)
+
+    await _assert_indexed(session, statements)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    'call',
+    [
+        lambda repo, product, cursors: repo.get_by_public_id(
+            product.public_id
+        ),
+        lambda repo, product, cursors: repo.get_by_sku(product.sku),
+        lambda repo, product, cursors: repo.get_all(
+            limit=PAGE_SIZE, cursor=cursors['list']
+        ),
+        lambda repo, product, cursors: repo.search(
+            'keyboard', limit=PAGE_SIZE, cursor=cursors['search']
+        ),
+        lambda repo, product, cursors: repo.update(product),
+        lambda repo, product, cursors: repo.delete(product),
+    ],
+    ids=[
+        'get_by_public_id',
+        'get_by_sku',
+        'get_all',
+        'search',
+        'update',
+        'delete',
+    ],
+)
+async def test_product_repository_uses_indexes(session: AsyncSession, call):
+    _, product = await _seed(session)
+    repo = ProductRepository(session)
+    cursors = {
+        'list': (await repo.get_all(limit=1)).next_cursor,
+        'search': (await repo.search('keyboard', limit=1)).next_cursor,
+    }
+    product.price = 20.0
+
+    async with _captured_statements(session) as statements:
+        await call(repo, product, cursors)
+
+    await _assert_indexed(session, statements)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    ('filters', 'sort'),
+    [
+        *[
+            (ProductFilter(), sort)
+            for sort in [
+                'price',
+                '-price',
+                'created_at',
+                '-created_at',
+                'name',
+            ]
+        ],
+        (ProductFilter(min_price=5.0, max_price=50.0), 'price'),
+        (ProductFilter(min_price=5.0, max_price=50.0), '-price'),
+    ],
+)
+async def test_sorted_pages_walk_an_index(
+    session: AsyncSession, filters, sort
+):
+    await _seed(session)
+    repo = ProductRepository(session)
+    first = await repo.find(filters, sort=sort, limit=1)
+
+    async with _captured_statements(session) as statements:
+        await repo.find(
+            filters, sort=sort, limit=PAGE_SIZE, cursor=first.next_cursor
+        )
+
+    await _assert_indexed(session, statements)
+
+
+@pytest.mark.anyio
+async def test_field_projection_skips_unrequested_columns(
+    session: AsyncSession,
+):
+    await _seed(session)
+    repo = ProductRepository(session)
+
+    async with _captured_statements(session) as statements:
+        page = await repo.get_all(limit=1, fields=['name', 'price'])
+
+    ((statement, _),) = statements
+    columns = statement.split('FROM')[0]
+    assert 'products.name' in columns
+    assert 'products.description' not in columns
+    assert page.items[0]._fields == ('id', 'name', 'price')
@@ -0,0 +1,104 @@
+from http import HTTPStatus
+
+import pytest
+
+from ecommerce.auth.rate_limits import USERNAME_LIMIT
+from ecommerce.core.rate_limit import (
+    InMemoryRateLimiter,
+    RateLimit,
+    RateLimiter,
+    RateLimitExceededError,
+    RedisRateLimiter,
+)
+
+LIMIT = RateLimit(burst=3, per_minute=60)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(params=['memory', 'redis'])
+def backend(request):
+    if request.param == 'memory':
+        return InMemoryRateLimiter(max_keys=100)
+    fakeredis = pytest.importorskip('fakeredis')
+    pytest.importorskip('lupa')
+    return RedisRateLimiter(fakeredis.FakeAsyncRedis(), namespace='rl')
+
+
+@pytest.mark.anyio
+async def test_bucket_allows_burst_then_refills(backend):
+    clock = FakeClock()
+    limiter = RateLimiter(backend, clock=clock)
+    for _ in range(LIMIT.burst):
+        await limiter.check('ip:1', LIMIT)
+
+    with pytest.raises(RateLimitExceededError) as exc:
+        await limiter.check('ip:1', LIMIT)
+    await limiter.check('ip:2', LIMIT)
+
+    assert exc.value.retry_after == pytest.approx(LIMIT.interval)
+    clock.now += LIMIT.interval
+    await limiter.check('ip:1', LIMIT)
+
+
+@pytest.mark.anyio
+async def test_disabled_limiter_allows_everything():
+    limiter = RateLimiter(InMemoryRateLimiter(max_keys=1), enabled=False)
+
+    for _ in range(LIMIT.burst + 1):
+        await limiter.check('ip:1', LIMIT)
+
+
+@pytest.mark.anyio
+async def test_in_memory_limiter_is_bounded():
+    backend = InMemoryRateLimiter(max_keys=2)
+    limiter = RateLimiter(backend, clock=FakeClock())
+
+    for key in ('a', 'b', 'c'):
+        await limiter.check(key, LIMIT)
+
+    assert len(backend) == backend.max_keys
+
+
+def test_login_is_limited_per_username(client, create_user):
+    create_user()
+    form = {'username': 'John.Doe@example.com', 'password': 'wrong'}
+    statuses = [
+        client.post('/auth/token/', data=form).status_code
+        for _ in range(USERNAME_LIMIT.burst + 1)
+    ]
+
+    response = client.post(
+        '/auth/token/',
+        data={'username': 'john.doe@example.com', 'password': 'secret'},
+    )
+
+    assert statuses[:-1] == [HTTPStatus.UNAUTHORIZED] * USERNAME_LIMIT.burst
+    assert statuses[-1] == HTTPStatus.TOO_MANY_REQUESTS
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert int(response.headers['Retry-After']) >= 1
+
+
+def test_register_is_limited_per_client_ip(client, monkeypatch):
+    monkeypatch.setattr(
+        'ecommerce.api.routes.auth.CLIENT_IP_LIMIT',
+        RateLimit(burst=1, per_minute=1),
+    )
+    payload = {'name': 'John Doe', 'password': 'secret'}
+
+    first = client.post(
+        '/auth/register/', json={**payload, 'email': 'a@example.com'}
+    )
+    second = client.post(
+        '/auth/register/', json={**payload, 'email': 'b@example.com'}
+    )
+
+    assert first.status_code == HTTPStatus.CREATED
+    assert second.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert second.json() == {'detail': 'Too many attempts, try again later.'}
@@ -0,0 +1,145 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from ecommerce.app import app
+from ecommerce.core import database
+from ecommerce.core.database import ReplicaSet, build_engine
+from ecommerce.core.db.routing import (
+    PRIMARY_UNTIL_COOKIE,
+    RoutingSession,
+    reads_from_replica,
+)
+from ecommerce.core.settings import Settings, settings
+from ecommerce.products.cache import product_response_cache
+from ecommerce.products.models import Product
+from ecommerce.users.models import table_registry
+
+NOW = 1_000.0
+
+
+async def _create_schema(*engines: AsyncEngine) -> None:
+    for engine in engines:
+        async with engine.begin() as connection:
+            await connection.run_sync(table_registry.metadata.create_all)
+        # Pooled aiosqlite connections are tied to this event loop.
+        await engine.dispose()
+
+
+async def _add_product(engine: AsyncEngine, name: str) -> None:
+    async with async_sessionmaker(engine)() as session:
+        session.add(Product(name=name, description=None, price=1.0, sku=name))
+        await session.commit()
+
+
+@pytest.fixture
+def databases(tmp_path):
+    engines = [
+        build_engine(Settings(DATABASE_URL=f'sqlite:///{tmp_path / name}'))
+        for name in ('primary.db', 'replica-1.db', 'replica-2.db')
+    ]
+    asyncio.run(_create_schema(*engines))
+    yield engines
+    for engine in engines:
+        asyncio.run(engine.dispose())
+
+
+def _names(session, **options):
+    return session.scalars(
+        select(Product.name).order_by(Product.id), **options
+    )
+
+
+@pytest.mark.anyio
+async def test_routing_session_reads_replica_until_it_writes(databases):
+    primary, replica, _ = databases
+    await _add_product(replica, 'On replica')
+    factory = async_sessionmaker(primary, sync_session_class=RoutingSession)
+
+    async with factory(replica=replica.sync_engine) as session:
+        assert (await _names(session)).all() == ['On replica']
+
+        session.add(
+            Product(name='On primary', description=None, price=1.0, sku='P')
+        )
+        await session.commit()
+
+        assert (await _names(session)).all() == ['On primary']
+
+
+@pytest.mark.anyio
+async def test_routing_session_locks_rows_on_primary(databases):
+    primary, replica, _ = databases
+    await _add_product(primary, 'On primary')
+    factory = async_sessionmaker(primary, sync_session_class=RoutingSession)
+
+    async with factory(replica=replica.sync_engine) as session:
+        locked = await session.scalars(select(Product.name).with_for_update())
+
+        assert locked.all() == ['On primary']
+
+
+def test_round_robin_takes_replicas_in_turn(databases):
+    _, *engines = databases
+    replicas = ReplicaSet(engines, strategy='round_robin')
+
+    assert [replicas.pick() for _ in range(4)] == engines * 2
+
+
+@pytest.mark.anyio
+async def test_least_connections_skips_busy_replica(databases):
+    _, busy, idle = databases
+    replicas = ReplicaSet([busy, idle], strategy='least_connections')
+
+    async with busy.connect():
+        assert [replicas.pick() for _ in range(3)] == [idle] * 3
+
+
+def test_read_your_writes_window():
+    window = settings.DATABASE_READ_YOUR_WRITES_SECONDS
+
+    def stamped(until):
+        return {PRIMARY_UNTIL_COOKIE: str(until)}
+
+    assert reads_from_replica('GET', {}, now=NOW)
+    assert not reads_from_replica('POST', {}, now=NOW)
+    assert not reads_from_replica('GET', stamped(NOW + 1), now=NOW)
+    assert reads_from_replica('GET', stamped(NOW - 1), now=NOW)
+    assert reads_from_replica('GET', stamped(NOW + window + 1), now=NOW)
+    assert reads_from_replica('GET', stamped('soon'), now=NOW)
+
+
+def test_client_reads_its_writes_then_falls_back_to_replica(
+    databases, monkeypatch
+):
+    primary, *engines = databases
+    monkeypatch.setattr(settings, 'DATABASE_REPLICA_URLS', ['replica'])
+    monkeypatch.setattr(
+        database, 'replicas', ReplicaSet(engines, strategy='round_robin')
+    )
+    monkeypatch.setattr(
+        database,
+        'session_factory',
+        async_sessionmaker(
+            primary, expire_on_commit=False, sync_session_class=RoutingSession
+        ),
+    )
+    asyncio.run(product_response_cache.invalidate())
+    client = TestClient(app)
+
+    created = client.post(
+        '/products/', json={'name': 'Keyboard', 'price': 10.0, 'sku': 'K-1'}
+    )
+    product_id = created.json()['public_id']
+    own_read = client.get(f'/products/{product_id}/')
+    client.cookies.clear()
+    other_read = client.get(f'/products/{product_id}/?fresh=1')
+
+    assert PRIMARY_UNTIL_COOKIE in created.cookies
+    assert own_read.status_code == HTTPStatus.OK
+    # Nothing replicates between these files, so the replica never sees it.
+    assert other_read.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,131 @@
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ecommerce.products.repositories import ProductRepository
+from ecommerce.products.schemas import ProductUpdate
+from ecommerce.products.services import ProductService, SKUAlreadyExistsError
+from ecommerce.users.repositories import UserRepository
+from ecommerce.users.services import EmailAlreadyExistsError, UserService
+
+
+@asynccontextmanager
+async def _round_trips(session: AsyncSession):
+    calls = []
+
+    def statement(conn, cursor, statement, parameters, *args):
+        calls.append(statement.split(None, 1)[0].upper())
+
+    def commit(conn):
+        calls.append('COMMIT')
+
+    def rollback(conn):
+        calls.append('ROLLBACK')
+
+    sync_engine = session.bind.sync_engine
+    listeners = [
+        ('before_cursor_execute', statement),
+        ('commit', commit),
+        ('rollback', rollback),
+    ]
+    for name, fn in listeners:
+        event.listen(sync_engine, name, fn)
+    try:
+        yield calls
+    finally:
+        for name, fn in listeners:
+            event.remove(sync_engine, name, fn)
+
+
+@pytest.mark.anyio
+async def test_create_product_is_one_insert_and_commit(session: AsyncSession):
+    service = ProductService(ProductRepository(session))
+
+    async with _round_trips(session) as calls:
+        product = await service.create_product(
+            name='Keyboard', price=10.0, sku='KEY-001'
+        )
+
+    assert calls == ['INSERT', 'COMMIT']
+    assert product.created_at is not None
+    assert product.updated_at is not None
+
+
+@pytest.mark.anyio
+async def test_update_product_returns_server_defaults(session: AsyncSession):
+    service = ProductService(ProductRepository(session))
+    product = await service.create_product(
+        name='Keyboard', price=10.0, sku='KEY-001'
+    )
+
+    async with _round_trips(session) as calls:
+        updated = await service.update_product(
+            public_id=product.public_id,
+            payload=ProductUpdate(name='Keyboard Pro'),
+        )
+
+    assert calls == ['SELECT', 'UPDATE', 'COMMIT']
+    assert updated.updated_at is not None
+
+
+@pytest.mark.anyio
+async def test_duplicate_sku_is_detected_by_the_constraint(
+    session: AsyncSession,
+):
+    service = ProductService(ProductRepository(session))
+    await service.create_product(name='Keyboard', price=10.0, sku='KEY-001')
+
+    async with _round_trips(session) as calls:
+        with pytest.raises(SKUAlreadyExistsError):
+            await service.create_product(
+                name='Keyboard', price=10.0, sku='KEY-001'
+            )
+
+    assert calls == ['INSERT', 'ROLLBACK']
+
+
+@pytest.mark.anyio
+async def test_duplicate_email_is_detected_by_the_constraint(
+    session: AsyncSession,
+):
+    service = UserService(UserRepository(session))
+    await service.create_user(
+        email='john@example.com', password='secret', name='John'
+    )
+
+    async with _round_trips(session) as calls:
+        with pytest.raises(EmailAlreadyExistsError):
+            await service.create_user(
+                email='JOHN@example.com', password='secret', name='John'
+            )
+
+    assert calls == ['INSERT', 'ROLLBACK']
+
+
+@pytest.mark.anyio
+async def test_product_lookup_chunks_ids_and_keeps_request_order(
+    session: AsyncSession,
+):
+    service = ProductService(ProductRepository(session))
+    products = [
+        await service.create_product(name='Item', price=1.0, sku=f'SKU-{n}')
+        for n in range(5)
+    ]
+    wanted = [product.public_id for product in reversed(products)]
+
+    async with _round_trips(session) as calls:
+        found = await service.repo.get_many_by_public_ids(
+            [*wanted, wanted[0]], chunk_size=2
+        )
+        lookup = await service.get_products_by_public_ids([
+            wanted[1],
+            '01ARZ3NDEKTSV4RRFFQ69G5FAV',
+            wanted[0],
+        ])
+
+    assert calls[:3] == ['SELECT'] * 3
+    assert len(found) == len(products)
+    assert [product.public_id for product in lookup.items] == wanted[:2][::-1]
+    assert lookup.missing == ['01ARZ3NDEKTSV4RRFFQ69G5FAV']
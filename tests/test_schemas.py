@@ -0,0 +1,69 @@
+import json
+from datetime import datetime
+from http import HTTPStatus
+
+import pytest
+
+from ecommerce.core.utils.schemas import (
+    FastJSONResponse,
+    PageRead,
+    UnknownFieldsError,
+    dump_json,
+    get_adapter,
+    json_response,
+    parse_fields,
+    partial_schema,
+)
+from ecommerce.products.models import Product
+from ecommerce.products.schemas import ProductRead
+
+
+def _product(sku: str) -> Product:
+    product = Product(name='Keyboard', description=None, price=10.0, sku=sku)
+    product.created_at = product.updated_at = datetime(2024, 1, 1)
+    return product
+
+
+def test_dump_json_reads_orm_objects_through_a_cached_adapter():
+    products = [_product('K-1'), _product('K-2')]
+
+    body = dump_json(list[ProductRead], products)
+
+    assert [item['sku'] for item in json.loads(body)] == ['K-1', 'K-2']
+    assert get_adapter(list[ProductRead]) is get_adapter(list[ProductRead])
+
+
+def test_json_response_matches_model_dump_json():
+    product = _product('K-1')
+    page = PageRead[ProductRead](
+        items=[ProductRead.model_validate(product, from_attributes=True)]
+    )
+
+    response = json_response(
+        PageRead[ProductRead],
+        {'items': [product]},
+        status_code=HTTPStatus.CREATED,
+    )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert response.media_type == 'application/json'
+    assert response.body == page.model_dump_json().encode()
+
+
+def test_fast_json_response_passes_bytes_through():
+    assert FastJSONResponse(b'{"a":1}').body == b'{"a":1}'
+    assert FastJSONResponse({'a': [1, None]}).body == b'{"a":[1,null]}'
+
+
+def test_partial_schema_keeps_requested_fields_in_schema_order():
+    fields = parse_fields(ProductRead, ' price,name,, ')
+    schema = partial_schema(ProductRead, fields)
+
+    body = dump_json(schema, _product('K-1'))
+
+    assert fields == ('name', 'price')
+    assert json.loads(body) == {'name': 'Keyboard', 'price': 10.0}
+    assert partial_schema(ProductRead, fields) is schema
+    assert parse_fields(ProductRead, ',') is None
+    with pytest.raises(UnknownFieldsError):
+        parse_fields(ProductRead, 'name,cost')
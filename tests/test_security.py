@@ -1,3 +1,8 @@
+import asyncio
+import threading
+import time
+from http import HTTPStatus
+
 import pytest
 from fastapi import HTTPException
 from jwt import decode
@@ -7,11 +12,24 @@ from ecommerce.core import security
 from ecommerce.core.security import (
     ALGORITHM,
     SECRET_KEY,
+    PasswordHasherBusyError,
+    PasswordHasherPool,
+    VerifiedTokenCache,
     create_access_token,
     get_token_subject,
 )
 
 STATUS_CODE_UNAUTHORIZED = 401
+SLOW_JOB_SECONDS = 0.1
+EXPIRES_AT = 100.0
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
 
 
 def test_jwt():
@@ -57,3 +75,146 @@ def test_get_token_subject_invalid_token(monkeypatch):
         get_token_subject('any-token')
 
     assert exc.value.status_code == STATUS_CODE_UNAUTHORIZED
+
+
+def test_get_token_subject_skips_verification_for_cached_token(
+    monkeypatch,
+):
+    cache = VerifiedTokenCache(max_size=10)
+    monkeypatch.setattr(security, 'verified_tokens', cache)
+    token = create_access_token(data={'sub': 'a@b.com'})
+    assert get_token_subject(token) == 'a@b.com'
+
+    def fail_decode(*args, **kwargs):
+        raise AssertionError('token was verified again')
+
+    monkeypatch.setattr(security, 'decode', fail_decode)
+
+    assert get_token_subject(token) == 'a@b.com'
+    cache.invalidate('a@b.com')
+    with pytest.raises(AssertionError):
+        get_token_subject(token)
+
+
+def test_verified_token_cache_expires_at_exp():
+    clock = FakeClock()
+    cache = VerifiedTokenCache(max_size=10, clock=clock)
+    cache.set('token', 'a@b.com', EXPIRES_AT)
+
+    assert cache.get('token') == 'a@b.com'
+    clock.now = EXPIRES_AT
+    assert cache.get('token') is None
+    assert len(cache) == 0
+
+
+def test_verified_token_cache_evicts_least_recently_used():
+    cache = VerifiedTokenCache(max_size=2, clock=FakeClock())
+    cache.set('a', 'a@b.com', EXPIRES_AT)
+    cache.set('b', 'b@b.com', EXPIRES_AT)
+    cache.get('a')
+    cache.set('c', 'c@b.com', EXPIRES_AT)
+
+    assert cache.get('a') == 'a@b.com'
+    assert cache.get('b') is None
+    assert cache.get('c') == 'c@b.com'
+    cache.invalidate('b@b.com', 'c@b.com')
+    assert len(cache) == 1
+
+
+def test_verified_token_cache_disabled_with_zero_size():
+    cache = VerifiedTokenCache(max_size=0, clock=FakeClock())
+    cache.set('token', 'a@b.com', EXPIRES_AT)
+
+    assert cache.get('token') is None
+
+
+@pytest.mark.anyio
+async def test_password_hasher_pool_hashes_and_verifies():
+    pool = PasswordHasherPool(workers=2, max_pending=4)
+
+    hashed = await pool.hash('secret')
+
+    assert await pool.verify('secret', hashed)
+    assert not await pool.verify('wrong', hashed)
+    assert pool.pending == 0
+    pool.shutdown()
+
+
+@pytest.mark.anyio
+async def test_password_hasher_pool_rejects_when_full():
+    pool = PasswordHasherPool(workers=1, max_pending=1)
+    release = threading.Event()
+    blocked = asyncio.ensure_future(pool.run(release.wait))
+    await asyncio.sleep(0)
+
+    with pytest.raises(PasswordHasherBusyError):
+        await pool.hash('secret')
+
+    release.set()
+    await blocked
+    assert pool.pending == 0
+    pool.shutdown()
+
+
+@pytest.mark.anyio
+async def test_password_hasher_pool_sheds_when_queue_wait_is_too_long():
+    pool = PasswordHasherPool(
+        workers=1, max_pending=10, max_queue_wait=SLOW_JOB_SECONDS / 2
+    )
+    await pool.run(time.sleep, SLOW_JOB_SECONDS)
+    release = threading.Event()
+    blocked = asyncio.ensure_future(pool.run(release.wait))
+    await asyncio.sleep(0)
+
+    with pytest.raises(PasswordHasherBusyError) as exc:
+        await pool.hash('secret')
+
+    assert pool.expected_wait() >= SLOW_JOB_SECONDS
+    assert exc.value.retry_after == 1.0
+    release.set()
+    await blocked
+    pool.shutdown()
+
+
+def test_register_returns_503_when_hasher_is_busy(client, monkeypatch):
+    async def busy(*args, **kwargs):
+        raise PasswordHasherBusyError()
+
+    monkeypatch.setattr(security.password_hasher, 'hash', busy)
+
+    response = client.post(
+        '/auth/register/',
+        json={
+            'name': 'John Doe',
+            'email': 'john.doe@example.com',
+            'password': 'secret',
+        },
+    )
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.headers['Retry-After'] == '1'
+
+
+@pytest.mark.anyio
+async def test_password_hasher_pool_counts_jobs_until_they_finish():
+    pool = PasswordHasherPool(workers=1, max_pending=1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def job():
+        started.set()
+        release.wait()
+
+    abandoned = asyncio.ensure_future(pool.run(job))
+    await asyncio.to_thread(started.wait)
+
+    abandoned.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await abandoned
+    assert pool.pending == 1
+    with pytest.raises(PasswordHasherBusyError):
+        await pool.hash('secret')
+
+    release.set()
+    pool.shutdown()
+    assert pool.pending == 0
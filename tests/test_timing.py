@@ -0,0 +1,69 @@
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ecommerce.core.settings import settings
+from ecommerce.core.timing import instrument_engine
+
+
+@pytest.fixture
+def timing(session, monkeypatch):
+    instrument_engine(session.bind)
+    monkeypatch.setattr(settings, 'REQUEST_TIMING', True)
+    monkeypatch.setattr(settings, 'REQUEST_TIMING_HEADER', True)
+
+
+def _server_timing(response) -> dict[str, str]:
+    entries = {}
+    for entry in response.headers['server-timing'].split(', '):
+        name, _, params = entry.partition(';')
+        entries[name] = params
+    return entries
+
+
+def test_server_timing_header_is_opt_in(client: TestClient):
+    response = client.get('/products/')
+
+    assert 'server-timing' not in response.headers
+
+
+def test_server_timing_reports_phases_and_sql(client: TestClient, timing):
+    client.post(
+        '/products/', json={'name': 'Keyboard', 'price': 10.0, 'sku': 'K-1'}
+    )
+
+    response = client.get('/products/')
+
+    entries = _server_timing(response)
+    assert {'total', 'deps', 'endpoint', 'serialize', 'sql'} <= set(entries)
+    assert entries['sql'].endswith('rows=1"')
+
+
+def test_server_timing_reports_jwt_and_argon2(
+    client: TestClient, timing, create_user, auth_headers
+):
+    user = create_user()
+    headers = auth_headers('john.doe@example.com')
+
+    login = client.post(
+        '/auth/token/',
+        data={'username': 'john.doe@example.com', 'password': 'secret'},
+    )
+    profile = client.get(f'/users/me/{user["public_id"]}/', headers=headers)
+
+    assert 'argon2' in _server_timing(login)
+    assert 'jwt' in _server_timing(profile)
+
+
+def test_request_timing_logs_one_structured_line(
+    client: TestClient, timing, caplog
+):
+    with caplog.at_level(logging.INFO, logger='ecommerce.core.timing'):
+        client.get('/products/')
+
+    (record,) = caplog.records
+    assert record.request_timing['path'] == '/products/'
+    assert record.request_timing['queries'] >= 1
+    assert record.request_timing['slowest_sql'].startswith('SELECT')
+    assert "path='/products/'" in record.getMessage()
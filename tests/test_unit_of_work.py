@@ -0,0 +1,95 @@
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ecommerce.core.db.errors import UniqueViolationError
+from ecommerce.core.db.unit_of_work import UnitOfWork
+from ecommerce.products.models import Product
+from ecommerce.products.repositories import ProductRepository
+
+BATCH_SIZE = 2
+PRODUCT_COUNT = 5
+EXPECTED_FLUSHES = 3
+
+
+def _product(sku: str) -> Product:
+    return Product(name='Item', description=None, price=1.0, sku=sku)
+
+
+async def _count(session: AsyncSession) -> int:
+    return await session.scalar(select(func.count()).select_from(Product))
+
+
+@pytest.mark.anyio
+async def test_nested_blocks_commit_once(session: AsyncSession):
+    uow = UnitOfWork(session)
+    repo = ProductRepository(session)
+    commits = []
+
+    def on_commit(conn):
+        commits.append(conn)
+
+    event.listen(session.bind.sync_engine, 'commit', on_commit)
+    try:
+        async with uow:
+            await repo.create(_product('SKU-1'))
+            async with uow:
+                await repo.create(_product('SKU-2'))
+            assert commits == []
+    finally:
+        event.remove(session.bind.sync_engine, 'commit', on_commit)
+
+    assert len(commits) == 1
+    assert await _count(session) == BATCH_SIZE
+
+
+@pytest.mark.anyio
+async def test_error_rolls_back_the_whole_unit(session: AsyncSession):
+    uow = UnitOfWork(session)
+    repo = ProductRepository(session)
+
+    async def create_twice():
+        async with uow:
+            await repo.create(_product('SKU-1'))
+            await repo.create(_product('SKU-1'))
+
+    with pytest.raises(UniqueViolationError):
+        await create_twice()
+
+    assert await _count(session) == 0
+
+
+@pytest.mark.anyio
+async def test_savepoint_keeps_earlier_writes(session: AsyncSession):
+    uow = UnitOfWork(session)
+    repo = ProductRepository(session)
+
+    async with uow:
+        await repo.create(_product('SKU-1'))
+        with pytest.raises(UniqueViolationError):
+            async with uow.savepoint():
+                await repo.create(_product('SKU-1'))
+        await repo.create(_product('SKU-2'))
+
+    assert await _count(session) == BATCH_SIZE
+
+
+@pytest.mark.anyio
+async def test_add_all_flushes_in_batches(session: AsyncSession):
+    uow = UnitOfWork(session)
+    flushes = []
+
+    def on_flush(session, flush_context):
+        flushes.append(flush_context)
+
+    event.listen(session.sync_session, 'after_flush', on_flush)
+
+    async with uow:
+        await uow.add_all(
+            (_product(f'SKU-{index}') for index in range(PRODUCT_COUNT)),
+            batch_size=BATCH_SIZE,
+        )
+
+    event.remove(session.sync_session, 'after_flush', on_flush)
+    assert len(flushes) == EXPECTED_FLUSHES
+    assert await _count(session) == PRODUCT_COUNT
@@ -3,6 +3,8 @@ from http import HTTPStatus
 
 from fastapi.testclient import TestClient
 
+from ecommerce.core.security import verified_tokens
+from ecommerce.users.repositories import UserRepository
 from ecommerce.users.services import UserNotFoundError, UserService
 
 PASSWORD_REQUIRED_MSG = (
@@ -718,3 +720,67 @@ def test_update_user_password_empty_new_password(
 
     assert response.status_code == HTTPStatus.BAD_REQUEST
     assert response.json()['detail'] == PASSWORD_REQUIRED_MSG
+
+
+def test_current_user_is_served_from_principal_cache(
+    client: TestClient,
+    create_user,
+    auth_headers,
+    monkeypatch,
+):
+    user = create_user(email='cached@example.com')
+    headers = auth_headers(user['email'])
+    client.get(url=f'/users/me/{user["public_id"]}/', headers=headers)
+    lookups = []
+    get_by_email = UserRepository.get_by_email
+
+    async def counting_get_by_email(self, email):
+        lookups.append(email)
+        return await get_by_email(self, email)
+
+    monkeypatch.setattr(UserRepository, 'get_by_email', counting_get_by_email)
+
+    response = client.get(
+        url=f'/users/me/{user["public_id"]}/',
+        headers=headers,
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert lookups == []
+
+
+def test_update_user_email_invalidates_cached_principal(
+    client: TestClient,
+    create_user,
+    auth_headers,
+):
+    user = create_user(email='old@example.com')
+    headers = auth_headers(user['email'])
+    url = f'/users/me/{user["public_id"]}/'
+    client.get(url=url, headers=headers)
+
+    client.put(url=url, headers=headers, json={'email': 'new@example.com'})
+    response = client.get(url=url, headers=headers)
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert response.json()['detail'] == 'Could not validate credentials.'
+
+
+def test_update_user_password_invalidates_cached_tokens(
+    client: TestClient,
+    create_user,
+    auth_headers,
+):
+    user = create_user(email='cached@example.com')
+    headers = auth_headers(user['email'])
+    url = f'/users/me/{user["public_id"]}/'
+    client.get(url=url, headers=headers)
+    assert len(verified_tokens) == 1
+
+    client.put(
+        url=url,
+        headers=headers,
+        json={'current_password': 'secret', 'password': 'new-secret'},
+    )
+
+    assert len(verified_tokens) == 0
@@ -1,28 +1,55 @@
-from unittest.mock import Mock
+from unittest.mock import AsyncMock
 
 import pytest
 
+from ecommerce.users import cache as principal_cache_module
+from ecommerce.users.cache import Principal
 from ecommerce.users.services import UserNotFoundError, UserService
 
 
-def test_get_user_by_public_id_success():
+@pytest.mark.anyio
+async def test_get_user_by_public_id_success():
     user = object()
-    repo = Mock()
+    repo = AsyncMock()
     repo.get_by_public_id.return_value = user
     service = UserService(repo=repo)
 
-    result = service.get_user_by_public_id('public-id-123')
+    result = await service.get_user_by_public_id('public-id-123')
 
     assert result is user
-    repo.get_by_public_id.assert_called_once_with('public-id-123')
+    repo.get_by_public_id.assert_awaited_once_with('public-id-123')
 
 
-def test_get_user_by_public_id_not_found():
-    repo = Mock()
+@pytest.mark.anyio
+async def test_get_user_by_public_id_not_found():
+    repo = AsyncMock()
     repo.get_by_public_id.return_value = None
     service = UserService(repo=repo)
 
     with pytest.raises(UserNotFoundError):
-        service.get_user_by_public_id('missing-id')
+        await service.get_user_by_public_id('missing-id')
 
-    repo.get_by_public_id.assert_called_once_with('missing-id')
+    repo.get_by_public_id.assert_awaited_once_with('missing-id')
+
+
+@pytest.mark.anyio
+async def test_get_principal_uses_cache_before_repository():
+    principal = Principal(id=1, public_id='public-id-123', email='a@b.com')
+    repo = AsyncMock()
+    cache = AsyncMock()
+    cache.get.return_value = principal
+    service = UserService(repo=repo, principal_cache=cache)
+
+    result = await service.get_principal('a@b.com')
+
+    assert result is principal
+    repo.get_by_email.assert_not_awaited()
+
+
+def test_in_memory_principal_cache_refuses_several_workers(monkeypatch):
+    settings = principal_cache_module.settings
+    monkeypatch.setattr(settings, 'CACHE_BACKEND', 'memory')
+    monkeypatch.setattr(settings, 'WEB_CONCURRENCY', 2)
+
+    with pytest.raises(RuntimeError, match='CACHE_BACKEND=redis'):
+        principal_cache_module.build_principal_cache()